@@ -0,0 +1,252 @@
+"""
+区域模拟模块
+单人模式和双人对战共用的模拟核心：N个相互独立的区域各有自己的边界、玩家、生成与射击计时器和分数，
+所有区域的外星人和子弹存放在同一组列式存储中（arena列记录所属区域），每帧对全部区域做一次批量更新
+单人模式Game是只有一个区域的情况，双人对战VersusGame是左右两个区域的情况
+"""
+
+import numpy as np
+import pygame
+from config import *
+from entities import Player
+from entity_store import AlienStore, BulletStore
+from spatial_hash import SpatialHash
+from collision import resolve_store_hits
+from particles import ParticleSystem
+
+
+def key_direction(keys, left, right, up, down):
+    """
+    把一组方向键的按下状态换算为移动方向（同时按下相反方向时右、下优先）
+    参数:
+        keys: 支持keys[按键码]查询的按键状态
+        left/right/up/down: 四个方向的按键码
+    返回: (dx, dy)
+    """
+    dx = dy = 0
+    if keys[left]:
+        dx = -1
+    if keys[right]:
+        dx = 1
+    if keys[up]:
+        dy = -1
+    if keys[down]:
+        dy = 1
+    return dx, dy
+
+
+def arena_field(name, index=0):
+    """
+    生成把游戏属性转发到某个区域属性的property（如Game.score即区域0的分数）
+    参数:
+        name: 区域属性名
+        index: 区域编号
+    返回: property对象
+    """
+    return property(lambda game: getattr(game.engine.arenas[index], name),
+                    lambda game, value: setattr(game.engine.arenas[index], name, value),
+                    doc=f"区域{index}的{name}")
+
+
+class Arena:
+    """
+    一个区域的状态：边界、玩家、计时器和分数
+    外星人和子弹不属于单个区域对象，统一存放在ArenaEngine的存储中
+    """
+    __slots__ = ('index', 'bounds', 'player', 'score', 'active',
+                 'last_alien_spawn_time', 'last_bullet_time', 'bullet_color_index')
+
+    def __init__(self, index, bounds):
+        """
+        初始化区域
+        参数:
+            index: 区域编号（存储中arena列的值）
+            bounds: 区域矩形 (左, 上, 右, 下)
+        """
+        left, top, right, bottom = bounds
+        self.index = index
+        self.bounds = bounds
+        # 玩家位于区域底部中央
+        self.player = Player(left + (right - left) // 2 - PLAYER_SIZE // 2, bottom - 50)
+        self.score = 0                      # 分数
+        self.active = True                  # 是否仍在进行（淘汰后不再生成外星人、不再射击）
+        self.last_alien_spawn_time = 0      # 上次生成外星人的时间
+        self.last_bullet_time = 0           # 上次发射子弹的时间
+        self.bullet_color_index = 0         # 子弹颜色循环索引
+
+
+class ArenaEngine:
+    """
+    多区域模拟核心
+    各区域的生成按区域编号顺序进行；移动、越界、命中和玩家碰撞对所有区域一次批量计算，
+    子弹只能击中同一区域的外星人
+    """
+
+    def __init__(self, bounds, rng, clamp_aliens=False, clip=False):
+        """
+        初始化区域与共用的实体存储
+        参数:
+            bounds: 各区域矩形 [(左, 上, 右, 下), ...]
+            rng: RandomStreams对象（spawn流决定生成位置，alien_store和particles流供存储使用）
+            clamp_aliens: 外星人碰到区域左右边界时是否拉回边界内（相邻区域之间不能越界）
+            clip: 绘制时是否把每个区域的内容裁剪在区域内（区域上下相邻时，
+                  刚生成和越过底部的外星人不会画到相邻区域中）
+        """
+        self.rng = rng
+        self.clamp_aliens = clamp_aliens
+        self.clip = clip
+        self.arenas = [Arena(index, tuple(rect)) for index, rect in enumerate(bounds)]
+        # 按区域编号索引的边界数组，批量计算时按arena列取出每行的边界
+        self.left, self.top, self.right, self.bottom = np.array(bounds, dtype=np.int64).T
+        self.aliens = AlienStore(rng=rng.alien_store)  # 所有区域的外星人
+        self.bullets = BulletStore()                    # 所有区域的子弹
+        self.particles = ParticleSystem(rng=rng.particles)  # 所有区域共用的爆炸粒子
+        self.grid = SpatialHash()                       # 外星人空间哈希（碰撞粗筛，结算命中后与外星人存储一致）
+
+    def move_player(self, index, dx, dy):
+        """
+        在区域边界内移动玩家
+        参数:
+            index: 区域编号
+            dx/dy: 移动方向（-1、0、1）
+        """
+        arena = self.arenas[index]
+        arena.player.move(dx, dy, arena.bounds)
+
+    def spawn_aliens(self, now, max_aliens=MAX_ALIENS_PER_SPAWN, health_multiplier=1.0):
+        """
+        各区域按自己的计时器在区域上方随机位置生成外星人
+        参数:
+            now: 当前游戏时间（毫秒）
+            max_aliens: 每次最多生成的数量
+            health_multiplier: 血量倍数
+        """
+        spawn = self.rng.spawn
+        for arena in self.arenas:
+            if arena.active and now - arena.last_alien_spawn_time >= ALIEN_SPAWN_INTERVAL:
+                left, top, right, _ = arena.bounds
+                num_aliens = spawn.randint(MIN_ALIENS_PER_SPAWN, max_aliens)
+                xs = [spawn.randint(left, right - ALIEN_SIZE) for _ in range(num_aliens)]
+                self.aliens.spawn(xs, top - ALIEN_SIZE, health_multiplier, arena.index)
+                arena.last_alien_spawn_time = now
+
+    def spawn_bullets(self, now, speed_multiplier=1.0):
+        """
+        各区域的玩家按射击计时器发射子弹（颜色按红、绿、蓝循环，拥有三排子弹时同时发射两侧子弹）
+        参数:
+            now: 当前游戏时间（毫秒）
+            speed_multiplier: 子弹速度倍数
+        """
+        bullet_interval = 1000 // BULLETS_PER_SECOND
+        center_speed = int(BULLET_SPEED * speed_multiplier)
+        side_speed = int(BULLET_SPEED * speed_multiplier * TRIPLE_SHOT_SIDE_SPEED_RATIO)
+        bullets = self.bullets
+        for arena in self.arenas:
+            if not arena.active or now - arena.last_bullet_time < bullet_interval:
+                continue
+            player = arena.player
+            center_x = player.x + player.width // 2 - BULLET_WIDTH // 2
+            bullet_y = player.y
+            color = arena.bullet_color_index
+            bullets.spawn(center_x, bullet_y, center_speed, BULLET_DAMAGE, color, arena.index)
+            if player.has_triple_shot:
+                side_damage = player.triple_shot_side_damage
+                bullets.spawn(center_x - 15, bullet_y, side_speed, side_damage, color, arena.index)
+                bullets.spawn(center_x + 15, bullet_y, side_speed, side_damage, color, arena.index)
+            arena.bullet_color_index = (color + 1) % len(BULLET_COLORS)
+            arena.last_bullet_time = now
+
+    def update_bullets(self):
+        """移动所有子弹，移除飞出所在区域上方的子弹"""
+        bullets = self.bullets
+        bullets.move()
+        n = bullets.count
+        if n:
+            bullets.compact(bullets.y[:n] >= self.top[bullets.arena[:n]])
+
+    def update_aliens(self):
+        """
+        移动所有外星人（碰到所在区域的左右边界反向），移除越过区域底部的外星人
+        返回: 有外星人越过底部的区域编号列表（升序）
+        """
+        aliens = self.aliens
+        groups = aliens.arena[:aliens.count]
+        aliens.move(self.left[groups], self.right[groups], self.clamp_aliens)
+
+        escaped = aliens.y[:aliens.count] > self.bottom[groups]
+        if not escaped.any():
+            return []
+        lost = np.unique(groups[escaped]).tolist()
+        aliens.compact(~escaped)
+        return lost
+
+    def resolve_hits(self):
+        """
+        结算子弹击中外星人：被击杀的外星人产生爆炸，击杀分数（应用玩家的分数倍数）计入子弹所在区域
+        返回: 被击杀的外星人数量
+        """
+        killed_x, killed_y, killed_arena = resolve_store_hits(self.bullets, self.aliens, self.grid)
+        self.particles.emit(killed_x, killed_y)
+        if len(killed_arena):
+            kills = np.bincount(killed_arena, minlength=len(self.arenas)).tolist()
+            for arena, count in zip(self.arenas, kills):
+                arena.score += int(POINTS_PER_KILL * arena.player.score_multiplier) * count
+        return len(killed_x)
+
+    def player_hits(self):
+        """
+        检查玩家与本区域外星人的碰撞
+        返回: 玩家被外星人碰到的区域编号列表（升序）
+        """
+        aliens = self.aliens
+        if not aliens:
+            return []
+        rects = [arena.player.get_rect() for arena in self.arenas]
+        left, top, right, bottom = np.array([(rect.x, rect.y, rect.right, rect.bottom) for rect in rects]).T
+        groups = aliens.arena[:aliens.count]
+        alien_xs, alien_ys = aliens.rect_arrays()
+        touching = ((alien_xs < right[groups]) & (alien_xs + ALIEN_SIZE > left[groups]) &
+                    (alien_ys < bottom[groups]) & (alien_ys + ALIEN_SIZE > top[groups]))
+        if not touching.any():
+            return []
+        return np.unique(groups[touching]).tolist()
+
+    def rows_by_arena(self, store):
+        """
+        按区域划分存储中的行（一次稳定排序，各区域内保持存储顺序）
+        参数:
+            store: AlienStore或BulletStore
+        返回: 各区域的行索引数组列表
+        """
+        groups = store.arena[:store.count]
+        order = np.argsort(groups, kind='stable')
+        edges = np.searchsorted(groups[order], np.arange(len(self.arenas) + 1)).tolist()
+        return [order[start:end] for start, end in zip(edges[:-1], edges[1:])]
+
+    def draw(self, screen, alpha=1.0):
+        """
+        绘制所有区域的玩家、外星人和子弹
+        不裁剪时外星人和子弹各一次批量blit；裁剪时每个区域各一次批量blit
+        参数:
+            screen: pygame屏幕对象
+            alpha: 逻辑帧间插值系数
+        返回: 绘制区域的pygame.Rect列表
+        """
+        rects = []
+        if not self.clip:
+            for arena in self.arenas:
+                rects += arena.player.draw(screen, alpha)
+            rects += self.aliens.draw(screen, alpha)
+            rects += self.bullets.draw(screen, alpha)
+            return rects
+
+        alien_rows = self.rows_by_arena(self.aliens)
+        bullet_rows = self.rows_by_arena(self.bullets)
+        for arena, aliens, bullets in zip(self.arenas, alien_rows, bullet_rows):
+            left, top, right, bottom = arena.bounds
+            screen.set_clip(pygame.Rect(left, top, right - left, bottom - top))
+            rects += arena.player.draw(screen, alpha)
+            rects += self.aliens.draw(screen, alpha, aliens)
+            rects += self.bullets.draw(screen, alpha, bullets)
+        screen.set_clip(None)
+        return rects
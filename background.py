@@ -3,95 +3,92 @@
 负责处理游戏背景的动态效果
 """
 
-import pygame
 import random
+import numpy as np
 from config import *
+from sprite_cache import RECT, get_sprite
 
 
 class BackgroundManager:
     """
     背景管理器
-    负责创建、更新和绘制移动的背景矩形效果
+    随机分布的背景矩形按周期strip_height纵向循环排列，预先展开为按顶边排序的位置表；
+    每帧用一次二分查找取出屏幕内的矩形，再用一次Surface.blits绘制并得到脏矩形
     """
-    
-    def __init__(self, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT):
+
+    def __init__(self, screen_width=SCREEN_WIDTH, screen_height=SCREEN_HEIGHT, rng=random):
         """
         初始化背景管理器
         参数:
             screen_width: 屏幕宽度
             screen_height: 屏幕高度
+            rng: 随机数流（random.Random或random模块），用于背景矩形布局
         """
+        self.rng = rng
         self.screen_width = screen_width
         self.screen_height = screen_height
-        self.background_rects = []  # 背景矩形列表
+
+        # 循环周期为矩形行距的整数倍且不小于屏幕高度
+        rows = -(-screen_height // BACKGROUND_SPACING) + 1
+        self.strip_height = rows * BACKGROUND_SPACING
+        self.sprite = get_sprite(RECT, LIGHT_GRAY, (BACKGROUND_RECT_WIDTH, BACKGROUND_RECT_HEIGHT))
+        self.tile_xs = []     # 展开后各矩形的x坐标（按顶边排序）
+        self.tile_tops = np.empty(0, dtype=np.int64)  # 展开后各矩形的顶边（升序，滚动偏移为0时的屏幕坐标）
+        self.offset = 0       # 当前滚动偏移量（像素）
         self.init_background_rects()
-    
+
     def init_background_rects(self):
         """
         初始化背景矩形
-        在屏幕上创建均匀分布的背景矩形
+        按行列均匀分布并加入随机偏移，每个矩形展开为相隔一个周期的多个副本，
+        覆盖任意滚动偏移下的整个屏幕
         """
-        self.background_rects = []
-        
-        # 在屏幕上创建多行多列的背景矩形
-        for y in range(-BACKGROUND_RECT_HEIGHT, self.screen_height + BACKGROUND_SPACING, BACKGROUND_SPACING):
+        self.offset = 0
+        tiles = []
+        for y in range(0, self.strip_height, BACKGROUND_SPACING):
             for x in range(0, self.screen_width, BACKGROUND_SPACING):
                 # 添加一些随机偏移，让背景更自然
-                offset_x = random.randint(-20, 20)
-                offset_y = random.randint(-20, 20)
-                rect = {
-                    'x': x + offset_x,
-                    'y': y + offset_y,
-                    'width': BACKGROUND_RECT_WIDTH,
-                    'height': BACKGROUND_RECT_HEIGHT
-                }
-                self.background_rects.append(rect)
-    
+                offset_x = self.rng.randint(-20, 20)
+                offset_y = self.rng.randint(-20, 20)
+                # 偏移量在[0, strip_height)内，屏幕范围为[偏移量, 偏移量 + 屏幕高度)，前后各展开一个周期即可覆盖
+                for period in (-1, 0, 1):
+                    tiles.append((y + offset_y + period * self.strip_height, x + offset_x))
+        tiles.sort()  # 矩形等高，按顶边排序后屏幕内的矩形是连续的一段
+        self.tile_tops = np.array([top for top, _ in tiles], dtype=np.int64)
+        self.tile_xs = [x for _, x in tiles]
+
     def update(self):
         """
-        更新背景矩形位置
-        让背景矩形向上移动，创造飞机前进的效果
-        """
-        # 移动所有背景矩形
-        for rect in self.background_rects[:]:
-            rect['y'] -= BACKGROUND_SPEED
-            
-            # 如果矩形移出屏幕上方，移除它
-            if rect['y'] + rect['height'] < 0:
-                self.background_rects.remove(rect)
-        
-        # 在屏幕底部添加新的背景矩形
-        if len(self.background_rects) < MAX_BACKGROUND_RECTS:
-            self._spawn_new_rects()
-    
-    def _spawn_new_rects(self):
-        """
-        在屏幕底部生成新的背景矩形
-        私有方法，由update方法调用
+        更新背景滚动位置
+        让背景向上移动，创造飞机前进的效果
         """
-        for x in range(0, self.screen_width, BACKGROUND_SPACING):
-            offset_x = random.randint(-20, 20)
-            rect = {
-                'x': x + offset_x,
-                'y': self.screen_height + random.randint(0, BACKGROUND_SPACING),
-                'width': BACKGROUND_RECT_WIDTH,
-                'height': BACKGROUND_RECT_HEIGHT
-            }
-            self.background_rects.append(rect)
-    
+        self.offset = (self.offset + BACKGROUND_SPEED) % self.strip_height
+
     def draw(self, screen):
         """
-        绘制所有背景矩形
+        绘制屏幕内的背景矩形（一次Surface.blits）
         参数:
             screen: pygame屏幕对象
+        返回: 绘制区域的pygame.Rect列表（供脏矩形渲染擦除与提交）
+        """
+        start, end = self.visible_range()
+        ys = (self.tile_tops[start:end] - self.offset).tolist()
+        sprite = self.sprite
+        return screen.blits([(sprite, position) for position in zip(self.tile_xs[start:end], ys)])
+
+    def visible_range(self):
         """
-        for rect in self.background_rects:
-            pygame.draw.rect(screen, LIGHT_GRAY, 
-                           (rect['x'], rect['y'], rect['width'], rect['height']))
-    
+        获取当前滚动位置下与屏幕相交的矩形范围
+        返回: (起始下标, 结束下标)，对应tile_xs与tile_tops中的一段
+        """
+        tops = self.tile_tops
+        start = int(np.searchsorted(tops, self.offset - BACKGROUND_RECT_HEIGHT, 'right'))
+        end = int(np.searchsorted(tops, self.offset + self.screen_height, 'left'))
+        return start, end
+
     def reset(self):
         """
         重置背景效果
-        清空现有矩形并重新初始化
+        重新生成随机矩形布局并回到初始滚动位置
         """
         self.init_background_rects()
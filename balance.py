@@ -0,0 +1,260 @@
+"""
+随机模式平衡性模拟器
+在所有CPU核上以无头模式批量进行随机模式对局，用可配置的升级选择策略（随机、贪心、脚本）
+驱动generate_random_upgrades/apply_upgrade，并可在config.py参数网格上扫描，
+输出存活时间、分数分布以及各升级路线的胜率
+
+用法:
+    python balance.py --runs 500                                   # 三种策略各500局
+    python balance.py --policy greedy --policy scripted --script triple_shot,wingman,wingman
+    python balance.py --grid BULLET_SPEED_UPGRADE=0.1,0.15,0.2 --grid HEALTH_BOOST_MULTIPLIER=0.2,0.3
+    python balance.py --json balance.json                          # 同时保存为JSON
+"""
+
+import argparse
+import itertools
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+import numpy as np
+import config
+from config import *
+from bot import AutoPilot, preferred_upgrade
+from game import Game
+
+POLICIES = ('random', 'greedy', 'scripted')
+
+BALANCE_RUNS = 200              # 每个网格点、每种策略的对局数
+BALANCE_TICKS = FPS * 60 * 5    # 每局最多模拟的逻辑帧数（5分钟游戏时间）
+PATH_LENGTH = 3                 # 统计升级路线时取前几次升级
+TOP_PATHS = 5                   # 报告中列出的路线数量
+PERCENTILES = (10, 50, 90)
+
+
+@contextmanager
+def config_overrides(overrides):
+    """
+    临时修改配置常量
+    各模块通过from config import *复制了常量，因此同时替换所有仍指向原值的模块全局变量
+    参数:
+        overrides: {常量名: 新值}
+    """
+    saved = []
+    for name, value in overrides.items():
+        original = getattr(config, name)
+        for module in list(sys.modules.values()):
+            namespace = getattr(module, '__dict__', None)
+            if namespace is not None and name in namespace and namespace[name] is original:
+                saved.append((namespace, name, original))
+                namespace[name] = value
+    try:
+        yield
+    finally:
+        for namespace, name, original in reversed(saved):
+            namespace[name] = original
+
+
+def make_pick_policy(name, rng, script=(), taken=None):
+    """
+    创建升级选择策略
+    参数:
+        name: 策略名（'random'随机、'greedy'按bot.UPGRADE_PREFERENCE、'scripted'按脚本顺序，脚本选项未出现时按贪心）
+        rng: random.Random，随机策略使用
+        script: 脚本策略的升级顺序
+        taken: 列表，记录每次选择的升级
+    返回: Game.upgrade_policy可用的函数 (score, options) -> 1/2/3
+    """
+    taken = taken if taken is not None else []
+    position = [0]  # 脚本进度
+
+    def policy(score, options):
+        if name == 'random':
+            index = rng.randrange(len(options))
+        elif name == 'scripted' and position[0] < len(script) and script[position[0]] in options:
+            index = options.index(script[position[0]])
+            position[0] += 1
+        else:
+            index = preferred_upgrade(score, options) - 1
+        taken.append(options[index])
+        return index + 1
+
+    return policy
+
+
+def run_one(task):
+    """
+    进行一局随机模式对局（工作进程中执行）
+    参数:
+        task: 字典（cell网格点序号、overrides配置覆盖、policy策略、script脚本、seed种子、ticks帧数上限）
+    返回: 结果字典（存活帧数、分数、是否被撞、升级路线）
+    """
+    with config_overrides(task['overrides']):
+        game = Game(headless=True, seed=task['seed'])
+        game.game_mode = RANDOM_MODE
+        path = []
+        bot = AutoPilot(game, make_pick_policy(task['policy'], random.Random(task['seed']),
+                                               task['script'], path))
+        ticks = 0
+        while ticks < task['ticks'] and not game.game_over:
+            bot.tick()
+            ticks += 1
+    return {
+        'cell': task['cell'],
+        'policy': task['policy'],
+        'ticks': ticks,
+        'score': game.score,
+        'died': game.game_over,
+        'path': path,
+    }
+
+
+def parse_grid(specs):
+    """
+    解析参数网格
+    参数:
+        specs: ['NAME=v1,v2', ...]
+    返回: 网格点列表 [{常量名: 值}, ...]（笛卡尔积；没有网格时为[{}]）
+    """
+    axes = []
+    for spec in specs or ():
+        name, _, values = spec.partition('=')
+        if not hasattr(config, name) or not isinstance(getattr(config, name), (int, float)):
+            raise ValueError(f"Not a numeric config constant: {name}")
+        kind = type(getattr(config, name))
+        axes.append([(name, kind(value)) for value in values.split(',')])
+    return [dict(point) for point in itertools.product(*axes)]
+
+
+def summarize(results, win_score=None):
+    """
+    汇总一组对局结果
+    参数:
+        results: run_one的结果列表
+        win_score: 获胜分数；None表示存活到帧数上限即为获胜
+    返回: 统计字典（存活时间/分数分位数、存活率、胜率、升级路线胜率）
+    """
+    seconds = np.array([result['ticks'] for result in results]) / FPS
+    scores = np.array([result['score'] for result in results])
+    if win_score is None:
+        wins = np.array([not result['died'] for result in results])
+    else:
+        wins = scores >= win_score
+    summary = {
+        'runs': len(results),
+        'survival_rate': float(np.mean([not result['died'] for result in results])),
+        'win_rate': float(wins.mean()),
+        'survival_s': {f'p{q}': float(v) for q, v in zip(PERCENTILES, np.percentile(seconds, PERCENTILES))},
+        'score': {f'p{q}': float(v) for q, v in zip(PERCENTILES, np.percentile(scores, PERCENTILES))},
+    }
+    summary['survival_s']['mean'] = float(seconds.mean())
+    summary['score']['mean'] = float(scores.mean())
+
+    # 升级路线（前PATH_LENGTH次升级）的出现次数与胜率
+    paths = defaultdict(lambda: [0, 0])
+    for result, won in zip(results, wins.tolist()):
+        counts = paths[' > '.join(result['path'][:PATH_LENGTH]) or '(none)']
+        counts[0] += 1
+        counts[1] += won
+    summary['paths'] = [{'path': path, 'runs': runs, 'win_rate': won / runs}
+                        for path, (runs, won) in sorted(paths.items(), key=lambda item: -item[1][0])]
+    return summary
+
+
+def run_sweep(cells, policies, runs, ticks, script=(), seed=0, workers=None, win_score=None):
+    """
+    在进程池中进行全部对局
+    所有网格点与策略使用同一组对局种子，比较时只有被测因素不同
+    参数:
+        cells: 网格点列表
+        policies: 策略名列表
+        runs: 每个网格点、每种策略的对局数
+        ticks: 每局帧数上限
+        script: 脚本策略的升级顺序
+        seed: 根种子
+        workers: 进程数，默认CPU核数
+        win_score: 获胜分数；None表示存活到帧数上限即为获胜
+    返回: 结果列表 [{'overrides': ..., 'policy': ..., 统计...}, ...]
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(runs, np.uint64).tolist()
+    tasks = [{'cell': cell, 'overrides': overrides, 'policy': policy, 'script': list(script),
+              'seed': run_seed, 'ticks': ticks}
+             for cell, overrides in enumerate(cells) for policy in policies for run_seed in seeds]
+
+    workers = workers or os.cpu_count() or 1
+    grouped = defaultdict(list)
+    with mp.Pool(workers) as pool:
+        chunksize = max(1, len(tasks) // (workers * 8))
+        for result in pool.imap_unordered(run_one, tasks, chunksize):
+            grouped[result['cell'], result['policy']].append(result)
+
+    return [dict(overrides=cells[cell], policy=policy, **summarize(grouped[cell, policy], win_score))
+            for cell in range(len(cells)) for policy in policies]
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Monte Carlo balance simulator for Random Mode upgrades")
+    parser.add_argument("--runs", type=int, default=BALANCE_RUNS,
+                        help="runs per grid point and policy")
+    parser.add_argument("--ticks", type=int, default=BALANCE_TICKS,
+                        help="maximum simulated frames per run")
+    parser.add_argument("--policy", action="append", choices=POLICIES,
+                        help="upgrade pick policy (repeatable, default: all)")
+    parser.add_argument("--script", default="",
+                        help="comma-separated upgrade order for the scripted policy")
+    parser.add_argument("--grid", action="append", metavar="NAME=V1,V2",
+                        help="config constant values to sweep (repeatable, cartesian product)")
+    parser.add_argument("--win-score", type=int, default=None,
+                        help="score that counts a run as won (default: surviving until --ticks)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=0, help="root seed for the run seeds")
+    parser.add_argument("--json", metavar="PATH", help="write the result as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """运行模拟并打印报告"""
+    args = parse_args(argv)
+    script = [name for name in args.script.split(',') if name]
+    unknown = [name for name in script if name not in UPGRADE_DESCRIPTIONS]
+    if unknown:
+        print(f"Unknown upgrades in --script: {', '.join(unknown)}")
+        return 2
+    try:
+        cells = parse_grid(args.grid)
+    except ValueError as e:
+        print(e)
+        return 2
+    policies = args.policy or list(POLICIES)
+
+    start = time.perf_counter()
+    results = run_sweep(cells, policies, args.runs, args.ticks, script, args.seed, args.workers, args.win_score)
+    elapsed = time.perf_counter() - start
+    total = len(cells) * len(policies) * args.runs
+    win = f"score >= {args.win_score}" if args.win_score is not None else "survived"
+    print(f"{total} runs in {elapsed:.1f}s (cap {args.ticks / FPS:.0f}s, win = {win})")
+
+    for result in results:
+        overrides = ', '.join(f"{name}={value}" for name, value in result['overrides'].items()) or 'defaults'
+        survival, score = result['survival_s'], result['score']
+        print(f"[{overrides}] {result['policy']}: survival p10/p50/p90 "
+              f"{survival['p10']:.0f}/{survival['p50']:.0f}/{survival['p90']:.0f}s, "
+              f"score p10/p50/p90 {score['p10']:.0f}/{score['p50']:.0f}/{score['p90']:.0f}, "
+              f"survived {result['survival_rate']:.0%}, won {result['win_rate']:.0%}")
+        for path in result['paths'][:TOP_PATHS]:
+            print(f"    {path['runs']:>5} runs  won {path['win_rate']:>4.0%}  {path['path']}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({'runs': args.runs, 'ticks': args.ticks, 'win_score': args.win_score,
+                       'results': results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,416 @@
+"""
+游戏主循环基准测试
+按脚本搭建若干负载场景，逐帧统计各阶段（生成、更新、碰撞、绘制）耗时的分位数与每秒逻辑帧数，
+可保存为JSON并与基准文件对比，超出容差时返回非零退出码
+
+绘制使用SDL的dummy视频驱动，不打开真实窗口；按键和升级选择通过注入的KeyState与升级策略提供
+
+用法:
+    python bench_game_loop.py                              # 运行全部场景并打印报告
+    python bench_game_loop.py --scenario versus_full       # 只运行指定场景（可重复）
+    python bench_game_loop.py --json loop.json             # 同时保存为JSON
+    python bench_game_loop.py --baseline loop.json         # 与基准对比，出现性能回退时返回1
+"""
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # 必须在初始化pygame显示之前设置
+
+import argparse
+import json
+import random
+import sys
+import time
+import numpy as np
+import pygame
+from config import *
+from game import Game
+from versus_game import VersusGame
+from tournament import TournamentGame, TOURNAMENT_CONTROLS
+from simulation import KeyState
+from bench_memory import build_endgame
+from profiler import entity_counts
+
+BENCH_SEED = 2024           # 所有场景使用固定种子，保证每次运行的负载相同
+BENCH_TICKS = FPS * 10      # 每个场景测量的逻辑帧数
+BENCH_WARMUP_TICKS = FPS    # 测量前预热的逻辑帧数（填充精灵与文字缓存）
+PERCENTILES = (50, 95, 99)  # 报告的分位数
+PHASES = ('spawn', 'update', 'collisions', 'draw')
+
+# 各阶段包含的游戏方法
+PHASE_METHODS = {
+    'spawn': ('spawn_aliens', 'spawn_bullets', 'spawn_wingman_bullets'),
+    'update': ('handle_input', 'update_bullets', 'update_aliens', 'update_wingmen', 'update_explosions'),
+    'collisions': ('check_collisions',),
+}
+
+# 场景参数
+RANDOM_MID_SCORE = 5000     # 随机模式中期分数
+RANDOM_MID_WINGMEN = 6      # 随机模式中期僚机数量
+VERSUS_ALIEN_ROWS = 8       # 对战模式每个区域铺满的外星人行数
+TOURNAMENT_ALIEN_ROWS = 8   # 锦标赛每个区域铺满的外星人行数
+TOURNAMENT_REFILL_INTERVAL = ALIEN_SIZE * 2 // ALIEN_SPEED  # 锦标赛每个区域补充一行外星人的间隔（逻辑帧）
+BURST_ALIEN_ROWS = 12       # 清屏爆发场景每次铺满的外星人行数
+BURST_INTERVAL = FPS        # 清屏爆发场景重新铺满并清屏的间隔（逻辑帧）
+STRAFE_INTERVAL = FPS * 2   # 玩家左右往返移动的间隔（逻辑帧）
+
+PHASE_COMPARE_FLOOR_MS = 0.05  # 基准中低于此值的阶段不参与对比（计时噪声占主导）
+
+
+class PhaseTimer:
+    """
+    阶段计时器
+    把游戏对象的方法替换为计时包装，累计每个逻辑帧中各阶段的耗时
+    """
+
+    def __init__(self):
+        """初始化计时器"""
+        self.current = dict.fromkeys(PHASES, 0.0)      # 本帧各阶段累计耗时（秒）
+        self.samples = {phase: [] for phase in PHASES}  # 每帧各阶段耗时（秒）
+
+    def wrap(self, obj, name, phase):
+        """
+        把对象的方法替换为计时包装
+        参数:
+            obj: 游戏对象
+            name: 方法名（对象没有该方法时忽略）
+            phase: 计入的阶段
+        """
+        method = getattr(obj, name, None)
+        if method is None:
+            return
+        current = self.current
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                current[phase] += clock() - start
+
+        setattr(obj, name, timed)
+
+    def instrument(self, game):
+        """
+        为游戏的各阶段方法安装计时包装
+        参数:
+            game: Game、VersusGame或TournamentGame对象
+        """
+        for phase, names in PHASE_METHODS.items():
+            for name in names:
+                self.wrap(game, name, phase)
+        if game.background_manager is not None:
+            self.wrap(game.background_manager, 'update', 'update')
+        self.wrap(game, 'draw', 'draw')
+
+    def end_tick(self):
+        """结束一帧：保存本帧各阶段耗时并清零"""
+        for phase in PHASES:
+            self.samples[phase].append(self.current[phase])
+            self.current[phase] = 0.0
+
+    def reset(self):
+        """丢弃已记录的样本（预热结束时调用）"""
+        for phase in PHASES:
+            self.samples[phase].clear()
+            self.current[phase] = 0.0
+
+
+def strafe(keys, tick, left=pygame.K_LEFT, right=pygame.K_RIGHT):
+    """
+    让玩家按固定间隔左右往返移动
+    参数:
+        keys: 注入的KeyState
+        tick: 当前逻辑帧序号
+        left/right: 左右移动按键
+    """
+    if tick % STRAFE_INTERVAL == 0:
+        going_left = (tick // STRAFE_INTERVAL) % 2 == 0
+        keys.release(right if going_left else left)
+        keys.press(left if going_left else right)
+
+
+def fill_rows(game, rows, health_multiplier=1.0):
+    """
+    在屏幕上半部分铺满外星人
+    参数:
+        game: Game对象
+        rows: 行数
+        health_multiplier: 外星人血量倍数
+    """
+    xs = list(range(0, SCREEN_WIDTH - ALIEN_SIZE, ALIEN_SIZE))
+    for row in range(rows):
+        game.aliens.spawn(xs, row * ALIEN_SIZE, health_multiplier)
+
+
+def new_game(mode, seed):
+    """
+    创建绘制到dummy显示的单人游戏，按键与升级选择由脚本注入
+    参数:
+        mode: 游戏模式
+        seed: 随机数种子
+    返回: Game对象
+    """
+    game = Game(seed=seed)
+    game.game_mode = mode
+    game.input_keys = KeyState()
+    game.upgrade_policy = lambda score, upgrades: 1
+    return game
+
+
+def scenario_classic(seed):
+    """经典模式开局：默认属性，玩家左右往返"""
+    game = new_game(CLASSIC_MODE, seed)
+    return game, lambda game, tick: strafe(game.input_keys, tick)
+
+
+def scenario_random_mid(seed):
+    """随机模式5000分：三排子弹、6架僚机、里程碑叠加的外星人数量"""
+    game = new_game(RANDOM_MODE, seed)
+    game.score = RANDOM_MID_SCORE
+    game.last_upgrade_score = RANDOM_MID_SCORE
+    game.last_milestone_score = RANDOM_MID_SCORE
+    game.milestone_aliens_multiplier += MILESTONE_ALIEN_INCREASE * (RANDOM_MID_SCORE // MILESTONE_SCORE_INTERVAL)
+    game.player.has_triple_shot = True
+    for _ in range(RANDOM_MID_WINGMEN):
+        game.apply_upgrade(UPGRADE_WINGMAN)
+    return game, lambda game, tick: strafe(game.input_keys, tick)
+
+
+def scenario_endgame(seed):
+    """终局：越过升级停止线并叠加血量提升，外星人铺满上半屏，大量爆炸"""
+    game = new_game(RANDOM_MODE, seed)
+    build_endgame(game, random.Random(seed))
+    game.input_keys.clear()
+    return game, lambda game, tick: strafe(game.input_keys, tick)
+
+
+def scenario_versus_full(seed):
+    """对战模式满屏：两个区域都铺满外星人，双方左右往返"""
+    game = VersusGame(seed=seed)
+    game.input_keys = KeyState()
+    for arena in game.engine.arenas:
+        left, _, right, _ = arena.bounds
+        xs = list(range(left, right - ALIEN_SIZE, ALIEN_SIZE))
+        for row in range(VERSUS_ALIEN_ROWS):
+            game.aliens.spawn(xs, row * ALIEN_SIZE, 1.0, arena.index)
+
+    def script(game, tick):
+        strafe(game.input_keys, tick, pygame.K_a, pygame.K_d)
+        strafe(game.input_keys, tick)
+    return game, script
+
+
+def scenario_clear_burst(seed):
+    """清屏爆发：每秒铺满外星人并立即清屏，集中产生爆炸粒子"""
+    game = new_game(RANDOM_MODE, seed)
+    game.player.has_clear_screen = True
+    game.input_keys.press(pygame.K_SPACE)
+
+    def script(game, tick):
+        if tick % BURST_INTERVAL == 0:
+            fill_rows(game, BURST_ALIEN_ROWS)
+            game.last_clear_screen_time = -game.player.clear_screen_cooldown  # 冷却立即结束
+        strafe(game.input_keys, tick)
+    return game, script
+
+
+def scenario_tournament_full(seed):
+    """锦标赛满员后期：8个区域都铺满外星人并持续从顶部补充，所有玩家三排子弹，键盘玩家左右往返"""
+    game = TournamentGame(TOURNAMENT_MAX_PLAYERS, seed=seed)
+    game.input_keys = KeyState()
+    arenas = game.engine.arenas
+    columns = [list(range(left, right - ALIEN_SIZE, ALIEN_SIZE)) for left, _, right, _ in game.bounds]
+    for arena, xs in zip(arenas, columns):
+        arena.player.has_triple_shot = True
+        top = arena.bounds[1]
+        for row in range(TOURNAMENT_ALIEN_ROWS):
+            game.aliens.spawn(xs, top + row * ALIEN_SIZE, 1.0, arena.index)
+
+    def script(game, tick):
+        if tick % TOURNAMENT_REFILL_INTERVAL == 0:
+            for arena, xs in zip(arenas, columns):
+                game.aliens.spawn(xs, arena.bounds[1] - ALIEN_SIZE, 1.0, arena.index)
+        for left, right, _, _ in TOURNAMENT_CONTROLS:
+            strafe(game.input_keys, tick, left, right)
+    return game, script
+
+
+SCENARIOS = {
+    'classic': scenario_classic,
+    'random_mid': scenario_random_mid,
+    'endgame': scenario_endgame,
+    'versus_full': scenario_versus_full,
+    'tournament_full': scenario_tournament_full,
+    'clear_burst': scenario_clear_burst,
+}
+
+
+def keep_alive(game):
+    """
+    清除结束标志，让场景在玩家被撞或获胜后继续模拟，负载在整个测量期间保持不变
+    参数:
+        game: Game、VersusGame或TournamentGame对象
+    """
+    game.game_over = False
+    if isinstance(game, TournamentGame):
+        # 被淘汰的区域恢复生成与射击
+        game.winner = None
+        game.eliminated.clear()
+        for arena in game.engine.arenas:
+            arena.active = True
+    elif isinstance(game, VersusGame):
+        game.winner = None
+    else:
+        game.game_won = False
+
+
+def summarize(samples):
+    """
+    计算耗时样本的统计量
+    参数:
+        samples: 每帧耗时（秒）列表
+    返回: {'mean_ms': ..., 'p50_ms': ..., ...}
+    """
+    values = np.array(samples) * 1000
+    summary = {'mean_ms': float(values.mean())}
+    for q, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f'p{q}_ms'] = float(value)
+    return summary
+
+
+def run_scenario(name, ticks=BENCH_TICKS, warmup=BENCH_WARMUP_TICKS, seed=BENCH_SEED):
+    """
+    运行一个场景并统计各阶段耗时
+    参数:
+        name: 场景名
+        ticks: 测量的逻辑帧数
+        warmup: 预热的逻辑帧数
+        seed: 随机数种子
+    返回: 结果字典（每秒逻辑帧数、各阶段与整帧耗时统计、实体峰值数量）
+    """
+    game, script = SCENARIOS[name](seed)
+    game.profiler.close()  # 阶段耗时由PhaseTimer统计，不需要游戏自带的帧分析器
+    game.profiler = None
+    timer = PhaseTimer()
+    timer.instrument(game)
+    clock = time.perf_counter
+    frames = []
+    peaks = [0, 0, 0, 0]
+    elapsed = 0.0
+
+    for tick in range(warmup + ticks):
+        if tick == warmup:
+            timer.reset()
+            frames.clear()
+            peaks = [0, 0, 0, 0]
+            elapsed = 0.0
+        script(game, tick)
+
+        start = clock()
+        game.step()
+        game.draw(1.0)
+        frame = clock() - start
+
+        timer.end_tick()
+        frames.append(frame)
+        elapsed += frame
+        peaks = [max(peak, count) for peak, count in zip(peaks, entity_counts(game))]
+        keep_alive(game)
+
+    result = {
+        'ticks': ticks,
+        'ticks_per_second': ticks / elapsed,
+        'frame': summarize(frames),
+        'phases': {phase: summarize(timer.samples[phase]) for phase in PHASES},
+        'peak_aliens': peaks[0],
+        'peak_bullets': peaks[1],
+        'peak_particles': peaks[2],
+    }
+    pygame.quit()
+    return result
+
+
+def compare(result, baseline, tolerance):
+    """
+    与基准结果对比
+    参数:
+        result: 本次结果
+        baseline: 基准结果
+        tolerance: 允许的相对变慢（如0.25表示25%）
+    返回: 超出容差的项目描述列表
+    """
+    regressions = []
+    for name, reference in baseline['scenarios'].items():
+        current = result['scenarios'].get(name)
+        if current is None:
+            continue
+        checks = [(f"{name} frame p50", current['frame']['p50_ms'], reference['frame']['p50_ms']),
+                  (f"{name} frame p95", current['frame']['p95_ms'], reference['frame']['p95_ms'])]
+        for phase, stats in reference['phases'].items():
+            if stats['p50_ms'] >= PHASE_COMPARE_FLOOR_MS:
+                checks.append((f"{name} {phase} p50", current['phases'][phase]['p50_ms'], stats['p50_ms']))
+        for label, value, ref in checks:
+            if value > ref * (1 + tolerance):
+                regressions.append(f"{label}: {value:.3f} ms > {ref:.3f} ms (+{tolerance:.0%} allowed)")
+
+        rate, ref_rate = current['ticks_per_second'], reference['ticks_per_second']
+        if rate * (1 + tolerance) < ref_rate:
+            regressions.append(f"{name} ticks/s: {rate:.0f} < {ref_rate:.0f} (-{tolerance:.0%} allowed)")
+    return regressions
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Per-phase timing benchmark for the game loop")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run (repeatable, default: all)")
+    parser.add_argument("--ticks", type=int, default=BENCH_TICKS,
+                        help="number of measured frames per scenario")
+    parser.add_argument("--warmup", type=int, default=BENCH_WARMUP_TICKS,
+                        help="number of unmeasured frames before each scenario")
+    parser.add_argument("--json", metavar="PATH", help="write the result as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown over the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    运行基准测试并打印报告
+    返回: 进程退出码（0正常，1存在性能回退）
+    """
+    args = parse_args(argv)
+    names = args.scenario or list(SCENARIOS)
+    result = {'seed': BENCH_SEED, 'scenarios': {}}
+
+    for name in names:
+        stats = run_scenario(name, args.ticks, args.warmup)
+        result['scenarios'][name] = stats
+        print(f"{name} ({stats['ticks']} ticks, {stats['ticks_per_second']:.0f} ticks/s, "
+              f"peak aliens {stats['peak_aliens']}, bullets {stats['peak_bullets']}, "
+              f"particles {stats['peak_particles']}):")
+        header = ''.join(f"{'p' + str(q):>9}" for q in PERCENTILES)
+        print(f"  {'phase (ms)':<12}{'mean':>9}{header}")
+        for label, summary in [*stats['phases'].items(), ('frame', stats['frame'])]:
+            values = ''.join(f"{summary[f'p{q}_ms']:>9.3f}" for q in PERCENTILES)
+            print(f"  {label:<12}{summary['mean_ms']:>9.3f}{values}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
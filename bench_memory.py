@@ -0,0 +1,209 @@
+"""
+内存基准测试
+统计每种实体的单个实例占用字节数，并以无头模式模拟一波后期（终局）攻势，
+报告实体数量、Python堆峰值与进程峰值RSS，可与基准文件对比以发现内存回退
+
+用法:
+    python bench_memory.py                          # 打印报告
+    python bench_memory.py --json result.json       # 同时保存为JSON
+    python bench_memory.py --baseline result.json   # 与基准对比，超出容差时返回非零退出码
+"""
+
+import argparse
+import json
+import random
+import resource
+import sys
+import tracemalloc
+import numpy as np
+import pygame
+from config import *
+from entities import Player, Wingman
+from entity_store import AlienStore, BulletStore
+from particles import ParticleSystem
+from game import Game
+
+INSTANCE_SAMPLES = 2000     # 统计单个实例大小时创建的实例数量
+ENDGAME_SEED = 0            # 终局攻势使用固定种子，保证每次运行的负载相同，可与基准对比
+
+# 终局攻势设置：分数越过升级停止线，里程碑与血量提升均已叠加
+ENDGAME_SCORE = UPGRADE_STOP_SCORE + 5 * HEALTH_BOOST_INTERVAL
+ENDGAME_WINGMEN = 6         # 僚机数量
+ENDGAME_ALIEN_ROWS = 12     # 额外铺满的外星人行数
+ENDGAME_EXPLOSIONS = 200    # 同时生成的爆炸数量
+ENDGAME_TICKS = FPS * 5     # 模拟的逻辑帧数
+
+
+def measure_instances(factory, samples=INSTANCE_SAMPLES):
+    """
+    统计单个实例占用的字节数
+    参数:
+        factory: 无参数的实例构造函数
+        samples: 创建的实例数量
+    返回: 平均每个实例分配的字节数（含实例引用的子对象，不含容器列表）
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory() for _ in range(samples)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before - sys.getsizeof(instances)) / samples
+
+
+def store_row_bytes(store_class):
+    """
+    计算列式存储中每个实体（每行）占用的字节数
+    参数:
+        store_class: EntityStore子类
+    返回: 各字段元素大小之和
+    """
+    return sum(np.dtype(dtype).itemsize for _, dtype in store_class.FIELDS)
+
+
+def entity_sizes():
+    """
+    统计游戏实际使用的实体表示的大小（玩家和僚机为对象，外星人、子弹和粒子为列式存储的行）
+    返回: {实体名: 字节数}
+    """
+    rng = random.Random(ENDGAME_SEED)  # 僚机的随机移动方向与间隔，固定种子使每次运行创建相同的实例
+    return {
+        'Player': measure_instances(lambda: Player(0, 0)),
+        'Wingman': measure_instances(lambda: Wingman(0, rng=rng)),
+        'AlienStore row': store_row_bytes(AlienStore),
+        'BulletStore row': store_row_bytes(BulletStore),
+        'Explosion': store_row_bytes(ParticleSystem) * EXPLOSION_PARTICLES,
+    }
+
+
+def build_endgame(game, rng=random):
+    """
+    把无头游戏设置为终局状态：满级升级、叠加的里程碑倍数、铺满屏幕的外星人和大量爆炸
+    参数:
+        game: 无头模式的Game对象
+        rng: 随机数流（random.Random或random模块），用于爆炸位置
+    """
+    game.game_mode = RANDOM_MODE
+    game.score = ENDGAME_SCORE
+    game.last_upgrade_score = ENDGAME_SCORE
+    game.last_milestone_score = ENDGAME_SCORE
+    game.last_health_boost_score = ENDGAME_SCORE
+    game.milestone_aliens_multiplier += MILESTONE_ALIEN_INCREASE * (ENDGAME_SCORE // MILESTONE_SCORE_INTERVAL)
+    game.alien_health_multiplier += HEALTH_BOOST_MULTIPLIER * ((ENDGAME_SCORE - UPGRADE_STOP_SCORE) // HEALTH_BOOST_INTERVAL)
+    game.player.has_triple_shot = True
+    for _ in range(ENDGAME_WINGMEN):
+        game.apply_upgrade(UPGRADE_WINGMAN)
+
+    # 屏幕上半部分铺满外星人
+    xs = list(range(0, SCREEN_WIDTH - ALIEN_SIZE, ALIEN_SIZE))
+    for row in range(ENDGAME_ALIEN_ROWS):
+        game.aliens.spawn(xs, row * ALIEN_SIZE, game.alien_health_multiplier)
+    game.particles.emit([rng.uniform(0, SCREEN_WIDTH) for _ in range(ENDGAME_EXPLOSIONS)],
+                        [rng.uniform(0, SCREEN_HEIGHT) for _ in range(ENDGAME_EXPLOSIONS)])
+
+    # 左右移动（子弹自动发射）
+    game.input_keys.set((pygame.K_LEFT,))
+
+
+def run_endgame(ticks=ENDGAME_TICKS, seed=ENDGAME_SEED):
+    """
+    模拟终局攻势并统计内存
+    参数:
+        ticks: 模拟的逻辑帧数
+        seed: 随机数种子（游戏与爆炸位置共用）
+    返回: 结果字典（实体峰值数量、Python堆峰值、进程峰值RSS）
+    """
+    tracemalloc.start()
+    game = Game(headless=True, seed=seed)
+    build_endgame(game, random.Random(seed))
+    peak_aliens = peak_bullets = peak_particles = 0
+    for tick in range(ticks):
+        if tick == ticks // 2:
+            game.input_keys.set((pygame.K_RIGHT,))
+        game.step()
+        peak_aliens = max(peak_aliens, len(game.aliens))
+        peak_bullets = max(peak_bullets, len(game.bullets))
+        peak_particles = max(peak_particles, len(game.particles))
+    heap_peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # Linux下ru_maxrss单位为KB，macOS下为字节
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != 'darwin':
+        rss *= 1024
+    return {
+        'ticks': ticks,
+        'peak_aliens': peak_aliens,
+        'peak_bullets': peak_bullets,
+        'peak_particles': peak_particles,
+        'heap_peak_bytes': heap_peak,
+        'peak_rss_bytes': rss,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """
+    与基准结果对比
+    参数:
+        result: 本次结果
+        baseline: 基准结果
+        tolerance: 允许的相对增长（如0.1表示10%）
+    返回: 超出容差的项目描述列表
+    """
+    regressions = []
+    checks = [(f"{name} bytes", result['entities'][name], size)
+              for name, size in baseline['entities'].items() if name in result['entities']]
+    checks.append(('endgame heap peak', result['endgame']['heap_peak_bytes'],
+                   baseline['endgame']['heap_peak_bytes']))
+    for label, value, reference in checks:
+        if value > reference * (1 + tolerance):
+            regressions.append(f"{label}: {value:.0f} > {reference:.0f} (+{tolerance:.0%} allowed)")
+    return regressions
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Memory benchmark for entities and an endgame wave")
+    parser.add_argument("--ticks", type=int, default=ENDGAME_TICKS,
+                        help="number of simulated frames for the endgame wave")
+    parser.add_argument("--json", metavar="PATH", help="write the result as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="compare against a previous JSON result")
+    parser.add_argument("--tolerance", type=float, default=0.1,
+                        help="allowed relative growth over the baseline")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """
+    运行基准测试并打印报告
+    返回: 进程退出码（0正常，1存在内存回退）
+    """
+    args = parse_args(argv)
+    result = {'entities': entity_sizes(), 'endgame': run_endgame(args.ticks)}
+
+    print("Bytes per entity:")
+    for name, size in result['entities'].items():
+        print(f"  {name:<16}{size:>10.1f}")
+    endgame = result['endgame']
+    print(f"Endgame wave ({endgame['ticks']} ticks):")
+    print(f"  peak aliens {endgame['peak_aliens']}, bullets {endgame['peak_bullets']}, "
+          f"particles {endgame['peak_particles']}")
+    print(f"  heap peak {endgame['heap_peak_bytes'] / 1024:.1f} KiB, "
+          f"peak RSS {endgame['peak_rss_bytes'] / 1024 / 1024:.1f} MiB")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+"""
+自动驾驶机器人模块
+通过注入的按键状态（与handle_input读取键盘相同的路径）控制单人模式的玩家：
+对准最近的外星人列、躲避靠近玩家的外星人、清屏冷却结束时使用清屏，升级选择策略可替换
+每帧的决策复用碰撞检测建立的外星人空间哈希，只读取查询到的外星人坐标，不逐个遍历外星人，
+可在上千个实体的终局画面中长时间运行
+
+用法:
+    python bot.py --minutes 60                      # 随机模式无头浸泡测试60分钟
+    python bot.py --minutes 5 --endgame             # 每局从铺满外星人的终局画面开始
+    python bot.py --mode classic --games 100 --seed 1
+"""
+
+import argparse
+import random
+import sys
+import time
+from collections import deque
+import numpy as np
+import pygame
+from config import *
+from game import Game
+from simulation import KeyState
+
+# 默认升级偏好（靠前的优先）
+UPGRADE_PREFERENCE = (
+    UPGRADE_TRIPLE_SHOT,
+    UPGRADE_WINGMAN,
+    UPGRADE_BULLET_SPEED,
+    UPGRADE_SCORE_MULTIPLIER,
+    UPGRADE_CLEAR_SCREEN,
+    UPGRADE_PLAYER_SPEED,
+)
+
+DECISION_SAMPLES = 10000    # 浸泡测试中用于统计决策耗时分位数的最近决策数
+
+
+def preferred_upgrade(score, options):
+    """
+    默认升级选择策略：按UPGRADE_PREFERENCE选择最靠前的选项
+    参数:
+        score: 当前分数
+        options: 升级选项列表
+    返回: 选项编号（1/2/3）
+    """
+    return min(range(len(options)), key=lambda i: UPGRADE_PREFERENCE.index(options[i])) + 1
+
+
+class AutoPilot:
+    """
+    单人模式自动驾驶
+    每个逻辑帧调用decide()得到按键并写入game.input_keys，再由game.step()按正常输入处理
+
+    决策规则（外星人到达底部即判负，因此以击落最低的外星人为主，只躲避即将相撞的外星人）:
+        - 玩家上方BOT_DODGE_LOOKAHEAD像素内的外星人视为障碍，求出安全的候选x坐标
+        - 当前位置安全时，在所在的连续安全区间内对准最低一行格子中离玩家最近的外星人列
+        - 当前位置不安全时移向最近的安全位置
+        - 清屏就绪且外星人不少于BOT_CLEAR_MIN_ALIENS个（或无处可躲）时按下空格
+    """
+
+    def __init__(self, game, upgrade_policy=preferred_upgrade):
+        """
+        接管游戏的输入与升级选择
+        参数:
+            game: Game对象（无头模式或注入了KeyState的窗口模式）
+            upgrade_policy: 升级选择策略 (score, options) -> 1/2/3，None表示保留游戏原有的选择方式
+        """
+        self.game = game
+        if game.input_keys is None:
+            game.input_keys = KeyState()
+        if upgrade_policy is not None:
+            game.upgrade_policy = upgrade_policy
+        self.candidates = np.arange(0, SCREEN_WIDTH - PLAYER_SIZE + 1, PLAYER_SPEED)  # 候选x坐标
+        self.clears = 0             # 使用清屏的次数
+
+    def decide(self):
+        """
+        根据当前画面决定本帧的按键
+        返回: 按下的按键码元组
+        """
+        game = self.game
+        aliens = game.aliens
+        if not aliens.count:
+            return ()
+        player = game.player
+        grid = game.alien_grid
+        if len(grid) != aliens.count:
+            # 网格不是上一帧碰撞检测后的状态（如刚开局或从快照恢复），重建一次
+            grid.rebuild(*aliens.rect_arrays())
+
+        # 玩家上方的危险带：空间哈希粗筛后按矩形精确判断
+        top = int(player.y) - BOT_DODGE_LOOKAHEAD
+        near = np.array(grid.query(0, top, SCREEN_WIDTH, BOT_DODGE_LOOKAHEAD + player.height), dtype=np.int64)
+        near_ys = np.trunc(aliens.y[near]).astype(np.int64)
+        near = near[(near_ys + ALIEN_SIZE > top) & (near_ys < player.y + player.height)]
+        near_xs = np.trunc(aliens.x[near]).astype(np.int64)[None, :]
+        candidates = self.candidates[:, None]
+        blocked = ((near_xs < candidates + player.width + BOT_DODGE_MARGIN) &
+                   (near_xs + ALIEN_SIZE > candidates - BOT_DODGE_MARGIN)).any(axis=1)
+        current = min(int(round(player.x / PLAYER_SPEED)), len(self.candidates) - 1)
+        safe = np.flatnonzero(~blocked)
+
+        keys = []
+        clear_ready = (player.has_clear_screen and
+                       game.get_time() - game.last_clear_screen_time >= player.clear_screen_cooldown)
+        if clear_ready and (aliens.count >= BOT_CLEAR_MIN_ALIENS or not len(safe)):
+            keys.append(pygame.K_SPACE)
+            self.clears += 1
+
+        if blocked[current]:
+            if not len(safe):
+                return tuple(keys)
+            goal = self.candidates[safe[np.abs(safe - current).argmin()]]
+        else:
+            # 当前位置所在的连续安全区间
+            blocked_idx = np.flatnonzero(blocked)
+            below = blocked_idx[blocked_idx < current]
+            above = blocked_idx[blocked_idx > current]
+            low = self.candidates[below[-1] + 1] if len(below) else self.candidates[0]
+            high = self.candidates[above[0] - 1] if len(above) else self.candidates[-1]
+            goal = min(max(self._target_x(grid), low), high)
+
+        step = player.speed * player.speed_multiplier
+        if goal < player.x - step / 2:
+            keys.append(pygame.K_LEFT)
+        elif goal > player.x + step / 2:
+            keys.append(pygame.K_RIGHT)
+        return tuple(keys)
+
+    def _target_x(self, grid):
+        """
+        在空间哈希最下方一行格子的外星人中选择离玩家最近的一列
+        参数:
+            grid: 与外星人存储一致的SpatialHash
+        返回: 使玩家对准该外星人的玩家x坐标
+        """
+        player = self.game.player
+        centers = np.trunc(self.game.aliens.x[grid.bottom_row()]) + ALIEN_SIZE / 2
+        nearest = centers[np.abs(centers - (player.x + player.width / 2)).argmin()]
+        return nearest - player.width / 2
+
+    def tick(self):
+        """决策并推进一个逻辑帧"""
+        self.game.input_keys.set(self.decide())
+        self.game.step()
+
+    def run(self, max_ticks):
+        """
+        由机器人操控推进游戏
+        参数:
+            max_ticks: 最多模拟的帧数
+        返回: 实际模拟的帧数（游戏结束或获胜时提前停止）
+        """
+        game = self.game
+        if game.game_mode is None:
+            game.game_mode = CLASSIC_MODE
+        ticks = 0
+        while ticks < max_ticks and not game.game_over and not game.game_won:
+            self.tick()
+            ticks += 1
+        return ticks
+
+
+def soak(mode, seconds, games=None, game_ticks=None, seed=None, endgame=False):
+    """
+    无头浸泡测试：机器人连续进行对局，直到用完时间或局数，定期打印进度
+    出现异常时打印该局的种子（可用main.py --seed复现）后重新抛出
+    参数:
+        mode: 游戏模式（经典或随机）
+        seconds: 运行的真实时间上限（秒）
+        games: 最多对局数，None表示不限
+        game_ticks: 每局帧数上限，None表示不限
+        seed: 根种子，每局种子由它派生，默认随机
+        endgame: 是否每局从终局画面开始（见bench_memory.build_endgame）
+    返回: 统计字典
+    """
+    if endgame:
+        from bench_memory import build_endgame  # 延迟导入，只有终局测试需要
+
+    seeds = np.random.SeedSequence(seed).generate_state(1 << 16, np.uint64)
+    decisions = deque(maxlen=DECISION_SAMPLES)
+    stats = {'games': 0, 'ticks': 0, 'deaths': 0, 'wins': 0, 'best_score': 0,
+             'peak_aliens': 0, 'clears': 0, 'decision_max_us': 0.0}
+    start = last_report = time.perf_counter()
+
+    while time.perf_counter() - start < seconds and (games is None or stats['games'] < games):
+        game_seed = int(seeds[stats['games'] % len(seeds)])
+        game = Game(headless=True, seed=game_seed)
+        game.game_mode = mode
+        if endgame:
+            build_endgame(game, random.Random(game_seed))  # 爆炸位置同样由该局种子决定
+        bot = AutoPilot(game)
+        ticks = 0
+        try:
+            while not game.game_over and not game.game_won and (game_ticks is None or ticks < game_ticks):
+                begin = time.perf_counter()
+                keys = bot.decide()
+                decisions.append(time.perf_counter() - begin)
+                game.input_keys.set(keys)
+                game.step()
+                ticks += 1
+                stats['peak_aliens'] = max(stats['peak_aliens'], game.aliens.count)
+                if not ticks % FPS:
+                    now = time.perf_counter()
+                    if now - start >= seconds:
+                        break
+                    if now - last_report >= BOT_SOAK_REPORT:
+                        last_report = now
+                        print(f"[{now - start:6.0f}s] game {stats['games'] + 1} tick {ticks} "
+                              f"score {game.score} aliens {game.aliens.count} "
+                              f"({(stats['ticks'] + ticks) / (now - start):.0f} ticks/s)")
+        except Exception:
+            print(f"Soak test failed in game {stats['games'] + 1} (seed {game_seed}, tick {ticks})")
+            raise
+
+        stats['games'] += 1
+        stats['ticks'] += ticks
+        stats['deaths'] += game.game_over
+        stats['wins'] += game.game_won
+        stats['best_score'] = max(stats['best_score'], game.score)
+        stats['clears'] += bot.clears
+        stats['decision_max_us'] = max(stats['decision_max_us'], max(decisions, default=0) * 1e6)
+
+    elapsed = time.perf_counter() - start
+    samples = np.array(decisions) * 1e6 if decisions else np.zeros(1)
+    stats['elapsed_s'] = elapsed
+    stats['ticks_per_s'] = stats['ticks'] / elapsed if elapsed else 0.0
+    stats['decision_mean_us'] = float(samples.mean())
+    stats['decision_p99_us'] = float(np.percentile(samples, 99))
+    return stats
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Autopilot bot soak test for the single-player game")
+    parser.add_argument("--mode", choices=[CLASSIC_MODE, RANDOM_MODE], default=RANDOM_MODE)
+    parser.add_argument("--minutes", type=float, default=1.0, help="wall-clock duration of the soak test")
+    parser.add_argument("--games", type=int, default=None, help="stop after this many games")
+    parser.add_argument("--game-ticks", type=int, default=None, help="maximum simulated frames per game")
+    parser.add_argument("--seed", type=int, default=None, help="root seed for the game seeds")
+    parser.add_argument("--endgame", action="store_true",
+                        help="start every game from a late-game board full of aliens")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """运行浸泡测试并打印统计"""
+    args = parse_args(argv)
+    stats = soak(args.mode, args.minutes * 60, args.games, args.game_ticks, args.seed, args.endgame)
+    print(f"{stats['games']} games, {stats['ticks']} ticks ({stats['ticks'] / FPS:.0f}s game time) "
+          f"in {stats['elapsed_s']:.1f}s - {stats['ticks_per_s']:.0f} ticks/s")
+    print(f"deaths {stats['deaths']}, wins {stats['wins']}, best score {stats['best_score']}, "
+          f"peak aliens {stats['peak_aliens']}, clear screens {stats['clears']}")
+    print(f"decision time mean {stats['decision_mean_us']:.1f} us, p99 {stats['decision_p99_us']:.1f} us, "
+          f"max {stats['decision_max_us']:.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+"""
+碰撞检测模块
+处理子弹与外星人之间的命中判定
+粗筛使用空间哈希，精筛（AABB相交）与命中结算均以NumPy批量完成
+"""
+
+import numpy as np
+from config import ALIEN_SIZE, BULLET_WIDTH, BULLET_HEIGHT
+
+_EMPTY = np.empty(0, dtype=np.int64)
+
+# 剩余相交对不超过该数量时改为逐对结算，避免为少量冲突反复进行批量运算
+SEQUENTIAL_PAIR_LIMIT = 64
+
+
+def find_overlaps(bullet_xs, bullet_ys, alien_xs, alien_ys, grid):
+    """
+    批量查找相交的子弹-外星人对
+    参数:
+        bullet_xs, bullet_ys: 子弹矩形左上角整数坐标数组
+        alien_xs, alien_ys: 外星人矩形左上角整数坐标数组
+        grid: SpatialHash对象，用于粗筛
+    返回: (子弹索引数组, 外星人索引数组)，按(子弹索引, 外星人索引)升序排列
+    """
+    grid.rebuild(alien_xs, alien_ys)
+    pair_bullets, pair_aliens = grid.candidate_pairs(bullet_xs, bullet_ys)
+    if len(pair_bullets) == 0:
+        return pair_bullets, pair_aliens
+
+    # 精筛：与pygame.Rect.colliderect相同的AABB相交判定
+    bx = bullet_xs[pair_bullets]
+    by = bullet_ys[pair_bullets]
+    ax = alien_xs[pair_aliens]
+    ay = alien_ys[pair_aliens]
+    overlapping = ((bx < ax + ALIEN_SIZE) & (ax < bx + BULLET_WIDTH) &
+                   (by < ay + ALIEN_SIZE) & (ay < by + BULLET_HEIGHT))
+    pair_bullets = pair_bullets[overlapping]
+    pair_aliens = pair_aliens[overlapping]
+
+    # 相交对按(子弹索引, 外星人索引)排序，即逐发结算时的检查顺序
+    order = np.argsort(pair_bullets * len(alien_xs) + pair_aliens)
+    return pair_bullets[order], pair_aliens[order]
+
+
+def resolve_hits(pair_bullets, pair_aliens, damage, health):
+    """
+    按顺序规则结算相交对
+    规则：子弹按索引顺序结算，每发子弹只击中相交对中索引最小的存活外星人，
+    命中后子弹消失，外星人累计受伤，血量<=0时死亡
+    每一轮批量结算所有子弹，直到出现"目标已被更早的子弹击杀"的子弹为止，
+    该子弹及之后的子弹在下一轮改打下一个候选，因此结果与逐发结算完全一致；
+    剩余相交对很少时直接逐对结算
+    参数:
+        pair_bullets, pair_aliens: find_overlaps返回的相交对
+        damage: 每发子弹的伤害数组
+        health: 每个外星人的血量数组（就地扣减）
+    返回: (子弹命中标记数组, 按死亡顺序排列的被击杀外星人索引数组)
+    """
+    bullet_hit = np.zeros(len(damage), dtype=bool)
+    alive = np.ones(len(health), dtype=bool)
+    killed = []
+
+    while len(pair_bullets):
+        # 剔除已死亡外星人的候选，每发子弹取第一个候选
+        live = alive[pair_aliens]
+        pair_bullets = pair_bullets[live]
+        pair_aliens = pair_aliens[live]
+        if len(pair_bullets) <= SEQUENTIAL_PAIR_LIMIT:
+            _resolve_sequential(pair_bullets, pair_aliens, damage, health, alive, bullet_hit, killed)
+            break
+        first = np.empty(len(pair_bullets), dtype=bool)
+        first[0] = True
+        np.not_equal(pair_bullets[1:], pair_bullets[:-1], out=first[1:])
+        shot_bullets = pair_bullets[first]
+        shot_aliens = pair_aliens[first]
+
+        # 按外星人分组（组内按子弹顺序），计算组内累计伤害
+        order = np.lexsort((shot_bullets, shot_aliens))
+        group_aliens = shot_aliens[order]
+        group_bullets = shot_bullets[order]
+        group_damage = damage[group_bullets]
+        group_start = np.empty(len(order), dtype=bool)
+        group_start[0] = True
+        np.not_equal(group_aliens[1:], group_aliens[:-1], out=group_start[1:])
+        running = np.cumsum(group_damage)
+        group_base = (running - group_damage)[group_start]
+        taken = running - group_base[np.cumsum(group_start) - 1]
+        alien_health = health[group_aliens]
+
+        # 目标在本发子弹之前已死亡：子弹需改打下一个候选
+        retarget = alien_health - (taken - group_damage) <= 0
+        if retarget.any():
+            cutoff = group_bullets[retarget].min()
+        else:
+            cutoff = len(damage)
+
+        # 结算cutoff之前的子弹（它们的结果不受后续子弹影响）
+        settled = group_bullets < cutoff
+        bullet_hit[group_bullets[settled]] = True
+        np.subtract.at(health, group_aliens[settled], group_damage[settled])
+        deaths = settled & (alien_health - taken <= 0)
+        if deaths.any():
+            death_order = np.argsort(group_bullets[deaths], kind='stable')
+            victims = group_aliens[deaths][death_order]
+            alive[victims] = False
+            killed.append(victims)
+
+        if cutoff == len(damage):
+            break
+        remaining = pair_bullets >= cutoff
+        pair_bullets = pair_bullets[remaining]
+        pair_aliens = pair_aliens[remaining]
+
+    killed = np.concatenate(killed) if killed else _EMPTY
+    return bullet_hit, killed
+
+
+def _resolve_sequential(pair_bullets, pair_aliens, damage, health, alive, bullet_hit, killed):
+    """
+    逐对结算剩余的相交对（resolve_hits的收尾步骤）
+    参数与resolve_hits的内部状态相同，结果就地写入health、alive、bullet_hit和killed
+    """
+    victims = []
+    for bullet, alien in zip(pair_bullets.tolist(), pair_aliens.tolist()):
+        if bullet_hit[bullet] or not alive[alien]:
+            continue
+        bullet_hit[bullet] = True
+        health[alien] -= damage[bullet]
+        if health[alien] <= 0:
+            alive[alien] = False
+            victims.append(alien)
+    if victims:
+        killed.append(np.array(victims, dtype=np.int64))
+
+
+def resolve_store_hits(bullets, aliens, grid):
+    """
+    结算子弹击中外星人（实体存储版本）
+    直接扣减存储中的血量，并压缩掉被消耗的子弹和死亡的外星人；子弹只能击中同一区域（arena列相同）的外星人
+    结算后grid与压缩后的外星人存储一致（没有子弹时同样重建），本帧其余逻辑可直接查询
+    参数:
+        bullets: BulletStore对象
+        aliens: AlienStore对象
+        grid: SpatialHash对象，用于粗筛候选外星人
+    返回: 被击杀外星人的(x数组, y数组, 区域编号数组)，按死亡顺序排列
+    """
+    if not aliens:
+        grid.clear()
+        return np.empty(0), np.empty(0), _EMPTY
+
+    bullet_xs, bullet_ys = bullets.rect_arrays()
+    alien_xs, alien_ys = aliens.rect_arrays()
+    pair_bullets, pair_aliens = find_overlaps(bullet_xs, bullet_ys, alien_xs, alien_ys, grid)
+    same_arena = bullets.arena[pair_bullets] == aliens.arena[pair_aliens]
+    if not same_arena.all():
+        pair_bullets = pair_bullets[same_arena]
+        pair_aliens = pair_aliens[same_arena]
+    if len(pair_bullets) == 0:
+        return np.empty(0), np.empty(0), _EMPTY
+
+    health = aliens.health[:aliens.count]
+    bullet_hit, killed = resolve_hits(pair_bullets, pair_aliens, bullets.damage[:bullets.count], health)
+
+    killed_x = aliens.x[killed]
+    killed_y = aliens.y[killed]
+    killed_arena = aliens.arena[killed]
+    alive = np.ones(aliens.count, dtype=bool)
+    alive[killed] = False
+    bullets.compact(~bullet_hit)
+    aliens.compact(alive)
+    grid.discard(alive)
+    return killed_x, killed_y, killed_arena
@@ -7,6 +7,13 @@
 SCREEN_WIDTH = 600          # 屏幕宽度（像素）
 SCREEN_HEIGHT = 750         # 屏幕高度（像素）
 FPS = 60                    # 游戏帧率
+HEADLESS_DEFAULT_TICKS = FPS * 60 * 10  # 无头模式默认模拟帧数（10分钟游戏时间）
+
+# ==================== 模拟时钟配置 ====================
+SIM_TICK_RATE = FPS         # 游戏逻辑频率（固定步长，帧/秒）
+RENDER_FPS = FPS            # 渲染帧率上限（0表示不限制）
+MAX_FRAME_TIME = 250        # 单个渲染帧最多计入的真实时间（毫秒），避免卡顿后逻辑帧雪崩
+SIM_TIME_SCALE = 1.0        # 模拟速度倍数（1.0为实时）
 
 # ==================== 双人对战屏幕配置 ====================
 VERSUS_SCREEN_WIDTH = 1000  # 双人对战屏幕宽度
@@ -42,7 +49,6 @@ BACKGROUND_RECT_WIDTH = 20   # 背景矩形宽度
 BACKGROUND_RECT_HEIGHT = 60  # 背景矩形高度
 BACKGROUND_SPEED = 2         # 背景矩形移动速度（像素/帧）
 BACKGROUND_SPACING = 100     # 背景矩形间距
-MAX_BACKGROUND_RECTS = 50    # 最大背景矩形数量
 
 # ==================== 外星人AI配置 ====================
 ALIEN_DIRECTION_CHANGE_MIN = 60   # 外星人方向改变最小间隔（帧）
@@ -81,6 +87,7 @@ UPGRADE_WINDOW_HEIGHT = 300 # 升级窗口高度
 CLASSIC_MODE = "classic"
 RANDOM_MODE = "random"
 VERSUS_MODE = "versus"
+TOURNAMENT_MODE = "tournament"
 WIN_SCORE = 100                 # 经典模式胜利分数
 VERSUS_WIN_SCORE = 500          # 双人对战胜利分数
 POINTS_PER_KILL = 5             # 每击杀一个外星人获得的分数
@@ -109,6 +116,59 @@ WINGMAN_SPEED = 1                # Wingman movement speed (pixels per frame)
 WINGMAN_Y_OFFSET = 5             # Wingman Y position offset from bottom
 WINGMAN_BULLET_COLOR = (255, 20, 147)  # Pink color for wingman bullets
 
+# ==================== Entity Store ====================
+ENTITY_STORE_CAPACITY = 256      # Initial rows per entity store (doubles when full)
+BULLET_PALETTE = BULLET_COLORS + [WINGMAN_BULLET_COLOR]  # Bullet colors indexed by the store
+WINGMAN_BULLET_COLOR_INDEX = len(BULLET_COLORS)  # Palette index of the pink wingman bullet
+
+# ==================== Text Cache ====================
+TEXT_CACHE_SIZE = 64             # Max rendered HUD strings kept (least recently used evicted)
+
+# ==================== Dirty Rect Rendering ====================
+DIRTY_RECT_LIMIT = 1500          # Max rects per display.update before falling back to a full flip
+DIRTY_RECT_ERASE_LIMIT = 200     # Max rects erased one by one; above this the whole screen is filled once
+
+# ==================== Menu Idle ====================
+MENU_IDLE_TIMEOUT = 250          # Max ms a menu blocks in pygame.event.wait before checking again
+
+# ==================== Frame Profiler ====================
+PROFILER_HISTORY = 240           # Frames kept in the rolling frame-time history (graph width in pixels)
+PROFILER_HISTOGRAM_EDGES = (0, 4, 8, 12, 16.7, 25, 33.3, 50)  # Frame-time histogram bucket edges (ms)
+PROFILER_OVERLAY_REFRESH = 15    # Frames between overlay redraws
+PROFILER_GRAPH_HEIGHT = 60       # Overlay graph height in pixels
+PROFILER_GRAPH_SCALE_MS = 33.3   # Frame time shown at the top of the overlay graph
+
+# ==================== Learning Environment ====================
+ENV_OBS_ALIENS = 32              # Nearest aliens included in the entity-state observation
+ENV_FRAME_SCALE = 8              # Downscale factor of the rasterized frame observation
+ENV_FRAME_SKIP = 1               # Game ticks simulated per environment step (action repeated)
+ENV_MAX_STEPS = FPS * 60 * 5     # Steps before an episode is truncated (5 minutes of game time)
+ENV_DEATH_PENALTY = 100          # Reward subtracted when the player is hit
+
+# ==================== Autopilot Bot ====================
+BOT_DODGE_LOOKAHEAD = PLAYER_SIZE      # Height above the player scanned for aliens to dodge (pixels)
+BOT_DODGE_MARGIN = PLAYER_SIZE // 2    # Extra horizontal clearance kept from those aliens (pixels)
+BOT_CLEAR_MIN_ALIENS = 8               # Aliens on screen before the bot spends a ready clear screen
+BOT_SOAK_REPORT = 10                   # Seconds between soak test progress lines
+
+# ==================== Snapshots ====================
+SNAPSHOT_COMPRESS_LEVEL = 1            # zlib level for snapshot payloads (1 = fastest)
+SNAPSHOT_QUICKSAVE_PATH = "quicksave.snap"  # File written by F5 during windowed play
+
+# ==================== Rewind Buffer ====================
+REWIND_SECONDS = 10                    # Seconds of played ticks kept for rewind after a game over
+REWIND_KEYFRAME_INTERVAL = 60          # Ticks between full frames; the ticks in between are stored as deltas
+REWIND_COMPRESS_LEVEL = 1              # zlib level for rewind frames (1 = fastest)
+
+# ==================== Tournament ====================
+TOURNAMENT_MIN_PLAYERS = 4             # Fewest arenas in a tournament
+TOURNAMENT_MAX_PLAYERS = 8             # Most arenas in a tournament
+TOURNAMENT_MAX_COLUMNS = 4             # Arenas per grid row; more players add a second row
+TOURNAMENT_SCREEN_WIDTH = 1200         # Window size, split evenly between the arenas
+TOURNAMENT_SCREEN_HEIGHT = 750
+TOURNAMENT_WIN_SCORE = 1000            # First arena to reach this score wins outright
+TOURNAMENT_JOYSTICK_DEADZONE = 0.5     # Stick deflection below this is ignored
+
 # ==================== Milestone System ====================
 MILESTONE_SCORE_INTERVAL = 1000  # Every 1000 points
 MILESTONE_ALIEN_INCREASE = 0.6   # 60% alien count increase at milestones
@@ -131,6 +191,8 @@ GAME_TITLE = "Alien Shooter"
 SCORE_TEXT = "Score: {}"
 GAME_OVER_TEXT = "Game Over! Press R to restart"
 VICTORY_TEXT = "Victory! Press R to restart"
+REWIND_TEXT = "Rewind {} / {} - LEFT/RIGHT step, UP/DOWN 1s, ESC back"
+TOURNAMENT_OUT_TEXT = "OUT #{}"
 
 # ==================== Menu Text ====================
 MENU_TITLE = "Welcome to Alien Shooter!"
@@ -0,0 +1,99 @@
+"""
+脏矩形渲染模块
+只重绘并提交上一帧和本帧实际绘制过的区域，代替每帧整屏填充与pygame.display.flip()
+"""
+
+import pygame
+from config import WHITE, DIRTY_RECT_LIMIT, DIRTY_RECT_ERASE_LIMIT
+
+
+class DirtyRectRenderer:
+    """
+    脏矩形渲染器
+    每帧开始时用背景色擦除上一帧登记的矩形，此时屏幕恢复为纯背景色（加上未登记的静态元素），
+    随后照常绘制所有元素并登记其矩形，最后只把上一帧和本帧的矩形提交到显示器
+    未登记的元素（如对战模式的分割线）只在整屏填充时被擦除，必须在begin_frame之后每帧重新绘制，
+    只适合每帧位置不变的静态内容
+    """
+
+    def __init__(self, screen, background=WHITE, max_rects=DIRTY_RECT_LIMIT, erase_limit=DIRTY_RECT_ERASE_LIMIT):
+        """
+        初始化脏矩形渲染器
+        参数:
+            screen: pygame屏幕对象
+            background: 背景颜色
+            max_rects: 单帧提交的矩形数量上限，超出时改为整屏刷新
+            erase_limit: 逐个擦除的矩形数量上限，超出时改为一次整屏填充（仍只提交脏矩形）
+        """
+        self.screen = screen
+        self.background = background
+        self.max_rects = max_rects
+        self.erase_limit = erase_limit
+        self.previous = []          # 上一帧登记的矩形
+        self.current = []           # 本帧登记的矩形
+        self.full_redraw = True     # 下一帧是否整屏重绘
+
+    def invalidate(self):
+        """
+        要求下一帧整屏重绘
+        屏幕内容被渲染器之外的代码覆盖后调用（如升级窗口、菜单）
+        """
+        self.full_redraw = True
+
+    def begin_frame(self):
+        """开始新一帧：擦除上一帧绘制的区域（整屏重绘时填充整个屏幕）"""
+        if self.full_redraw or len(self.previous) > self.max_rects:
+            # 上一帧矩形过多时逐个擦除反而更慢，直接整屏重绘
+            self.full_redraw = True
+            self.screen.fill(self.background)
+        elif len(self.previous) > self.erase_limit:
+            # 每次fill调用有固定开销，矩形多时一次整屏填充更快；未变化的像素填充前后相同，无需提交
+            self.screen.fill(self.background)
+        else:
+            fill = self.screen.fill
+            background = self.background
+            for rect in self.previous:
+                fill(background, rect)
+        self.current = []
+
+    def add(self, rect):
+        """
+        登记本帧绘制的一个矩形
+        参数:
+            rect: pygame.Rect（如blit或pygame.draw的返回值）
+        """
+        self.current.append(rect)
+
+    def add_all(self, rects):
+        """
+        登记本帧绘制的多个矩形
+        参数:
+            rects: pygame.Rect序列（如Surface.blits的返回值）
+        """
+        self.current.extend(rects)
+
+    def blit(self, surface, dest):
+        """
+        绘制Surface并登记其矩形
+        参数:
+            surface: 要绘制的Surface
+            dest: 左上角坐标或pygame.Rect
+        返回: 实际绘制的pygame.Rect
+        """
+        rect = self.screen.blit(surface, dest)
+        self.current.append(rect)
+        return rect
+
+    def present(self):
+        """
+        提交本帧画面
+        只更新上一帧与本帧登记的矩形，矩形过多或需要整屏重绘时改为flip
+        """
+        dirty = self.previous + self.current
+        if self.full_redraw or len(dirty) > self.max_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty)
+        self.previous = self.current
+        self.current = []
+        self.full_redraw = False
@@ -0,0 +1,312 @@
+"""
+实体存储模块
+以列式NumPy数组（结构数组）批量存储外星人和子弹，按帧整体进行向量化更新
+"""
+
+import numpy as np
+from config import *
+from entities import interpolate
+from sprite_cache import RECT, HEALTH_BAR_OFFSET, get_sprite, health_bar_sprite
+
+
+class EntityStore:
+    """
+    列式实体存储基类
+    每个字段是一段连续的NumPy数组，前count行为存活实体，
+    容量不足时倍增扩容，删除时按掩码整体压缩并保持原有顺序
+    """
+    FIELDS = ()  # 子类定义的字段列表：(字段名, dtype)
+
+    def __init__(self, capacity=ENTITY_STORE_CAPACITY):
+        """
+        初始化实体存储
+        参数:
+            capacity: 初始容量（行数）
+        """
+        self.count = 0              # 存活实体数量
+        self.capacity = capacity    # 已分配的行数
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        """返回存活实体数量"""
+        return self.count
+
+    def __bool__(self):
+        """存在存活实体时为True"""
+        return self.count > 0
+
+    def _allocate(self, rows):
+        """
+        在末尾分配新行
+        参数:
+            rows: 需要的行数
+        返回: 新行的起始索引
+        """
+        start = self.count
+        needed = start + rows
+        if needed > self.capacity:
+            new_capacity = max(self.capacity * 2, needed)
+            for name, dtype in self.FIELDS:
+                grown = np.zeros(new_capacity, dtype=dtype)
+                grown[:start] = getattr(self, name)[:start]
+                setattr(self, name, grown)
+            self.capacity = new_capacity
+        self.count = needed
+        return start
+
+    def compact(self, keep):
+        """
+        按掩码保留实体（保持原有顺序）
+        参数:
+            keep: 长度为count的布尔数组，True表示保留
+        返回: 被移除的实体数量
+        """
+        n = self.count
+        kept = int(np.count_nonzero(keep))
+        if kept == n:
+            return 0
+        for name, _ in self.FIELDS:
+            column = getattr(self, name)
+            column[:kept] = column[:n][keep]
+        self.count = kept
+        return n - kept
+
+    def clear(self):
+        """移除所有实体（保留已分配的容量）"""
+        self.count = 0
+
+    def resize(self, count):
+        """
+        设置实体数量，超出原有数量的行内容未定义，由调用者填写
+        参数:
+            count: 新的实体数量
+        """
+        self.count = 0
+        self._allocate(count)
+
+    def tobytes(self):
+        """
+        导出存活实体的全部字段
+        返回: 按FIELDS顺序拼接的各字段前count行的原始字节（本机字节序）
+        """
+        n = self.count
+        return b''.join(getattr(self, name)[:n].tobytes() for name, _ in self.FIELDS)
+
+    def frombytes(self, count, data, offset=0):
+        """
+        用tobytes导出的字节替换全部实体
+        参数:
+            count: 实体数量
+            data: 字节缓冲区
+            offset: 数据在缓冲区中的起始位置
+        返回: 数据结束位置（下一段数据的起始位置）
+        """
+        self.resize(count)
+        for name, dtype in self.FIELDS:
+            getattr(self, name)[:count] = np.frombuffer(data, dtype, count, offset)
+            offset += count * np.dtype(dtype).itemsize
+        return offset
+
+
+class AlienStore(EntityStore):
+    """
+    外星人存储
+    批量处理外星人的移动、左右随机转向、越界剔除与受伤
+    """
+    FIELDS = (
+        ('x', np.float64),                  # x坐标
+        ('y', np.float64),                  # y坐标
+        ('prev_x', np.float64),             # 上一逻辑帧x坐标（用于插值渲染）
+        ('prev_y', np.float64),             # 上一逻辑帧y坐标（用于插值渲染）
+        ('speed', np.float64),              # 向下移动速度
+        ('horizontal_speed', np.float64),   # 左右移动速度
+        ('horizontal_direction', np.int8),  # 左右移动方向（-1左，1右）
+        ('direction_change_timer', np.int32),     # 方向改变计时器
+        ('direction_change_interval', np.int32),  # 方向改变间隔
+        ('health', np.int64),               # 当前血量
+        ('max_health', np.int64),           # 最大血量
+        ('arena', np.int16),                # 所属区域编号（见arena.py）
+    )
+
+    def __init__(self, capacity=ENTITY_STORE_CAPACITY, rng=None):
+        """
+        初始化外星人存储
+        参数:
+            capacity: 初始容量
+            rng: numpy.random.Generator，用于随机方向，默认新建
+        """
+        super().__init__(capacity)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def spawn(self, xs, y, health_multiplier=1.0, arena=0):
+        """
+        批量生成外星人
+        参数:
+            xs: x坐标序列
+            y: 初始y坐标
+            health_multiplier: 血量倍数
+            arena: 所属区域编号
+        """
+        rows = len(xs)
+        if rows == 0:
+            return
+        start = self._allocate(rows)
+        new = slice(start, start + rows)
+        base_health = int(ALIEN_HEALTH * health_multiplier)  # 应用血量倍数
+
+        self.x[new] = xs
+        self.y[new] = y
+        self.prev_x[new] = xs
+        self.prev_y[new] = y
+        self.speed[new] = ALIEN_SPEED
+        self.horizontal_speed[new] = ALIEN_HORIZONTAL_SPEED
+        self.horizontal_direction[new] = self.rng.choice((-1, 1), rows)  # 随机选择左或右
+        self.direction_change_timer[new] = 0
+        self.direction_change_interval[new] = self.rng.integers(
+            ALIEN_DIRECTION_CHANGE_MIN, ALIEN_DIRECTION_CHANGE_MAX, rows, endpoint=True)
+        self.health[new] = base_health
+        self.max_health[new] = base_health
+        self.arena[new] = arena
+
+    def move(self, left_bound=0, right_bound=SCREEN_WIDTH, clamp=False):
+        """
+        移动所有外星人（向下移动 + 左右随机移动）
+        参数:
+            left_bound: 左边界（标量，或每个外星人一个值的数组）
+            right_bound: 右边界（同上）
+            clamp: 碰到边界时是否把外星人拉回边界内
+        """
+        n = self.count
+        if n == 0:
+            return
+        x = self.x[:n]
+        y = self.y[:n]
+        direction = self.horizontal_direction[:n]
+        self.prev_x[:n] = x
+        self.prev_y[:n] = y
+
+        # 向下移动 + 左右移动
+        y += self.speed[:n]
+        x += direction * self.horizontal_speed[:n]
+
+        # 边界检查：碰到边缘的外星人反向移动
+        bounced = (x <= left_bound) | (x >= right_bound - ALIEN_SIZE)
+        direction[bounced] *= -1
+        if clamp:
+            np.clip(x, left_bound, right_bound - ALIEN_SIZE, out=x)
+
+        # 随机改变移动方向
+        timer = self.direction_change_timer[:n]
+        timer += 1
+        changed = timer >= self.direction_change_interval[:n]
+        changes = int(np.count_nonzero(changed))
+        if changes:
+            direction[changed] = self.rng.choice((-1, 1), changes)
+            timer[changed] = 0
+            self.direction_change_interval[:n][changed] = self.rng.integers(
+                ALIEN_DIRECTION_CHANGE_MIN, ALIEN_DIRECTION_CHANGE_MAX, changes, endpoint=True)
+
+    def rect_arrays(self):
+        """
+        获取碰撞矩形坐标（与pygame.Rect一致，坐标向零取整）
+        返回: (x整数数组, y整数数组)
+        """
+        n = self.count
+        return (np.trunc(self.x[:n]).astype(np.int64),
+                np.trunc(self.y[:n]).astype(np.int64))
+
+    def draw(self, screen, alpha=1.0, rows=None):
+        """
+        绘制外星人和血量条
+        参数:
+            screen: pygame屏幕对象
+            alpha: 逻辑帧间插值系数
+            rows: 只绘制这些行（索引数组），None表示全部
+        返回: 绘制区域的pygame.Rect列表
+        """
+        select = slice(0, self.count) if rows is None else rows
+        x = self.x[select]
+        if len(x) == 0:
+            return []
+        xs = interpolate(self.prev_x[select], x, alpha).astype(np.int64).tolist()
+        ys = interpolate(self.prev_y[select], self.y[select], alpha).astype(np.int64).tolist()
+        bars = (ALIEN_SIZE * self.health[select] / self.max_health[select]).astype(np.int64).tolist()
+
+        # 外星人主体（红色矩形）与血量条（绿色，位于外星人上方），各一次批量blit
+        body = get_sprite(RECT, RED, (ALIEN_SIZE, ALIEN_SIZE))
+        rects = screen.blits([(body, (x, y)) for x, y in zip(xs, ys)])
+        bar_sprites = [health_bar_sprite(width) for width in range(ALIEN_SIZE + 1)]
+        rects += screen.blits([(bar_sprites[bar], (x, y - HEALTH_BAR_OFFSET))
+                               for x, y, bar in zip(xs, ys, bars) if bar > 0])
+        return rects
+
+
+class BulletStore(EntityStore):
+    """
+    子弹存储
+    批量处理子弹的移动与越界剔除
+    """
+    FIELDS = (
+        ('x', np.float64),      # x坐标
+        ('y', np.float64),      # y坐标
+        ('prev_y', np.float64), # 上一逻辑帧y坐标（子弹只纵向移动）
+        ('speed', np.float64),  # 向上移动速度
+        ('damage', np.int64),   # 伤害
+        ('color', np.uint8),    # 颜色在BULLET_PALETTE中的索引
+        ('arena', np.int16),    # 所属区域编号（见arena.py）
+    )
+
+    def spawn(self, x, y, speed, damage, color, arena=0):
+        """
+        生成一发子弹
+        参数:
+            x: 初始x坐标
+            y: 初始y坐标
+            speed: 向上移动速度
+            damage: 伤害
+            color: 颜色在BULLET_PALETTE中的索引
+            arena: 所属区域编号
+        """
+        index = self._allocate(1)
+        self.x[index] = x
+        self.y[index] = y
+        self.prev_y[index] = y
+        self.speed[index] = speed
+        self.damage[index] = damage
+        self.color[index] = color
+        self.arena[index] = arena
+
+    def move(self):
+        """移动所有子弹（向上移动）"""
+        n = self.count
+        self.prev_y[:n] = self.y[:n]
+        self.y[:n] -= self.speed[:n]
+
+    def rect_arrays(self):
+        """
+        获取碰撞矩形坐标（与pygame.Rect一致，坐标向零取整）
+        返回: (x整数数组, y整数数组)
+        """
+        n = self.count
+        return (np.trunc(self.x[:n]).astype(np.int64),
+                np.trunc(self.y[:n]).astype(np.int64))
+
+    def draw(self, screen, alpha=1.0, rows=None):
+        """
+        绘制子弹
+        参数:
+            screen: pygame屏幕对象
+            alpha: 逻辑帧间插值系数
+            rows: 只绘制这些行（索引数组），None表示全部
+        返回: 绘制区域的pygame.Rect列表
+        """
+        select = slice(0, self.count) if rows is None else rows
+        x = self.x[select]
+        if len(x) == 0:
+            return []
+        xs = x.astype(np.int64).tolist()
+        ys = interpolate(self.prev_y[select], self.y[select], alpha).astype(np.int64).tolist()
+        sprites = [get_sprite(RECT, color, (BULLET_WIDTH, BULLET_HEIGHT)) for color in BULLET_PALETTE]
+        return screen.blits([(sprites[color], (x, y))
+                             for x, y, color in zip(xs, ys, self.color[select].tolist())])
@@ -0,0 +1,214 @@
+"""
+强化学习环境模块
+以Gym风格的接口（reset/step）包装无头模式的Game，供训练机器人使用，
+不打开窗口、不绘制，观测直接由实体存储的数组生成
+"""
+
+import numpy as np
+import pygame
+from config import *
+from game import Game
+
+# 动作表：动作编号 -> 按下的按键
+ACTIONS = (
+    (),                                 # 0 不动
+    (pygame.K_LEFT,),                   # 1 左
+    (pygame.K_RIGHT,),                  # 2 右
+    (pygame.K_UP,),                     # 3 上
+    (pygame.K_DOWN,),                   # 4 下
+    (pygame.K_UP, pygame.K_LEFT),       # 5 左上
+    (pygame.K_UP, pygame.K_RIGHT),      # 6 右上
+    (pygame.K_DOWN, pygame.K_LEFT),     # 7 左下
+    (pygame.K_DOWN, pygame.K_RIGHT),    # 8 右下
+    (pygame.K_SPACE,),                  # 9 清屏
+)
+# 升级选择动作：待选升级时使用，ACTION_UPGRADE_1 + i 选择第i+1个选项
+ACTION_UPGRADE_1 = len(ACTIONS)
+ACTION_COUNT = ACTION_UPGRADE_1 + 3
+
+OBS_PLAYER_FEATURES = 4     # 玩家x、y、清屏是否就绪、是否待选升级
+OBS_ALIEN_FEATURES = 5      # 相对x、相对y、剩余血量比例、左右方向、是否存在
+
+OBS_ENTITIES = 'entities'   # 实体状态向量观测
+OBS_FRAME = 'frame'         # 降采样栅格画面观测
+
+
+class AlienShooterEnv:
+    """
+    射击外星人学习环境
+    reset(seed)返回观测；step(action)返回(观测, 奖励, 是否结束, 信息)
+    奖励为本步得分，玩家被撞时减去ENV_DEATH_PENALTY；超过max_steps步时截断（info['truncated']为True）
+
+    观测:
+        'entities': float32向量，玩家特征后接距离玩家最近的ENV_OBS_ALIENS个外星人特征（不足补零）
+        'frame': uint8数组(高, 宽, 3)，按ENV_FRAME_SCALE降采样的栅格画面，通道依次为玩家、外星人、子弹
+    """
+
+    def __init__(self, mode=RANDOM_MODE, observation=OBS_ENTITIES, frame_skip=ENV_FRAME_SKIP,
+                 max_steps=ENV_MAX_STEPS):
+        """
+        初始化环境
+        参数:
+            mode: 游戏模式（默认随机模式）
+            observation: 观测类型（OBS_ENTITIES或OBS_FRAME）
+            frame_skip: 每步模拟的逻辑帧数（动作在这些帧中保持不变；出现升级选项或对局结束时提前结束本步）
+            max_steps: 每局最多步数
+        """
+        if observation not in (OBS_ENTITIES, OBS_FRAME):
+            raise ValueError(f"Unknown observation type: {observation}")
+        self.mode = mode
+        self.observation = observation
+        self.frame_skip = frame_skip
+        self.max_steps = max_steps
+        self.action_count = ACTION_COUNT
+        if observation == OBS_ENTITIES:
+            self.observation_shape = (OBS_PLAYER_FEATURES + ENV_OBS_ALIENS * OBS_ALIEN_FEATURES,)
+        else:
+            self.observation_shape = (-(-SCREEN_HEIGHT // ENV_FRAME_SCALE),
+                                      -(-SCREEN_WIDTH // ENV_FRAME_SCALE), 3)
+
+        self.game = None
+        self.steps = 0
+        self._choice = 1  # 本步的升级选择，由升级策略交给游戏
+
+    def reset(self, seed=None):
+        """
+        开始新的一局
+        参数:
+            seed: 随机数种子，默认随机生成（实际种子见info['seed']）
+        返回: 初始观测
+        """
+        self.game = Game(headless=True, seed=seed)
+        self.game.game_mode = self.mode
+        self.game.upgrade_policy = lambda score, upgrades: self._choice
+        self.steps = 0
+        return self._observe()
+
+    def step(self, action):
+        """
+        执行一个动作
+        参数:
+            action: 动作编号（0 <= action < action_count）
+        返回: (观测, 奖励, 是否结束, 信息字典)
+        """
+        game = self.game
+        if game.show_upgrade_menu:
+            # 待选升级时，升级动作选择对应选项，其他动作选择第一个选项
+            upgrade = action - ACTION_UPGRADE_1
+            self._choice = upgrade + 1 if 0 <= upgrade < 3 else 1
+            keys = ()
+        else:
+            keys = ACTIONS[action] if action < ACTION_UPGRADE_1 else ()
+        game.input_keys.set(keys)
+
+        score = game.score
+        for _ in range(self.frame_skip):
+            game.step()
+            # 出现新的升级选项时提前返回，由智能体的下一个动作选择，而不是沿用上一次的选择
+            if game.game_over or game.game_won or game.show_upgrade_menu:
+                break
+        self.steps += 1
+
+        reward = float(game.score - score)
+        if game.game_over:
+            reward -= ENV_DEATH_PENALTY
+        truncated = self.steps >= self.max_steps
+        done = game.game_over or game.game_won or truncated
+        return self._observe(), reward, done, self._info(truncated)
+
+    def _info(self, truncated=False):
+        """
+        附加信息
+        参数:
+            truncated: 是否因步数上限而结束
+        返回: 信息字典
+        """
+        game = self.game
+        return {
+            'score': game.score,
+            'ticks': game.sim_clock.ticks,
+            'seed': game.rng.seed,
+            'truncated': truncated,
+            'upgrade_pending': game.show_upgrade_menu,
+            'upgrade_options': list(game.available_upgrades),
+        }
+
+    def _observe(self):
+        """
+        生成当前观测
+        待选升级时先抽取升级选项，使其出现在info中
+        返回: NumPy数组
+        """
+        game = self.game
+        if game.show_upgrade_menu and not game.available_upgrades:
+            game.generate_random_upgrades()
+        if self.observation == OBS_FRAME:
+            return self._frame()
+        return self._entity_state()
+
+    def _entity_state(self):
+        """
+        实体状态向量：坐标按屏幕尺寸归一化，外星人按与玩家的距离由近到远排列
+        返回: float32数组
+        """
+        game = self.game
+        player = game.player
+        obs = np.zeros(self.observation_shape, dtype=np.float32)
+        clear_ready = (player.has_clear_screen and
+                       game.get_time() - game.last_clear_screen_time >= player.clear_screen_cooldown)
+        obs[:OBS_PLAYER_FEATURES] = (player.x / SCREEN_WIDTH, player.y / SCREEN_HEIGHT,
+                                     clear_ready, game.show_upgrade_menu)
+
+        aliens = game.aliens
+        count = aliens.count
+        if count:
+            # 外星人中心相对玩家中心的位置
+            dx = (aliens.x[:count] + ALIEN_SIZE / 2 - player.x - player.width / 2) / SCREEN_WIDTH
+            dy = (aliens.y[:count] + ALIEN_SIZE / 2 - player.y - player.height / 2) / SCREEN_HEIGHT
+            distance = dx * dx + dy * dy
+            if count > ENV_OBS_ALIENS:
+                nearest = np.argpartition(distance, ENV_OBS_ALIENS)[:ENV_OBS_ALIENS]
+                nearest = nearest[np.argsort(distance[nearest])]
+            else:
+                nearest = np.argsort(distance)
+            features = obs[OBS_PLAYER_FEATURES:].reshape(ENV_OBS_ALIENS, OBS_ALIEN_FEATURES)
+            n = len(nearest)
+            features[:n, 0] = dx[nearest]
+            features[:n, 1] = dy[nearest]
+            features[:n, 2] = aliens.health[nearest] / aliens.max_health[nearest]
+            features[:n, 3] = aliens.horizontal_direction[nearest]
+            features[:n, 4] = 1.0
+        return obs
+
+    def _frame(self):
+        """
+        降采样栅格画面：每个实体覆盖的格子在对应通道中置为255
+        返回: uint8数组(高, 宽, 3)
+        """
+        game = self.game
+        frame = np.zeros(self.observation_shape, dtype=np.uint8)
+        player = game.player
+        self._rasterize(frame, 0, [player.x], [player.y], player.width, player.height)
+        xs, ys = game.aliens.rect_arrays()
+        self._rasterize(frame, 1, xs, ys, ALIEN_SIZE, ALIEN_SIZE)
+        xs, ys = game.bullets.rect_arrays()
+        self._rasterize(frame, 2, xs, ys, BULLET_WIDTH, BULLET_HEIGHT)
+        return frame
+
+    @staticmethod
+    def _rasterize(frame, channel, xs, ys, width, height):
+        """
+        把一组矩形绘制到栅格画面的一个通道
+        参数:
+            frame: 栅格画面
+            channel: 通道
+            xs/ys: 矩形左上角坐标序列
+            width/height: 矩形尺寸
+        """
+        rows, cols = frame.shape[:2]
+        x0 = np.clip(np.floor_divide(xs, ENV_FRAME_SCALE).astype(np.int64), 0, cols)
+        y0 = np.clip(np.floor_divide(ys, ENV_FRAME_SCALE).astype(np.int64), 0, rows)
+        x1 = np.clip(-np.floor_divide(-(np.asarray(xs) + width), ENV_FRAME_SCALE).astype(np.int64), 0, cols)
+        y1 = np.clip(-np.floor_divide(-(np.asarray(ys) + height), ENV_FRAME_SCALE).astype(np.int64), 0, rows)
+        for left, top, right, bottom in zip(x0.tolist(), y0.tolist(), x1.tolist(), y1.tolist()):
+            frame[top:bottom, left:right, channel] = 255
@@ -4,33 +4,83 @@
 """
 
 import pygame
-import random
 import sys
 from config import *
-from entities import Player, Alien, Bullet, Explosion, Wingman
+from entities import Wingman
+from arena import ArenaEngine, arena_field, key_direction
 from background import BackgroundManager
 from menu import MenuManager
 from upgrade_window import UpgradeWindow
+from text_cache import TextCache
+from dirty_rect import DirtyRectRenderer
+from simulation import KeyState, SimulationClock
+from rng import RandomStreams
+from profiler import FrameProfiler
+from rewind import RewindBuffer
+
+
+# 回放查看按键 -> 移动的帧数（ESC结束查看）
+REWIND_KEYS = {
+    pygame.K_LEFT: -1,
+    pygame.K_RIGHT: 1,
+    pygame.K_UP: -FPS,
+    pygame.K_DOWN: FPS,
+    pygame.K_ESCAPE: 0,
+}
 
 
 class Game:
     """
     游戏主类
     负责管理整个游戏的运行，包括初始化、输入处理、游戏逻辑更新、绘制等
+    外星人、子弹和爆炸的模拟由只有一个区域的ArenaEngine完成，分数与计时器即该区域的属性
     """
+
+    # 转发到区域0的属性
+    player = arena_field('player')
+    score = arena_field('score')
+    last_alien_spawn_time = arena_field('last_alien_spawn_time')
+    last_bullet_time = arena_field('last_bullet_time')
+    bullet_color_index = arena_field('bullet_color_index')
     
-    def __init__(self):
+    def __init__(self, headless=False, sim_clock=None, seed=None):
         """
         初始化游戏
         设置屏幕、创建游戏对象、初始化游戏状态
-        """
-        # 初始化pygame
-        pygame.init()
-        
-        # 创建游戏窗口
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(GAME_TITLE)
-        self.clock = pygame.time.Clock()  # 用于控制游戏帧率
+        参数:
+            headless: 是否以无头模式运行（不创建窗口、不绘制、不限帧率）
+            sim_clock: 注入的模拟时钟，默认新建SimulationClock
+            seed: 随机数种子，默认随机生成；相同种子和输入下游戏过程完全一致
+        """
+        self.headless = headless
+        self.sim_clock = sim_clock if sim_clock is not None else SimulationClock()  # 逻辑时间
+        self.rng = RandomStreams(seed)  # 各子系统的随机数流
+        self.recorder = None            # 输入录制器（replay.InputRecorder），None表示不录制
+        self.record_path = None         # 录制文件保存路径
+        self.time_scale = SIM_TIME_SCALE  # 窗口模式下的模拟速度倍数
+
+        if headless:
+            # 无头模式：不初始化显示，输入和升级选择由外部注入
+            self.screen = None
+            self.clock = None
+            self.input_keys = KeyState()  # 注入的按键状态
+            self.profiler = None
+            self.rewind = None
+        else:
+            # 初始化pygame
+            pygame.init()
+
+            # 创建游戏窗口
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(GAME_TITLE)
+            self.clock = pygame.time.Clock()  # 用于控制渲染帧率
+            self.input_keys = None  # 注入的按键状态，None表示读取键盘
+            self.profiler = FrameProfiler()  # 帧性能分析（F3显示叠加图），None表示不统计
+            self.rewind = RewindBuffer()  # 最近几秒的逐帧画面（游戏结束后倒退查看），None表示不保存
+        self.rewind_position = None     # 正在查看的回放帧位置，None表示未在查看
+        self._rewind_final = None       # 开始查看前的完整状态快照，结束查看时恢复
+
+        self.upgrade_policy = None      # 升级选择策略 (score, upgrades) -> 1/2/3，设置后代替升级窗口
 
         # ==================== 游戏对象 ====================
         self._init_game_objects()
@@ -42,10 +92,13 @@ class Game:
         self._init_timing()
 
         # ==================== UI设置 ====================
-        self.font = pygame.font.Font(None, FONT_SIZE)  # 主字体
-        self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)  # 小字体
-        self.menu_manager = MenuManager(self.screen, self.font)  # 菜单管理器
-        self.upgrade_window = UpgradeWindow(self.screen, self.font)  # 升级窗口
+        if not headless:
+            self.font = pygame.font.Font(None, FONT_SIZE)  # 主字体
+            self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)  # 小字体
+            self.text_cache = TextCache()  # HUD文字缓存
+            self.renderer = DirtyRectRenderer(self.screen)  # 脏矩形渲染器
+            self.menu_manager = MenuManager(self.screen, self.font)  # 菜单管理器
+            self.upgrade_window = UpgradeWindow(self.screen, self.font)  # 升级窗口
 
         # ==================== 游戏模式 ====================
         self.game_mode = None           # 当前游戏模式
@@ -63,15 +116,16 @@ class Game:
         self.last_health_boost_score = 0      # 上次血量提升分数
 
         # ==================== 背景效果 ====================
-        self.background_manager = BackgroundManager()
+        self.background_manager = None if headless else BackgroundManager(rng=self.rng.background)
     
     def _init_game_objects(self):
         """初始化游戏对象"""
-        # 创建玩家飞机（位于屏幕底部中央）
-        self.player = Player(SCREEN_WIDTH // 2 - PLAYER_SIZE // 2, SCREEN_HEIGHT - 50)
-        self.aliens = []        # 外星人列表
-        self.bullets = []       # 子弹列表
-        self.explosions = []    # 爆炸特效列表
+        # 整个屏幕为一个区域，玩家飞机位于屏幕底部中央
+        self.engine = ArenaEngine([(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)], self.rng)
+        self.aliens = self.engine.aliens        # 外星人存储（列式数组）
+        self.bullets = self.engine.bullets      # 子弹存储（列式数组）
+        self.particles = self.engine.particles  # 爆炸粒子系统
+        self.alien_grid = self.engine.grid      # 外星人空间哈希（碰撞粗筛）
         self.wingmen = []       # 僚机列表
     
     def _init_game_state(self):
@@ -87,53 +141,49 @@ class Game:
         self.last_wingman_bullet_time = 0  # 上次僚机发射子弹的时间
         self.bullet_color_index = 0        # 子弹颜色循环索引
 
+    def get_time(self):
+        """
+        获取当前游戏时间（毫秒）
+        由模拟时钟按已推进的逻辑帧换算，与真实时间无关
+        """
+        return self.sim_clock.now()
+
+    def get_pressed_keys(self):
+        """
+        获取当前按键状态
+        有注入的KeyState时（无头模式或基准测试）返回它，否则读取键盘
+        """
+        if self.input_keys is not None:
+            return self.input_keys
+        return pygame.key.get_pressed()
+
     def handle_input(self):
         """
         处理玩家输入
         检测方向键按下状态，控制玩家飞机移动
         """
-        keys = pygame.key.get_pressed()  # 获取当前按键状态
-        dx = dy = 0  # 初始化移动方向
+        keys = self.get_pressed_keys()  # 获取当前按键状态
 
         # 检测方向键并设置移动方向
-        if keys[pygame.K_LEFT]:     # 左方向键：向左移动
-            dx = -1
-        if keys[pygame.K_RIGHT]:    # 右方向键：向右移动
-            dx = 1
-        if keys[pygame.K_UP]:       # 上方向键：向上移动
-            dy = -1
-        if keys[pygame.K_DOWN]:     # 下方向键：向下移动
-            dy = 1
+        dx, dy = key_direction(keys, pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
 
         # 检测空格键清屏
         if keys[pygame.K_SPACE]:
             self.clear_screen_aliens()
 
         # 移动玩家飞机
-        self.player.move(dx, dy)
+        self.engine.move_player(0, dx, dy)
 
     def spawn_aliens(self):
         """
         生成外星人
         每隔指定时间间隔，在屏幕上方随机位置生成1-5个外星人
         """
-        current_time = pygame.time.get_ticks()  # 获取当前时间（毫秒）
-
-        # 检查是否到了生成外星人的时间
-        if current_time - self.last_alien_spawn_time >= ALIEN_SPAWN_INTERVAL:
-            # 计算升级后的外星人最大数量（包括里程碑加成）
-            total_multiplier = self.max_aliens_multiplier * self.milestone_aliens_multiplier
-            max_aliens = int(MAX_ALIENS_PER_SPAWN * total_multiplier)
-            # 随机生成指定数量的外星人
-            num_aliens = random.randint(MIN_ALIENS_PER_SPAWN, max_aliens)
-            for _ in range(num_aliens):
-                # 在屏幕上方随机x位置生成外星人
-                x = random.randint(0, SCREEN_WIDTH - ALIEN_SIZE)
-                alien = Alien(x, -ALIEN_SIZE, self.alien_health_multiplier)  # 应用血量倍数
-                self.aliens.append(alien)
-
-            # 更新上次生成时间
-            self.last_alien_spawn_time = current_time
+        # 计算升级后的外星人最大数量（包括里程碑加成）
+        total_multiplier = self.max_aliens_multiplier * self.milestone_aliens_multiplier
+        max_aliens = int(MAX_ALIENS_PER_SPAWN * total_multiplier)
+        # 到了生成时间时在屏幕上方随机x位置生成外星人（应用血量倍数）
+        self.engine.spawn_aliens(self.get_time(), max_aliens, self.alien_health_multiplier)
 
     def spawn_bullets(self):
         """
@@ -141,42 +191,7 @@ class Game:
         按照指定频率自动从玩家飞机位置发射子弹
         子弹颜色按红、绿、蓝循环
         """
-        current_time = pygame.time.get_ticks()  # 获取当前时间（毫秒）
-        bullet_interval = 1000 // BULLETS_PER_SECOND  # 计算子弹发射间隔
-
-        # 检查是否到了发射子弹的时间
-        if current_time - self.last_bullet_time >= bullet_interval:
-            # 计算子弹发射位置（玩家飞机中央）
-            center_x = self.player.x + self.player.width // 2 - BULLET_WIDTH // 2
-            bullet_y = self.player.y
-
-            if self.player.has_triple_shot:
-                # 三排子弹模式
-                # 中间子弹（正常伤害）
-                center_bullet = Bullet(center_x, bullet_y, self.bullet_color_index, BULLET_DAMAGE)
-                center_bullet.speed = int(BULLET_SPEED * self.bullet_speed_multiplier)
-                self.bullets.append(center_bullet)
-
-                # 左侧子弹（自定义伤害）
-                left_bullet = Bullet(center_x - 15, bullet_y, self.bullet_color_index, self.player.triple_shot_side_damage)
-                left_bullet.speed = int(BULLET_SPEED * self.bullet_speed_multiplier * TRIPLE_SHOT_SIDE_SPEED_RATIO)
-                self.bullets.append(left_bullet)
-
-                # 右侧子弹（自定义伤害）
-                right_bullet = Bullet(center_x + 15, bullet_y, self.bullet_color_index, self.player.triple_shot_side_damage)
-                right_bullet.speed = int(BULLET_SPEED * self.bullet_speed_multiplier * TRIPLE_SHOT_SIDE_SPEED_RATIO)
-                self.bullets.append(right_bullet)
-            else:
-                # 单排子弹模式
-                bullet = Bullet(center_x, bullet_y, self.bullet_color_index, BULLET_DAMAGE)
-                bullet.speed = int(BULLET_SPEED * self.bullet_speed_multiplier)
-                self.bullets.append(bullet)
-
-            # 更新颜色索引（循环：红->绿->蓝->红...）
-            self.bullet_color_index = (self.bullet_color_index + 1) % len(BULLET_COLORS)
-
-            # 更新上次发射时间
-            self.last_bullet_time = current_time
+        self.engine.spawn_bullets(self.get_time(), self.bullet_speed_multiplier)
 
     def spawn_wingman_bullets(self):
         """
@@ -186,20 +201,19 @@ class Game:
         if not self.wingmen:  # 如果没有僚机，直接返回
             return
 
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_time()
         bullet_interval = 1000 // BULLETS_PER_SECOND  # 与玩家相同的发射频率
 
         # 检查是否到了发射子弹的时间
         if current_time - self.last_wingman_bullet_time >= bullet_interval:
+            speed = int(BULLET_SPEED * WINGMAN_BULLET_SPEED_RATIO)  # 50%速度
             for wingman in self.wingmen:
                 # 计算僚机子弹发射位置
                 bullet_x, bullet_y = wingman.get_bullet_spawn_pos()
 
                 # 创建僚机子弹（粉色，特殊伤害和速度）
-                bullet = Bullet(bullet_x, bullet_y, 0, WINGMAN_BULLET_DAMAGE)  # 使用红色索引但会被覆盖
-                bullet.color = WINGMAN_BULLET_COLOR  # 设置为粉色
-                bullet.speed = int(BULLET_SPEED * WINGMAN_BULLET_SPEED_RATIO)  # 50%速度
-                self.bullets.append(bullet)
+                self.bullets.spawn(bullet_x, bullet_y, speed, WINGMAN_BULLET_DAMAGE,
+                                   WINGMAN_BULLET_COLOR_INDEX)
 
             # 更新上次发射时间
             self.last_wingman_bullet_time = current_time
@@ -209,39 +223,23 @@ class Game:
         更新所有子弹的位置
         移动子弹并移除飞出屏幕的子弹
         """
-        # 遍历子弹列表的副本，避免在遍历时修改列表
-        for bullet in self.bullets[:]:
-            bullet.move()  # 移动子弹
-
-            # 如果子弹飞出屏幕上方，则移除它
-            if bullet.y < 0:
-                self.bullets.remove(bullet)
+        self.engine.update_bullets()  # 批量移动子弹并移除飞出屏幕上方的子弹
 
     def update_aliens(self):
         """
         更新所有外星人的位置
         移动外星人，如果外星人到达屏幕底部则游戏失败
         """
-        # 遍历外星人列表的副本，避免在遍历时修改列表
-        for alien in self.aliens[:]:
-            alien.move()  # 移动外星人
-
-            # 如果外星人到达屏幕底部
-            if alien.y > SCREEN_HEIGHT:
-                self.aliens.remove(alien)
-                # 外星人到达屏幕底部判负
-                self.game_over = True
+        # 批量移动外星人并移除到达屏幕底部的外星人，外星人到达屏幕底部判负
+        if self.engine.update_aliens():
+            self.game_over = True
 
     def update_explosions(self):
         """
         更新所有爆炸特效
-        移除已结束的爆炸动画
+        粒子批量移动，已结束的爆炸粒子整体剔除
         """
-        # 遍历爆炸列表的副本，避免在遍历时修改列表
-        for explosion in self.explosions[:]:
-            # 更新爆炸特效，如果结束则移除
-            if explosion.update():
-                self.explosions.remove(explosion)
+        self.particles.update()
 
     def update_wingmen(self):
         """
@@ -255,7 +253,7 @@ class Game:
         生成三个随机升级选项
         过滤掉已达到上限的升级
         """
-        import random
+        rng = self.rng.upgrades
         all_upgrades = [
             UPGRADE_BULLET_SPEED,
             UPGRADE_CLEAR_SCREEN,
@@ -282,13 +280,13 @@ class Game:
                 available_upgrades.append(UPGRADE_BULLET_SPEED)  # 子弹速度可以无限升级
 
         # 随机选择3个不同的升级选项
-        self.available_upgrades = random.sample(available_upgrades, min(3, len(available_upgrades)))
+        self.available_upgrades = rng.sample(available_upgrades, min(3, len(available_upgrades)))
 
         # 如果选项不足3个，用其他升级补充
         while len(self.available_upgrades) < 3:
             remaining_upgrades = [u for u in available_upgrades if u not in self.available_upgrades]
             if remaining_upgrades:
-                self.available_upgrades.append(random.choice(remaining_upgrades))
+                self.available_upgrades.append(rng.choice(remaining_upgrades))
             else:
                 self.available_upgrades.append(UPGRADE_BULLET_SPEED)
 
@@ -328,24 +326,24 @@ class Game:
 
         elif upgrade_type == UPGRADE_WINGMAN:
             # 添加一架新僚机
-            wingman = Wingman(self.player.x, self.player.y)
+            wingman = Wingman(self.player.x, self.player.y, self.rng.wingmen)
             self.wingmen.append(wingman)
 
     def clear_screen_aliens(self):
         """
         清除屏幕上所有外星人
         """
-        current_time = pygame.time.get_ticks()
+        current_time = self.get_time()
         if (self.player.has_clear_screen and
             current_time - self.last_clear_screen_time >= self.player.clear_screen_cooldown):
 
             # 为每个外星人创建爆炸特效
-            for alien in self.aliens:
-                explosion = Explosion(alien.x, alien.y)
-                self.explosions.append(explosion)
-                # 获得分数
-                points = int(POINTS_PER_KILL * self.player.score_multiplier)
-                self.score += points
+            count = self.aliens.count
+            self.particles.emit(self.aliens.x[:count], self.aliens.y[:count])
+
+            # 获得分数
+            points = int(POINTS_PER_KILL * self.player.score_multiplier)
+            self.score += points * count
 
             # 清除所有外星人
             self.aliens.clear()
@@ -362,8 +360,22 @@ class Game:
             if not self.available_upgrades:
                 self.generate_random_upgrades()
 
-            # 显示升级选择界面并获取选择
-            choice = self.upgrade_window.show_upgrade_selection(self.score, self.available_upgrades)
+            # 显示升级选择界面并获取选择（有注入的策略时使用策略，无头模式默认第一个选项）
+            if self.upgrade_policy is not None:
+                choice = self.upgrade_policy(self.score, self.available_upgrades)
+            elif self.headless:
+                choice = 1
+            else:
+                choice = self.upgrade_window.show_upgrade_selection(self.score, self.available_upgrades)
+                # 丢弃等待选择期间流逝的真实时间，避免恢复后逻辑帧追赶
+                self.clock.tick()
+                if self.profiler is not None:
+                    self.profiler.start_frame()
+                # 升级窗口覆盖了整个画面，下一帧整屏重绘
+                self.renderer.invalidate()
+
+            if self.recorder is not None:
+                self.recorder.record_upgrade(choice)
 
             # 应用选择的升级
             if 1 <= choice <= 3:
@@ -381,30 +393,14 @@ class Game:
         包括：子弹击中外星人、玩家与外星人碰撞、胜利条件检查
         """
         # ==================== 子弹击中外星人 ====================
-        for bullet in self.bullets[:]:
-            for alien in self.aliens[:]:
-                # 检查子弹和外星人是否碰撞
-                if bullet.get_rect().colliderect(alien.get_rect()):
-                    self.bullets.remove(bullet)  # 移除子弹
-
-                    # 外星人受到伤害（使用子弹的伤害值）
-                    if alien.take_damage(bullet.damage):
-                        # 外星人死亡，创建爆炸特效
-                        explosion = Explosion(alien.x, alien.y)
-                        self.explosions.append(explosion)
-
-                        # 移除外星人并加分（应用分数倍数）
-                        self.aliens.remove(alien)
-                        points = int(POINTS_PER_KILL * self.player.score_multiplier)
-                        self.score += points
-                    break  # 一发子弹只能击中一个外星人
+        # 空间哈希粗筛：每发子弹只检查所在及相邻格子中的外星人
+        # 外星人死亡时创建爆炸特效并加分（应用分数倍数）
+        self.engine.resolve_hits()
 
         # ==================== 玩家与外星人碰撞 ====================
-        player_rect = self.player.get_rect()
-        for alien in self.aliens:
-            if player_rect.colliderect(alien.get_rect()):
-                self.game_over = True  # 碰撞后游戏结束
-                return
+        if self.engine.player_hits():
+            self.game_over = True  # 碰撞后游戏结束
+            return
 
         # ==================== 检查里程碑 ====================
         if self.game_mode == RANDOM_MODE:
@@ -432,42 +428,44 @@ class Game:
                 (self.score // UPGRADE_SCORE_INTERVAL) > (self.last_upgrade_score // UPGRADE_SCORE_INTERVAL)):
                 self.show_upgrade_menu = True
 
-    def draw(self):
+    def draw(self, alpha=1.0):
         """
         绘制游戏画面
         包括背景、游戏对象、UI文字等
+        参数:
+            alpha: 逻辑帧间插值系数（0为上一逻辑帧，1为当前逻辑帧）
         """
-        # 填充白色背景
-        self.screen.fill(WHITE)
+        # 擦除上一帧绘制的区域（脏矩形渲染）
+        renderer = self.renderer
+        renderer.begin_frame()
 
         # ==================== 绘制背景效果 ====================
-        self.background_manager.draw(self.screen)
+        renderer.add_all(self.background_manager.draw(self.screen))
 
         # ==================== 绘制游戏对象 ====================
-        # 绘制玩家飞机
-        self.player.draw(self.screen)
-
-        # 绘制所有外星人
-        for alien in self.aliens:
-            alien.draw(self.screen)
-
-        # 绘制所有子弹
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
+        # 绘制玩家飞机、所有外星人和所有子弹
+        renderer.add_all(self.engine.draw(self.screen, alpha))
 
         # 绘制所有僚机
         for wingman in self.wingmen:
-            wingman.draw(self.screen)
+            renderer.add_all(wingman.draw(self.screen, alpha))
 
         # 绘制所有爆炸特效
-        for explosion in self.explosions:
-            explosion.draw(self.screen)
+        renderer.add_all(self.particles.draw(self.screen, alpha))
 
         # ==================== 绘制UI信息 ====================
         self._draw_ui()
 
-        # 更新屏幕显示
-        pygame.display.flip()
+        # 性能叠加图（右上角，HUD文字下方）
+        profiler = self.profiler
+        if profiler is not None:
+            if profiler.show_overlay:
+                overlay = profiler.overlay()
+                renderer.blit(overlay, (SCREEN_WIDTH - overlay.get_width() - 10, 40))
+            profiler.lap('draw')
+
+        # 只更新上一帧与本帧绘制过的区域
+        renderer.present()
 
     def _draw_ui(self):
         """
@@ -475,8 +473,8 @@ class Game:
         包括分数、游戏状态信息等
         """
         # 绘制分数（左上角）
-        score_text = self.font.render(SCORE_TEXT.format(self.score), True, BLACK)
-        self.screen.blit(score_text, SCORE_POSITION)
+        score_text = self.text_cache.render(self.font, SCORE_TEXT.format(self.score), BLACK)
+        self.renderer.blit(score_text, SCORE_POSITION)
 
         # 绘制游戏模式信息（右上角）
         if self.game_mode == CLASSIC_MODE:
@@ -488,10 +486,10 @@ class Game:
                 next_health_boost = UPGRADE_STOP_SCORE + ((self.score - UPGRADE_STOP_SCORE) // HEALTH_BOOST_INTERVAL + 1) * HEALTH_BOOST_INTERVAL
                 mode_text = f"Endgame Mode (Next Health Boost: {next_health_boost})"
 
-        mode_surface = self.font.render(mode_text, True, BLUE)
+        mode_surface = self.text_cache.render(self.font, mode_text, BLUE)
         mode_rect = mode_surface.get_rect()
         mode_rect.topright = (SCREEN_WIDTH - 10, 10)
-        self.screen.blit(mode_surface, mode_rect)
+        self.renderer.blit(mode_surface, mode_rect)
 
         # 显示升级信息（使用小字体）
         y_offset = 40
@@ -499,32 +497,32 @@ class Game:
 
         if self.bullet_speed_multiplier > 1.0:
             upgrade_text = f"Bullet Speed: +{int((self.bullet_speed_multiplier - 1) * 100)}%"
-            upgrade_surface = self.small_font.render(upgrade_text, True, GREEN)
-            self.screen.blit(upgrade_surface, (10, y_offset))
+            upgrade_surface = self.text_cache.render(self.small_font, upgrade_text, GREEN)
+            self.renderer.blit(upgrade_surface, (10, y_offset))
             y_offset += line_height
 
         if self.player.speed_multiplier > 1.0:
             speed_text = f"Ship Speed: +{int((self.player.speed_multiplier - 1) * 100)}%"
-            speed_surface = self.small_font.render(speed_text, True, GREEN)
-            self.screen.blit(speed_surface, (10, y_offset))
+            speed_surface = self.text_cache.render(self.small_font, speed_text, GREEN)
+            self.renderer.blit(speed_surface, (10, y_offset))
             y_offset += line_height
 
         if self.player.score_multiplier > 1.0:
             score_text = f"Score Mult: +{int((self.player.score_multiplier - 1) * 100)}%"
-            score_surface = self.small_font.render(score_text, True, GREEN)
-            self.screen.blit(score_surface, (10, y_offset))
+            score_surface = self.text_cache.render(self.small_font, score_text, GREEN)
+            self.renderer.blit(score_surface, (10, y_offset))
             y_offset += line_height
 
         if self.player.has_triple_shot:
             max_reached = " (MAX)" if self.player.triple_shot_side_damage >= TRIPLE_SHOT_MAX_DAMAGE else ""
             triple_text = f"Triple Shot: Side {self.player.triple_shot_side_damage} DMG{max_reached}"
             color = YELLOW if self.player.triple_shot_side_damage >= TRIPLE_SHOT_MAX_DAMAGE else GREEN
-            triple_surface = self.small_font.render(triple_text, True, color)
-            self.screen.blit(triple_surface, (10, y_offset))
+            triple_surface = self.text_cache.render(self.small_font, triple_text, color)
+            self.renderer.blit(triple_surface, (10, y_offset))
             y_offset += line_height
 
         if self.player.has_clear_screen:
-            current_time = pygame.time.get_ticks()
+            current_time = self.get_time()
             cooldown_remaining = max(0, self.player.clear_screen_cooldown - (current_time - self.last_clear_screen_time))
             if cooldown_remaining > 0:
                 clear_text = f"Clear: {cooldown_remaining // 1000}s (CD: {self.player.clear_screen_cooldown // 1000}s)"
@@ -532,41 +530,46 @@ class Game:
             else:
                 clear_text = f"Clear: READY (SPACE) - CD: {self.player.clear_screen_cooldown // 1000}s"
                 color = GREEN
-            clear_surface = self.small_font.render(clear_text, True, color)
-            self.screen.blit(clear_surface, (10, y_offset))
+            clear_surface = self.text_cache.render(self.small_font, clear_text, color)
+            self.renderer.blit(clear_surface, (10, y_offset))
             y_offset += line_height
 
         # 显示僚机信息
         if self.wingmen:
             wingman_text = f"Wingmen: {len(self.wingmen)}"
-            wingman_surface = self.small_font.render(wingman_text, True, BLUE)
-            self.screen.blit(wingman_surface, (10, y_offset))
+            wingman_surface = self.text_cache.render(self.small_font, wingman_text, BLUE)
+            self.renderer.blit(wingman_surface, (10, y_offset))
             y_offset += line_height
 
         # 显示血量倍数信息
         if self.game_mode == RANDOM_MODE and self.alien_health_multiplier > 1.0:
             health_text = f"Alien Health: +{int((self.alien_health_multiplier - 1) * 100)}%"
-            health_surface = self.small_font.render(health_text, True, RED)
-            self.screen.blit(health_surface, (10, y_offset))
+            health_surface = self.text_cache.render(self.small_font, health_text, RED)
+            self.renderer.blit(health_surface, (10, y_offset))
             y_offset += line_height
 
         # 显示里程碑信息
         if self.game_mode == RANDOM_MODE and self.milestone_aliens_multiplier > 1.0:
             milestone_text = f"Milestone: +{int((self.milestone_aliens_multiplier - 1) * 100)}% Aliens"
-            milestone_surface = self.small_font.render(milestone_text, True, YELLOW)
-            self.screen.blit(milestone_surface, (10, y_offset))
+            milestone_surface = self.text_cache.render(self.small_font, milestone_text, YELLOW)
+            self.renderer.blit(milestone_surface, (10, y_offset))
 
         # ==================== 绘制游戏状态信息 ====================
         if self.game_over:
             # 游戏失败信息
-            game_over_text = self.font.render(GAME_OVER_TEXT, True, RED)
+            game_over_text = self.text_cache.render(self.font, GAME_OVER_TEXT, RED)
             text_rect = game_over_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            self.screen.blit(game_over_text, text_rect)
+            self.renderer.blit(game_over_text, text_rect)
+            if self.rewind_position is not None:
+                # 回放查看进度
+                rewind_text = REWIND_TEXT.format(self.rewind_position + 1, len(self.rewind))
+                rewind_surface = self.text_cache.render(self.small_font, rewind_text, BLUE)
+                self.renderer.blit(rewind_surface, rewind_surface.get_rect(midtop=(SCREEN_WIDTH // 2, text_rect.bottom + 10)))
         elif self.game_won:
             # 游戏胜利信息
-            win_text = self.font.render(VICTORY_TEXT, True, GREEN)
+            win_text = self.text_cache.render(self.font, VICTORY_TEXT, GREEN)
             text_rect = win_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
-            self.screen.blit(win_text, text_rect)
+            self.renderer.blit(win_text, text_rect)
 
     def reset_game(self):
         """
@@ -603,7 +606,118 @@ class Game:
         self.player.score_multiplier = 1.0
 
         # 重置背景效果
-        self.background_manager.reset()
+        if self.background_manager is not None:
+            self.background_manager.reset()
+
+        # 清空回放缓冲
+        self.rewind_position = None
+        self._rewind_final = None
+        if self.rewind is not None:
+            self.rewind.clear()
+
+    def rewind_seek(self, offset):
+        """
+        游戏结束后在回放缓冲中移动并显示对应的帧
+        第一次调用时保存当前完整状态，rewind_exit时恢复
+        参数:
+            offset: 移动的帧数（负数向前倒退，正数向后）
+        """
+        if self.rewind is None or not len(self.rewind):
+            return
+        if self.rewind_position is None:
+            from snapshot import capture  # 延迟导入，避免循环引用
+            self._rewind_final = capture(self)
+            self.rewind_position = len(self.rewind) - 1
+        self.rewind_position = max(0, min(len(self.rewind) - 1, self.rewind_position + offset))
+        self.rewind.apply(self, self.rewind_position)
+
+    def rewind_exit(self):
+        """结束回放查看，恢复到游戏结束时的完整状态（模拟时钟保持当前时间）"""
+        if self.rewind_position is None:
+            return
+        from snapshot import restore  # 延迟导入，避免循环引用
+        ticks = self.sim_clock.ticks
+        restore(self._rewind_final, self)
+        self.sim_clock.ticks = ticks
+        self.rewind_position = None
+        self._rewind_final = None
+
+    def step(self):
+        """
+        推进一帧游戏逻辑
+        不处理窗口事件、不绘制，供主循环和无头模式共用
+        """
+        # 录制本帧的按键状态（每个逻辑帧一次）
+        if self.recorder is not None:
+            self.recorder.record_tick(self.get_pressed_keys())
+
+        profiler = self.profiler
+
+        # 背景效果始终更新（无头模式没有背景）
+        if self.background_manager is not None:
+            self.background_manager.update()
+
+        # 爆炸特效始终更新
+        self.update_explosions()
+        if profiler is not None:
+            profiler.lap('update')
+
+        # 处理升级菜单（会暂停游戏）
+        if self.show_upgrade_menu:
+            self.handle_upgrade()
+            if profiler is not None:
+                profiler.lap('input')
+
+        # 游戏逻辑更新（升级时暂停）
+        elif not self.game_over and not self.game_won:
+            self.handle_input()     # 处理玩家输入
+            if profiler is not None:
+                profiler.lap('input')
+            self.spawn_aliens()     # 生成外星人
+            self.spawn_bullets()    # 生成子弹
+            self.spawn_wingman_bullets()  # 生成僚机子弹
+            if profiler is not None:
+                profiler.lap('spawn')
+            self.update_bullets()   # 更新子弹位置
+            self.update_aliens()    # 更新外星人位置
+            self.update_wingmen()   # 更新僚机位置
+            if profiler is not None:
+                profiler.lap('update')
+            self.check_collisions() # 检查碰撞
+            if self.rewind is not None:
+                self.rewind.record(self)  # 保存本帧画面供倒退查看
+            if profiler is not None:
+                profiler.lap('collisions')
+
+        # 推进模拟时间
+        self.sim_clock.advance()
+
+    def run_headless(self, max_ticks):
+        """
+        无头模式主循环
+        不绘制、不限帧率，以CPU允许的最快速度推进游戏逻辑
+        参数:
+            max_ticks: 最多模拟的帧数
+        返回: 实际模拟的帧数（游戏结束或获胜时提前停止）
+        """
+        if self.game_mode is None:
+            self.game_mode = CLASSIC_MODE
+
+        ticks = 0
+        while ticks < max_ticks and not self.game_over and not self.game_won:
+            self.step()
+            ticks += 1
+        return ticks
+
+    def start_recording(self, path):
+        """
+        开始录制本局输入，游戏退出时保存到指定路径
+        参数:
+            path: 录制文件路径
+        """
+        from replay import InputRecorder  # 延迟导入，避免循环引用
+        self.recorder = InputRecorder(self.rng.seed, self.game_mode)
+        self.record_path = path
 
     def run(self):
         """
@@ -615,9 +729,21 @@ class Game:
             self.game_mode = CLASSIC_MODE
 
         running = True  # 游戏运行标志
+        tick_ms = self.sim_clock.tick_ms  # 每个逻辑帧的时长
+        accumulator = 0.0  # 尚未模拟的真实时间（毫秒）
+        profiler = self.profiler  # 帧性能分析（None表示不统计）
+        if profiler is not None:
+            profiler.start_frame()
 
         # ==================== 主游戏循环 ====================
         while running:
+            # ==================== 帧率控制 ====================
+            # 渲染帧率与逻辑帧率解耦：按流逝的真实时间推进固定步长逻辑帧
+            frame_ms = self.clock.tick(RENDER_FPS)
+            accumulator += min(frame_ms, MAX_FRAME_TIME) * self.time_scale
+            if profiler is not None:
+                profiler.lap('tick')
+
             # ==================== 事件处理 ====================
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -627,36 +753,48 @@ class Game:
                     # 按键事件处理
                     if event.key == pygame.K_r and (self.game_over or self.game_won):
                         # 游戏结束后按R键重新开始
+                        if self.recorder is not None:
+                            self.recorder.record_reset()
                         self.reset_game()
+                    elif event.key == pygame.K_F3 and profiler is not None:
+                        # F3切换性能叠加图
+                        profiler.show_overlay = not profiler.show_overlay
+                    elif event.key in REWIND_KEYS and self.game_over:
+                        # 游戏失败后用方向键逐帧倒退查看，ESC返回
+                        if event.key == pygame.K_ESCAPE:
+                            self.rewind_exit()
+                        else:
+                            self.rewind_seek(REWIND_KEYS[event.key])
+                    elif event.key == pygame.K_F5:
+                        # F5快速保存快照（python main.py --resume读取）
+                        # 回放查看中的画面只写入了部分字段，先恢复游戏结束时的完整状态再保存
+                        self.rewind_exit()
+                        from snapshot import save  # 延迟导入，避免循环引用
+                        save(self, SNAPSHOT_QUICKSAVE_PATH)
+            if profiler is not None:
+                profiler.lap('input')
 
             # ==================== 游戏逻辑更新 ====================
-            # 背景效果始终更新
-            self.background_manager.update()
-
-            # 爆炸特效始终更新
-            self.update_explosions()
-
-            # 处理升级菜单（会暂停游戏）
-            if self.show_upgrade_menu:
-                self.handle_upgrade()
-
-            # 游戏逻辑更新（升级时暂停）
-            elif not self.game_over and not self.game_won:
-                self.handle_input()     # 处理玩家输入
-                self.spawn_aliens()     # 生成外星人
-                self.spawn_bullets()    # 生成子弹
-                self.spawn_wingman_bullets()  # 生成僚机子弹
-                self.update_bullets()   # 更新子弹位置
-                self.update_aliens()    # 更新外星人位置
-                self.update_wingmen()   # 更新僚机位置
-                self.check_collisions() # 检查碰撞
+            while accumulator >= tick_ms:
+                self.step()
+                accumulator -= tick_ms
 
             # ==================== 绘制画面 ====================
-            self.draw()  # 绘制所有游戏元素
-
-            # ==================== 帧率控制 ====================
-            self.clock.tick(FPS)  # 限制游戏运行在指定FPS
+            # 游戏进行中在两个逻辑帧之间插值，结束后画面静止
+            if self.game_over or self.game_won:
+                alpha = 1.0
+            else:
+                alpha = accumulator / tick_ms
+            self.draw(alpha)  # 绘制所有游戏元素
+            if profiler is not None:
+                profiler.lap('flip')
+                profiler.end_frame(self)
 
         # ==================== 游戏退出 ====================
+        self.rewind_exit()  # 录制摘要需要游戏结束时的真实状态
+        if self.recorder is not None:
+            self.recorder.save(self, self.record_path)
+        if profiler is not None:
+            profiler.close()
         pygame.quit()  # 退出pygame
         sys.exit()     # 退出程序
@@ -4,18 +4,137 @@ A simple shooting game developed with pygame
 Player controls aircraft to shoot aliens, avoid collisions and prevent aliens from reaching the bottom
 """
 
+import argparse
+import time
 import pygame
 from game import Game
 from versus_game import VersusGame
+from tournament import TournamentGame
 from menu import MenuManager
+from replay import Recording, replay
+from snapshot import SnapshotError, load
 from config import *
 
 
+def parse_args(argv=None):
+    """
+    Parse command line arguments
+    """
+    parser = argparse.ArgumentParser(description=GAME_TITLE)
+    parser.add_argument("--headless", action="store_true",
+                        help="run the simulation without a window, rendering or frame cap")
+    parser.add_argument("--mode", choices=[CLASSIC_MODE, RANDOM_MODE, VERSUS_MODE],
+                        default=RANDOM_MODE, help="game mode for headless runs")
+    parser.add_argument("--ticks", type=int, default=HEADLESS_DEFAULT_TICKS,
+                        help="maximum number of simulated frames for headless runs")
+    parser.add_argument("--speed", type=float, default=SIM_TIME_SCALE,
+                        help="simulation speed multiplier for windowed runs (1.0 = real time)")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="random seed; the same seed and inputs reproduce a session exactly")
+    parser.add_argument("--record", metavar="PATH",
+                        help="record the inputs of a windowed session to PATH")
+    parser.add_argument("--replay", metavar="PATH",
+                        help="replay a recorded session headlessly and verify its final state")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="write per-frame profiling data to PATH (.csv for CSV, otherwise JSONL)")
+    parser.add_argument("--resume", metavar="PATH",
+                        help="resume a single-player game from a snapshot (F5 saves " + SNAPSHOT_QUICKSAVE_PATH + ")")
+    parser.add_argument("--players", type=int, metavar="N",
+                        help=f"start a {TOURNAMENT_MIN_PLAYERS}-{TOURNAMENT_MAX_PLAYERS} player tournament "
+                             "(skips the menu; also works with --headless)")
+    args = parser.parse_args(argv)
+    if args.resume and args.record:
+        parser.error("--record cannot be combined with --resume (a recording must start from a new game)")
+    if args.players is not None:
+        if not TOURNAMENT_MIN_PLAYERS <= args.players <= TOURNAMENT_MAX_PLAYERS:
+            parser.error(f"--players must be between {TOURNAMENT_MIN_PLAYERS} and {TOURNAMENT_MAX_PLAYERS}")
+        if args.record or args.resume or args.replay:
+            parser.error("--players cannot be combined with --record, --resume or --replay")
+    return args
+
+
+def describe_result(game):
+    """
+    Summarise the outcome of a session
+    """
+    if isinstance(game, VersusGame):
+        return f"scores {game.score1}:{game.score2}, winner {game.winner}"
+    if isinstance(game, TournamentGame):
+        return f"scores {':'.join(map(str, game.scores))}, winner {game.winner}"
+    return f"score {game.score}, game over {game.game_over}, won {game.game_won}"
+
+
+def run_headless(mode, ticks, seed=None, players=None):
+    """
+    Run one headless session and print a summary
+    """
+    start = time.perf_counter()
+    if players is not None:
+        mode = TOURNAMENT_MODE
+        game = TournamentGame(players, headless=True, seed=seed)
+    elif mode == VERSUS_MODE:
+        game = VersusGame(headless=True, seed=seed)
+    else:
+        game = Game(headless=True, seed=seed)
+        game.game_mode = mode
+    simulated = game.run_headless(ticks)
+    elapsed = time.perf_counter() - start
+    print(f"{mode} (seed {game.rng.seed}): {simulated} ticks ({simulated / FPS:.1f}s game time) "
+          f"in {elapsed:.2f}s - {describe_result(game)}")
+
+
+def run_replay(path):
+    """
+    Replay a recorded session headlessly and print whether it reproduced the recorded state
+    """
+    recording = Recording.load(path)
+    start = time.perf_counter()
+    game, matched = replay(recording)
+    elapsed = time.perf_counter() - start
+    if matched is None:
+        verdict = "no digest recorded"
+    else:
+        verdict = "state matches recording" if matched else "STATE MISMATCH"
+    print(f"{recording.mode} (seed {recording.seed}): replayed {recording.ticks} ticks "
+          f"in {elapsed:.2f}s - {describe_result(game)} - {verdict}")
+    return matched is not False
+
+
 def main():
     """
     Main program entry point
     Create game instance and start running
     """
+    args = parse_args()
+    if args.replay:
+        if not run_replay(args.replay):
+            raise SystemExit(1)
+        return
+    if args.headless:
+        run_headless(args.mode, args.ticks, args.seed, args.players)
+        return
+    if args.players is not None:
+        # 跳过开始菜单，直接开始锦标赛
+        game = TournamentGame(args.players, seed=args.seed)
+        game.time_scale = args.speed
+        if args.trace:
+            game.profiler.open_trace(args.trace)
+        game.run()
+        return
+    if args.resume:
+        # 跳过开始菜单，直接从快照继续单人游戏
+        game = Game(seed=args.seed)
+        try:
+            load(args.resume, game)
+        except (OSError, SnapshotError) as e:
+            print(f"Cannot resume from {args.resume}: {e}")
+            raise SystemExit(1)
+        game.time_scale = args.speed
+        if args.trace:
+            game.profiler.open_trace(args.trace)
+        game.run()
+        return
+
     try:
         # 初始化pygame
         pygame.init()
@@ -40,12 +159,22 @@ def main():
         # 根据选择的模式启动相应的游戏
         if game_mode == VERSUS_MODE:
             # 启动双人对战模式
-            versus_game = VersusGame()
+            versus_game = VersusGame(seed=args.seed)
+            versus_game.time_scale = args.speed
+            if args.record:
+                versus_game.start_recording(args.record)
+            if args.trace:
+                versus_game.profiler.open_trace(args.trace)
             versus_game.run()
         else:
             # 启动单人模式（经典或随机）
-            game = Game()
+            game = Game(seed=args.seed)
             game.game_mode = game_mode  # 设置游戏模式
+            game.time_scale = args.speed
+            if args.record:
+                game.start_recording(args.record)
+            if args.trace:
+                game.profiler.open_trace(args.trace)
             game.run()
 
     except Exception as e:
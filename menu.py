@@ -30,22 +30,12 @@ class MenuManager:
         显示开始菜单
         返回: 选择的游戏模式 (CLASSIC_MODE 或 RANDOM_MODE)，如果退出返回None
         """
-        while True:
-            # 处理事件
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return None
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        return CLASSIC_MODE
-                    elif event.key == pygame.K_2:
-                        return RANDOM_MODE
-                    elif event.key == pygame.K_3:
-                        return VERSUS_MODE
-            
-            # 绘制菜单
-            self._draw_start_menu()
-            pygame.display.flip()
+        choices = {
+            pygame.K_1: CLASSIC_MODE,
+            pygame.K_2: RANDOM_MODE,
+            pygame.K_3: VERSUS_MODE,
+        }
+        return self._run_menu(self._draw_start_menu, choices, None)
     
     def show_upgrade_menu(self, current_score, available_upgrades):
         """
@@ -55,21 +45,41 @@ class MenuManager:
             available_upgrades: 可用的升级选项列表
         返回: 选择的升级选项 (1, 2, 或 3)
         """
-        while True:
-            # 处理事件
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return 1  # 默认选择第一个选项
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        return 1
-                    elif event.key == pygame.K_2:
-                        return 2
-                    elif event.key == pygame.K_3:
-                        return 3
-
-            # 绘制升级菜单
+        # 记录菜单打开时的画面，重绘时先恢复它，避免半透明覆盖层反复叠加
+        backdrop = self.screen.copy()
+
+        def draw():
+            self.screen.blit(backdrop, (0, 0))
             self._draw_upgrade_menu(current_score, available_upgrades)
+
+        choices = {pygame.K_1: 1, pygame.K_2: 2, pygame.K_3: 3}
+        return self._run_menu(draw, choices, 1)  # 关闭窗口时默认选择第一个选项
+
+    def _run_menu(self, draw, choices, quit_result):
+        """
+        菜单事件循环（事件驱动，空闲时不占用CPU）
+        阻塞在pygame.event.wait上，只在收到事件（如窗口重新暴露）时重绘；
+        等待设有超时，保证Ctrl+C等信号能及时处理
+        参数:
+            draw: 绘制菜单画面的函数
+            choices: 按键码 -> 返回值
+            quit_result: 关闭窗口时的返回值
+        返回: 选中的返回值
+        """
+        draw()
+        pygame.display.flip()
+
+        while True:
+            event = pygame.event.wait(MENU_IDLE_TIMEOUT)
+            if event.type == pygame.NOEVENT:
+                continue  # 等待超时，菜单没有动画，无需重绘
+            if event.type == pygame.QUIT:
+                return quit_result
+            if event.type == pygame.KEYDOWN and event.key in choices:
+                return choices[event.key]
+
+            # 其他事件可能改变窗口内容（暴露、缩放、焦点变化），重绘菜单
+            draw()
             pygame.display.flip()
     
     def _draw_start_menu(self):
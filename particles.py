@@ -0,0 +1,107 @@
+"""
+粒子系统模块
+全局爆炸粒子系统：所有爆炸的粒子存放在同一组NumPy数组中，按帧批量更新与过期剔除
+"""
+
+import numpy as np
+from config import *
+from entity_store import EntityStore
+from sprite_cache import CIRCLE, get_sprite
+
+# 每次爆炸的粒子沿圆周均匀分布，单位方向向量预先计算
+_ANGLES = 2 * np.pi * np.arange(EXPLOSION_PARTICLES) / EXPLOSION_PARTICLES
+_BURST_DX = np.cos(_ANGLES) * EXPLOSION_SPEED
+_BURST_DY = np.sin(_ANGLES) * EXPLOSION_SPEED
+
+PARTICLE_MIN_SIZE = 2   # 粒子最小半径
+PARTICLE_MAX_SIZE = 5   # 粒子最大半径
+
+
+class ParticleSystem(EntityStore):
+    """
+    爆炸粒子系统
+    每次爆炸在外星人中心生成EXPLOSION_PARTICLES个粒子，
+    粒子逐帧移动并减速，存活EXPLOSION_DURATION帧后整体剔除
+    """
+    FIELDS = (
+        ('x', np.float64),      # x坐标
+        ('y', np.float64),      # y坐标
+        ('dx', np.float64),     # x方向速度
+        ('dy', np.float64),     # y方向速度
+        ('color', np.uint8),    # 颜色在EXPLOSION_COLORS中的索引
+        ('size', np.uint8),     # 粒子半径
+        ('age', np.int32),      # 已存在的帧数
+    )
+
+    def __init__(self, capacity=ENTITY_STORE_CAPACITY, rng=None):
+        """
+        初始化粒子系统
+        参数:
+            capacity: 初始容量（粒子数）
+            rng: numpy.random.Generator，用于随机颜色和大小，默认新建
+        """
+        super().__init__(capacity)
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def emit(self, xs, ys):
+        """
+        批量生成爆炸
+        参数:
+            xs, ys: 外星人左上角坐标序列（每个坐标一次爆炸）
+        """
+        bursts = len(xs)
+        if bursts == 0:
+            return
+        rows = bursts * EXPLOSION_PARTICLES
+        start = self._allocate(rows)
+        new = slice(start, start + rows)
+
+        # 爆炸中心为外星人中心
+        self.x[new] = np.repeat(np.asarray(xs, dtype=np.float64) + ALIEN_SIZE // 2, EXPLOSION_PARTICLES)
+        self.y[new] = np.repeat(np.asarray(ys, dtype=np.float64) + ALIEN_SIZE // 2, EXPLOSION_PARTICLES)
+        self.dx[new] = np.tile(_BURST_DX, bursts)
+        self.dy[new] = np.tile(_BURST_DY, bursts)
+        self.color[new] = self.rng.integers(0, len(EXPLOSION_COLORS), rows)  # 随机爆炸颜色
+        self.size[new] = self.rng.integers(PARTICLE_MIN_SIZE, PARTICLE_MAX_SIZE, rows, endpoint=True)        # 随机粒子大小
+        self.age[new] = 0
+
+    def update(self):
+        """
+        更新所有粒子
+        移动粒子并减速，剔除已存在EXPLOSION_DURATION帧的粒子
+        """
+        n = self.count
+        if n == 0:
+            return
+        dx = self.dx[:n]
+        dy = self.dy[:n]
+        self.x[:n] += dx
+        self.y[:n] += dy
+
+        # 粒子逐渐减速
+        dx *= 0.95
+        dy *= 0.95
+
+        age = self.age[:n]
+        age += 1
+        self.compact(age < EXPLOSION_DURATION)
+
+    def draw(self, screen, alpha=1.0):
+        """
+        绘制所有粒子（缓存的圆形精灵，一次批量blit）
+        参数:
+            screen: pygame屏幕对象
+            alpha: 逻辑帧间插值系数（粒子为装饰效果，按逻辑帧位置绘制）
+        返回: 绘制区域的pygame.Rect列表
+        """
+        n = self.count
+        if n == 0:
+            return []
+        # 以粒子中心减去半径作为精灵左上角
+        sizes = self.size[:n].astype(np.int64)
+        xs = (self.x[:n].astype(np.int64) - sizes).tolist()
+        ys = (self.y[:n].astype(np.int64) - sizes).tolist()
+        sprites = {(color, size): get_sprite(CIRCLE, EXPLOSION_COLORS[color], size)
+                   for color in range(len(EXPLOSION_COLORS)) for size in range(PARTICLE_MIN_SIZE, PARTICLE_MAX_SIZE + 1)}
+        return screen.blits([(sprites[color, size], (x, y))
+                             for x, y, color, size in zip(xs, ys, self.color[:n].tolist(), sizes.tolist())])
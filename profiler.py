@@ -0,0 +1,259 @@
+"""
+帧性能分析模块
+在主循环各阶段之间打点，统计每帧各阶段耗时、实体数量和垃圾回收暂停，
+提供滚动帧耗时直方图、可切换的屏幕叠加图，以及CSV/JSONL跟踪文件输出
+"""
+
+import csv
+import gc
+import json
+import time
+import numpy as np
+import pygame
+from config import *
+
+# 主循环的阶段（按一帧中的先后顺序）
+PHASES = ('input', 'spawn', 'update', 'collisions', 'draw', 'flip', 'tick')
+# 统计的实体类型
+ENTITY_KINDS = ('aliens', 'bullets', 'particles', 'wingmen')
+
+OVERLAY_FONT_SIZE = 18      # 叠加图文字大小
+OVERLAY_PADDING = 4         # 叠加图内边距
+OVERLAY_BACKGROUND = (30, 30, 30)
+FRAME_BUDGET_MS = 1000 / FPS  # 一帧的时间预算
+
+
+def entity_counts(game):
+    """
+    统计游戏中的实体数量
+    参数:
+        game: Game或VersusGame对象
+    返回: (外星人数, 子弹数, 粒子数, 僚机数)
+    """
+    return len(game.aliens), len(game.bullets), len(game.particles), len(getattr(game, 'wingmen', ()))
+
+
+class FrameProfiler:
+    """
+    帧性能分析器
+    主循环在每个阶段结束时调用lap(阶段名)，一帧结束时调用end_frame(game)；
+    两次打点之间的时间计入后一次打点的阶段，同一阶段在一帧中可多次打点（如一帧推进多个逻辑帧）
+    最近PROFILER_HISTORY帧的数据保存在环形数组中
+    """
+
+    def __init__(self, history=PROFILER_HISTORY):
+        """
+        初始化分析器并注册垃圾回收回调
+        参数:
+            history: 保留的帧数
+        """
+        self.history = history
+        self.frame_times = np.zeros(history)                    # 每帧总耗时（毫秒）
+        self.phase_times = np.zeros((history, len(PHASES)))     # 每帧各阶段耗时（毫秒）
+        self.entity_counts = np.zeros((history, len(ENTITY_KINDS)), dtype=np.int32)
+        self.gc_collections = np.zeros(history, dtype=np.int32)  # 每帧垃圾回收次数
+        self.gc_pauses = np.zeros(history)                      # 每帧垃圾回收暂停（毫秒）
+        self.frames = 0                                         # 已记录的总帧数
+
+        self.show_overlay = False   # 是否显示屏幕叠加图（F3切换）
+        self._overlay = None        # 缓存的叠加图Surface
+        self._overlay_frame = -1    # 叠加图绘制时的帧数
+        self._font = None
+
+        self._phase_index = {phase: i for i, phase in enumerate(PHASES)}
+        self._current = [0.0] * len(PHASES)  # 本帧各阶段累计耗时（秒）
+        self._frame_start = self._mark = time.perf_counter()
+
+        # 垃圾回收暂停统计
+        self._gc_start = 0.0
+        self._gc_count = 0
+        self._gc_pause = 0.0
+        gc.callbacks.append(self._on_gc)
+
+        # 跟踪文件
+        self._trace_file = None
+        self._trace_writer = None   # CSV写入器，None表示JSONL格式
+
+    def _on_gc(self, phase, info):
+        """垃圾回收回调：累计本帧的回收次数与暂停时间"""
+        if phase == 'start':
+            self._gc_start = time.perf_counter()
+        else:
+            self._gc_pause += time.perf_counter() - self._gc_start
+            self._gc_count += 1
+
+    def start_frame(self):
+        """开始计时新的一帧，丢弃上次打点以来的时间（如主循环开始前或长时间暂停后）"""
+        self._current = [0.0] * len(PHASES)
+        self._frame_start = self._mark = time.perf_counter()
+
+    def lap(self, phase):
+        """
+        结束一个阶段：把上次打点以来的时间计入该阶段
+        参数:
+            phase: 阶段名（PHASES之一）
+        """
+        now = time.perf_counter()
+        self._current[self._phase_index[phase]] += now - self._mark
+        self._mark = now
+
+    def end_frame(self, game):
+        """
+        结束一帧：保存本帧的阶段耗时、实体数量和垃圾回收统计，写入跟踪文件
+        参数:
+            game: Game或VersusGame对象
+        """
+        now = time.perf_counter()
+        slot = self.frames % self.history
+        self.frame_times[slot] = (now - self._frame_start) * 1000
+        self.phase_times[slot] = self._current
+        self.phase_times[slot] *= 1000
+        self.entity_counts[slot] = entity_counts(game)
+        self.gc_collections[slot] = self._gc_count
+        self.gc_pauses[slot] = self._gc_pause * 1000
+        if self._trace_file is not None:
+            self._write_trace(slot, game.sim_clock.ticks)
+
+        self.frames += 1
+        self._current = [0.0] * len(PHASES)
+        self._gc_count = 0
+        self._gc_pause = 0.0
+        self._frame_start = self._mark = now
+
+    def _recent(self, values):
+        """
+        按时间顺序（旧到新）取出环形数组中的有效数据
+        参数:
+            values: 环形数组
+        返回: NumPy数组
+        """
+        if self.frames < self.history:
+            return values[:self.frames]
+        return np.roll(values, -(self.frames % self.history), axis=0)
+
+    def histogram(self):
+        """
+        最近帧耗时的直方图
+        返回: (各区间帧数, 区间边界) —— 边界为PROFILER_HISTOGRAM_EDGES加上无穷大
+        """
+        edges = np.array(PROFILER_HISTOGRAM_EDGES + (np.inf,))
+        counts, _ = np.histogram(self._recent(self.frame_times), bins=edges)
+        return counts, edges
+
+    def phase_means(self):
+        """
+        最近帧各阶段的平均耗时
+        返回: {阶段名: 毫秒}
+        """
+        recent = self._recent(self.phase_times)
+        means = recent.mean(axis=0) if len(recent) else np.zeros(len(PHASES))
+        return dict(zip(PHASES, means.tolist()))
+
+    def summary(self):
+        """
+        最近帧的统计摘要
+        返回: 字典（帧耗时均值/p95/最大值、各阶段均值、最新实体数量、垃圾回收次数与暂停）
+        """
+        frames = self._recent(self.frame_times)
+        if not len(frames):
+            frames = np.zeros(1)
+        latest = self.entity_counts[(self.frames - 1) % self.history] if self.frames else (0,) * len(ENTITY_KINDS)
+        return {
+            'frames': int(min(self.frames, self.history)),
+            'frame_mean_ms': float(frames.mean()),
+            'frame_p95_ms': float(np.percentile(frames, 95)),
+            'frame_max_ms': float(frames.max()),
+            'phases_ms': self.phase_means(),
+            'entities': dict(zip(ENTITY_KINDS, (int(count) for count in latest))),
+            'gc_collections': int(self._recent(self.gc_collections).sum()),
+            'gc_pause_ms': float(self._recent(self.gc_pauses).sum()),
+        }
+
+    def open_trace(self, path):
+        """
+        开始把每帧数据写入跟踪文件
+        参数:
+            path: 文件路径，以.csv结尾时写CSV，否则每行一个JSON对象（JSONL）
+        """
+        self._trace_file = open(path, 'w', encoding='utf-8', newline='')
+        if path.endswith('.csv'):
+            self._trace_writer = csv.writer(self._trace_file)
+            self._trace_writer.writerow(self._trace_columns())
+        else:
+            self._trace_writer = None
+
+    def _trace_columns(self):
+        """跟踪文件的列名"""
+        return (['frame', 'sim_ticks', 'frame_ms'] + [f'{phase}_ms' for phase in PHASES] +
+                list(ENTITY_KINDS) + ['gc_collections', 'gc_pause_ms'])
+
+    def _write_trace(self, slot, sim_ticks):
+        """
+        写入一帧的跟踪数据
+        参数:
+            slot: 该帧在环形数组中的位置
+            sim_ticks: 已推进的逻辑帧数
+        """
+        row = ([self.frames, sim_ticks, round(float(self.frame_times[slot]), 4)] +
+               [round(value, 4) for value in self.phase_times[slot].tolist()] +
+               self.entity_counts[slot].tolist() +
+               [int(self.gc_collections[slot]), round(float(self.gc_pauses[slot]), 4)])
+        if self._trace_writer is not None:
+            self._trace_writer.writerow(row)
+        else:
+            self._trace_file.write(json.dumps(dict(zip(self._trace_columns(), row))) + '\n')
+
+    def close(self):
+        """注销垃圾回收回调并关闭跟踪文件"""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        if self._trace_file is not None:
+            self._trace_file.close()
+            self._trace_file = None
+
+    def overlay(self):
+        """
+        获取屏幕叠加图：最近帧耗时柱状图（超出预算的帧标为黄色/红色）以及统计文字
+        每PROFILER_OVERLAY_REFRESH帧重新绘制一次，其余帧复用缓存
+        返回: Surface
+        """
+        if self._overlay is not None and self.frames - self._overlay_frame < PROFILER_OVERLAY_REFRESH:
+            return self._overlay
+        if self._font is None:
+            self._font = pygame.font.Font(None, OVERLAY_FONT_SIZE)
+
+        stats = self.summary()
+        phases = stats['phases_ms']
+        entities = stats['entities']
+        logic = phases['input'] + phases['spawn'] + phases['update'] + phases['collisions']
+        lines = [
+            f"frame {stats['frame_mean_ms']:.1f} ms  p95 {stats['frame_p95_ms']:.1f}  max {stats['frame_max_ms']:.1f}",
+            f"logic {logic:.2f}  draw {phases['draw']:.2f}  flip {phases['flip']:.2f}  idle {phases['tick']:.1f}",
+            f"A {entities['aliens']}  B {entities['bullets']}  P {entities['particles']}  W {entities['wingmen']}",
+            f"gc {stats['gc_collections']} ({stats['gc_pause_ms']:.1f} ms) / {stats['frames']} frames",
+        ]
+        line_height = self._font.get_linesize()
+        width = self.history + OVERLAY_PADDING * 2
+        height = PROFILER_GRAPH_HEIGHT + line_height * len(lines) + OVERLAY_PADDING * 3
+        surface = pygame.Surface((width, height))
+        surface.fill(OVERLAY_BACKGROUND)
+
+        y = OVERLAY_PADDING
+        for line in lines:
+            surface.blit(self._font.render(line, True, WHITE), (OVERLAY_PADDING, y))
+            y += line_height
+
+        # 帧耗时柱状图（每帧一列像素，最新的在右侧）
+        bottom = height - OVERLAY_PADDING
+        scale = PROFILER_GRAPH_HEIGHT / PROFILER_GRAPH_SCALE_MS
+        for i, ms in enumerate(self._recent(self.frame_times).tolist()):
+            color = GREEN if ms <= FRAME_BUDGET_MS else YELLOW if ms <= FRAME_BUDGET_MS * 2 else RED
+            bar = min(PROFILER_GRAPH_HEIGHT, max(1, int(ms * scale)))
+            x = OVERLAY_PADDING + i
+            pygame.draw.line(surface, color, (x, bottom), (x, bottom - bar))
+        budget_y = bottom - int(FRAME_BUDGET_MS * scale)
+        pygame.draw.line(surface, LIGHT_GRAY, (OVERLAY_PADDING, budget_y), (width - OVERLAY_PADDING, budget_y))
+
+        self._overlay = surface
+        self._overlay_frame = self.frames
+        return surface
@@ -0,0 +1,223 @@
+"""
+录制与回放模块
+逐逻辑帧录制按键状态（位掩码，按游程压缩）、升级选择和重新开始，
+配合随机数种子即可在无头模式下以CPU最快速度逐帧精确复现一局游戏
+"""
+
+import hashlib
+import json
+import numpy as np
+import pygame
+from config import VERSUS_MODE
+
+# 参与游戏逻辑的按键，位置即位掩码中的位
+RECORDED_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN, pygame.K_SPACE,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+)
+
+REPLAY_FORMAT_VERSION = 2
+
+# 录制的事件类型
+EVENT_UPGRADE = "upgrade"   # 升级选择，值为1/2/3
+EVENT_RESET = "reset"       # 按R重新开始（在该帧逻辑之前执行）
+
+
+def encode_keys(keys):
+    """
+    把按键状态编码为位掩码
+    参数:
+        keys: 支持keys[按键码]查询的按键状态（pygame.key.get_pressed()或KeyState）
+    返回: 整数位掩码
+    """
+    mask = 0
+    for bit, key in enumerate(RECORDED_KEYS):
+        if keys[key]:
+            mask |= 1 << bit
+    return mask
+
+
+def decode_keys(mask):
+    """
+    把位掩码解码为按键码列表
+    参数:
+        mask: 整数位掩码
+    返回: 按下的按键码列表
+    """
+    return [key for bit, key in enumerate(RECORDED_KEYS) if mask & (1 << bit)]
+
+
+def state_digest(game):
+    """
+    计算游戏逻辑状态的摘要，用于校验回放是否与录制逐帧一致
+    参数:
+        game: Game或VersusGame对象
+    返回: 十六进制摘要字符串
+    """
+    digest = hashlib.sha256()
+    engine = game.engine
+    values = [game.game_over, getattr(game, 'game_won', False), getattr(game, 'winner', None),
+              [(arena.score, arena.player.x, arena.player.y) for arena in engine.arenas],
+              [(wingman.x, wingman.direction) for wingman in getattr(game, 'wingmen', ())]]
+    for store in (engine.aliens, engine.bullets):
+        for name, _ in store.FIELDS:
+            digest.update(getattr(store, name)[:store.count].tobytes())
+    values.append(game.sim_clock.ticks)
+    digest.update(repr(values).encode())
+    return digest.hexdigest()
+
+
+class Recording:
+    """
+    一局游戏的录制数据
+    按键状态按游程压缩为[(位掩码, 连续帧数), ...]，事件记录为[(帧序号, 类型, 值), ...]
+    """
+
+    def __init__(self, seed, mode):
+        """
+        初始化录制数据
+        参数:
+            seed: 随机数流的根种子
+            mode: 游戏模式
+        """
+        self.seed = seed
+        self.mode = mode
+        self.key_runs = []      # [[位掩码, 连续帧数], ...]
+        self.events = []        # [[帧序号, 类型, 值], ...]
+        self.ticks = 0          # 已录制的逻辑帧数
+        self.final_digest = None  # 录制结束时的状态摘要
+
+    def key_masks(self):
+        """
+        展开按键游程
+        返回: 每帧位掩码的NumPy数组
+        """
+        if not self.key_runs:
+            return np.empty(0, dtype=np.int64)
+        masks, counts = zip(*self.key_runs)
+        return np.repeat(np.array(masks, dtype=np.int64), counts)
+
+    def save(self, path):
+        """
+        保存为JSON文件
+        参数:
+            path: 文件路径
+        """
+        data = {
+            'version': REPLAY_FORMAT_VERSION,
+            'seed': self.seed,
+            'mode': self.mode,
+            'ticks': self.ticks,
+            'keys': self.key_runs,
+            'events': self.events,
+            'digest': self.final_digest,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, path):
+        """
+        从JSON文件加载
+        参数:
+            path: 文件路径
+        返回: Recording对象
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('version') != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"Unsupported replay format version: {data.get('version')}")
+        recording = cls(data['seed'], data['mode'])
+        recording.key_runs = data['keys']
+        recording.events = data['events']
+        recording.ticks = data['ticks']
+        recording.final_digest = data['digest']
+        return recording
+
+
+class InputRecorder:
+    """
+    输入录制器
+    由游戏在每个逻辑帧开始时调用record_tick，在升级选择和重新开始时记录事件
+    """
+
+    def __init__(self, seed, mode):
+        """
+        初始化录制器
+        参数:
+            seed: 游戏随机数流的根种子（game.rng.seed）
+            mode: 游戏模式
+        """
+        self.recording = Recording(seed, mode)
+
+    def record_tick(self, keys):
+        """
+        记录一个逻辑帧的按键状态
+        参数:
+            keys: 本帧的按键状态
+        """
+        mask = encode_keys(keys)
+        runs = self.recording.key_runs
+        if runs and runs[-1][0] == mask:
+            runs[-1][1] += 1
+        else:
+            runs.append([mask, 1])
+        self.recording.ticks += 1
+
+    def record_upgrade(self, choice):
+        """
+        记录当前帧的升级选择
+        参数:
+            choice: 选择的升级选项（1/2/3）
+        """
+        # record_tick在帧逻辑之前调用，当前帧序号为已录制帧数-1
+        self.recording.events.append([self.recording.ticks - 1, EVENT_UPGRADE, choice])
+
+    def record_reset(self):
+        """记录重新开始（在下一帧逻辑之前执行）"""
+        self.recording.events.append([self.recording.ticks, EVENT_RESET, None])
+
+    def save(self, game, path):
+        """
+        记录最终状态摘要并保存
+        参数:
+            game: 录制中的游戏对象
+            path: 文件路径
+        """
+        self.recording.final_digest = state_digest(game)
+        self.recording.save(path)
+
+
+def replay(recording):
+    """
+    在无头模式下回放录制，以CPU最快速度逐帧推进
+    参数:
+        recording: Recording对象
+    返回: (回放后的游戏对象, 摘要是否与录制一致)；录制中没有摘要时第二项为None
+    """
+    # 延迟导入，避免与game模块循环引用
+    from game import Game
+    from versus_game import VersusGame
+
+    if recording.mode == VERSUS_MODE:
+        game = VersusGame(headless=True, seed=recording.seed)
+    else:
+        game = Game(headless=True, seed=recording.seed)
+        game.game_mode = recording.mode
+
+    resets = {tick for tick, kind, _ in recording.events if kind == EVENT_RESET}
+    upgrades = iter([value for _, kind, value in recording.events if kind == EVENT_UPGRADE])
+    game.upgrade_policy = lambda score, options: next(upgrades, 1)
+
+    keys = game.input_keys
+    for tick, mask in enumerate(recording.key_masks().tolist()):
+        if tick in resets:
+            game.reset_game()
+        keys.set(decode_keys(mask))
+        game.step()
+    if recording.ticks in resets:
+        game.reset_game()  # 录制在重新开始后立即结束
+
+    if recording.final_digest is None:
+        return game, None
+    return game, state_digest(game) == recording.final_digest
@@ -0,0 +1,205 @@
+"""
+回放缓冲模块
+环形缓冲区保存最近REWIND_SECONDS秒内每个游戏逻辑帧的画面状态（玩家、分数、外星人、子弹、僚机），
+游戏结束后可立即倒退并逐帧查看碰撞前的画面，无需重新运行整局
+
+每REWIND_KEYFRAME_INTERVAL帧保存一个完整帧，其余帧只保存与上一帧的差异：
+各列按上一帧的行数对齐后逐字节异或，未变化的值（血量、颜色、静止的坐标）异或后为零，
+再经zlib压缩，因此内存只随缓冲时长和实体数量增长，与整局长度无关
+"""
+
+import zlib
+from collections import deque
+import numpy as np
+from config import *
+
+# 保存的实体列
+ALIEN_COLUMNS = ('x', 'y', 'health', 'max_health')
+BULLET_COLUMNS = ('x', 'y', 'color')
+
+
+def _columns(game):
+    """
+    取出一帧需要保存的列
+    参数:
+        game: 单人模式Game对象
+    返回: 数组列表（外星人各列、子弹各列、僚机x坐标）
+    """
+    aliens, bullets = game.aliens, game.bullets
+    return ([getattr(aliens, name)[:aliens.count] for name in ALIEN_COLUMNS] +
+            [getattr(bullets, name)[:bullets.count] for name in BULLET_COLUMNS] +
+            [np.array([wingman.x for wingman in game.wingmen], dtype=np.float64)])
+
+
+def _aligned(previous, counts):
+    """
+    把上一帧的各列按本帧的行数对齐后拼接为字节串
+    两帧行数不同时截断多出的行、缺少的行补零（异或后保持本帧原值）
+    参数:
+        previous: 上一帧的各列
+        counts: 本帧各列的行数
+    返回: 与本帧字节串等长的字节串
+    """
+    parts = []
+    for column, rows in zip(previous, counts):
+        kept = column[:rows]
+        parts.append(kept.tobytes())
+        if rows > len(kept):
+            parts.append(bytes((rows - len(kept)) * column.dtype.itemsize))
+    return b''.join(parts)
+
+
+def _xor(data, other):
+    """两个等长字节串逐字节异或"""
+    return np.bitwise_xor(np.frombuffer(data, np.uint8), np.frombuffer(other, np.uint8)).tobytes()
+
+
+class RewindBuffer:
+    """
+    逐帧回放环形缓冲区
+    帧按段保存：每段以一个完整帧开头，后接最多REWIND_KEYFRAME_INTERVAL-1个差异帧；
+    超出容量时整段丢弃最旧的帧，读取任意一帧最多只需解码一个段
+    """
+
+    def __init__(self, seconds=REWIND_SECONDS):
+        """
+        初始化缓冲区
+        参数:
+            seconds: 保存的游戏时长（秒）
+        """
+        self.capacity = int(seconds * FPS)  # 至少保留的帧数
+        self.segments = deque()     # 每段为帧列表，帧为(逻辑帧序号, 分数, 玩家x, 玩家y, 各列行数, 压缩数据)
+        self.frames = 0             # 缓冲区中的帧数
+        self.nbytes = 0             # 压缩数据总字节数
+        self._previous = None       # 上一帧的各列（计算差异用）
+        self._dtypes = None         # 各列的dtype
+        self._cache = None          # 最近一次解码的位置与各列，顺序逐帧查看时从这里继续解码
+
+    def __len__(self):
+        """返回缓冲区中的帧数"""
+        return self.frames
+
+    def clear(self):
+        """清空缓冲区（重新开始游戏时调用）"""
+        self.segments.clear()
+        self.frames = 0
+        self.nbytes = 0
+        self._previous = None
+        self._cache = None
+
+    def record(self, game):
+        """
+        保存当前逻辑帧
+        参数:
+            game: 单人模式Game对象
+        """
+        columns = _columns(game)
+        if self._dtypes is None:
+            self._dtypes = [column.dtype for column in columns]
+        counts = tuple(len(column) for column in columns)
+        raw = b''.join(column.tobytes() for column in columns)
+
+        if not self.segments or len(self.segments[-1]) >= REWIND_KEYFRAME_INTERVAL:
+            stored = raw  # 完整帧
+            self.segments.append([])
+        else:
+            stored = _xor(raw, _aligned(self._previous, counts))
+        data = zlib.compress(stored, REWIND_COMPRESS_LEVEL)
+        player = game.player
+        self.segments[-1].append((game.sim_clock.ticks, game.score, player.x, player.y, counts, data))
+        self._previous = self._split(raw, counts)
+        self.frames += 1
+        self.nbytes += len(data)
+
+        # 丢弃最旧的段（丢弃后仍保留至少capacity帧）
+        while len(self.segments) > 1 and self.frames - len(self.segments[0]) >= self.capacity:
+            oldest = self.segments.popleft()
+            self.frames -= len(oldest)
+            self.nbytes -= sum(len(frame[-1]) for frame in oldest)
+            self._cache = None
+
+    def frame(self, index):
+        """
+        读取一帧
+        参数:
+            index: 帧位置（0为最旧的帧，-1为最新的帧）
+        返回: 字典 {'tick', 'score', 'player': (x, y), 'aliens': {列名: 数组},
+                    'bullets': {列名: 数组}, 'wingmen': x坐标数组}
+        """
+        if index < 0:
+            index += self.frames
+        if not 0 <= index < self.frames:
+            raise IndexError("rewind frame out of range")
+        for segment in self.segments:
+            if index < len(segment):
+                break
+            index -= len(segment)
+
+        # 从同一段中已解码的较早帧继续，否则从段首的完整帧开始
+        cache = self._cache
+        if cache is not None and cache[0] is segment and cache[1] <= index:
+            position, columns = cache[1], cache[2]
+        else:
+            keyframe = segment[0]
+            position, columns = 0, self._split(zlib.decompress(keyframe[-1]), keyframe[4])
+        for position in range(position + 1, index + 1):
+            counts, data = segment[position][4:]
+            columns = self._split(_xor(zlib.decompress(data), _aligned(columns, counts)), counts)
+        self._cache = (segment, index, columns)
+
+        tick, score, player_x, player_y, _, _ = segment[index]
+        aliens = len(ALIEN_COLUMNS)
+        bullets = aliens + len(BULLET_COLUMNS)
+        return {
+            'tick': tick,
+            'score': score,
+            'player': (player_x, player_y),
+            'aliens': dict(zip(ALIEN_COLUMNS, columns[:aliens])),
+            'bullets': dict(zip(BULLET_COLUMNS, columns[aliens:bullets])),
+            'wingmen': columns[bullets],
+        }
+
+    def _split(self, data, counts):
+        """
+        把一帧的字节串拆分为各列
+        参数:
+            data: 各列拼接的字节串
+            counts: 各列的行数
+        返回: 只读数组列表（引用data的内存）
+        """
+        columns = []
+        offset = 0
+        for dtype, rows in zip(self._dtypes, counts):
+            columns.append(np.frombuffer(data, dtype, rows, offset))
+            offset += rows * dtype.itemsize
+        return columns
+
+    def apply(self, game, index):
+        """
+        把一帧的画面状态写入游戏，用于查看（只设置绘制需要的字段，爆炸粒子清空）
+        查看结束后应恢复游戏的完整状态（见Game.rewind_exit）
+        参数:
+            game: 单人模式Game对象
+            index: 帧位置
+        返回: 该帧的字典（见frame）
+        """
+        frame = self.frame(index)
+        game.score = frame['score']
+        player = game.player
+        player.x, player.y = frame['player']
+        player.prev_x, player.prev_y = player.x, player.y
+
+        # 插值用的上一帧坐标设为本帧坐标，画面静止
+        for store, columns, previous in ((game.aliens, frame['aliens'], {'prev_x': 'x', 'prev_y': 'y'}),
+                                         (game.bullets, frame['bullets'], {'prev_y': 'y'})):
+            count = len(columns['x'])
+            store.resize(count)
+            for name, values in columns.items():
+                getattr(store, name)[:count] = values
+            for name, source in previous.items():
+                getattr(store, name)[:count] = columns[source]
+        game.alien_grid.clear()  # 空间哈希不再对应存储中的外星人
+        for wingman, x in zip(game.wingmen, frame['wingmen'].tolist()):
+            wingman.x = wingman.prev_x = x
+        game.particles.clear()
+        return frame
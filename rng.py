@@ -0,0 +1,48 @@
+"""
+随机数流模块
+由一个种子派生出各子系统独立的随机数流，使一局游戏在相同种子和输入下可完全复现
+各子系统互不共享随机数流，某个子系统多取或少取随机数不会影响其他子系统
+"""
+
+import random
+import numpy as np
+
+
+class RandomStreams:
+    """
+    按子系统划分的随机数流
+    Python流（random.Random）用于逐个对象的随机选择，
+    NumPy流（numpy.random.Generator）用于实体存储与粒子系统的批量随机
+    """
+    PYTHON_STREAMS = (
+        'spawn',        # 外星人生成数量与位置
+        'upgrades',     # 升级选项抽取
+        'aliens',       # 已不再使用（原对战模式外星人对象的移动方向）；流按顺序派生，删除会改变之后所有流，
+                        # 使同一种子不再复现原来的对局，因此保留占位
+        'wingmen',      # 僚机移动方向
+        'background',   # 背景矩形布局（只影响画面）
+    )
+    NUMPY_STREAMS = (
+        'alien_store',  # 外星人存储的批量移动方向
+        'particles',    # 爆炸粒子颜色与大小
+    )
+
+    def __init__(self, seed=None):
+        """
+        初始化随机数流
+        参数:
+            seed: 非负整数种子，默认随机生成（可通过seed属性读取，用于录制和复现）
+        """
+        if seed is None:
+            seed = random.SystemRandom().randrange(1 << 63)
+        self.seed = seed  # 根种子
+
+        # 每个子系统从根种子派生一个独立的子序列
+        names = self.PYTHON_STREAMS + self.NUMPY_STREAMS
+        children = np.random.SeedSequence(seed).spawn(len(names))
+        for name, child in zip(names, children):
+            if name in self.PYTHON_STREAMS:
+                stream = random.Random(int(child.generate_state(1, np.uint64)[0]))
+            else:
+                stream = np.random.default_rng(child)
+            setattr(self, name, stream)
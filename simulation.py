@@ -0,0 +1,92 @@
+"""
+模拟支持模块
+提供无头（无窗口）模式下运行游戏逻辑所需的辅助对象，以及固定步长模拟时钟
+"""
+
+from config import SIM_TICK_RATE
+
+
+class KeyState:
+    """
+    按键状态
+    模拟pygame.key.get_pressed()的返回值，供无头模式注入输入
+    """
+    __slots__ = ('pressed',)
+
+    def __init__(self, pressed=()):
+        """
+        初始化按键状态
+        参数:
+            pressed: 初始按下的按键码集合
+        """
+        self.pressed = set(pressed)  # 当前按下的按键码
+
+    def __getitem__(self, key):
+        """
+        查询按键是否按下
+        参数:
+            key: pygame按键码（如pygame.K_LEFT）
+        返回: bool - 按下返回True
+        """
+        return key in self.pressed
+
+    def press(self, key):
+        """按下指定按键"""
+        self.pressed.add(key)
+
+    def release(self, key):
+        """松开指定按键"""
+        self.pressed.discard(key)
+
+    def set(self, keys):
+        """
+        替换当前按下的全部按键
+        参数:
+            keys: 按键码可迭代对象
+        """
+        self.pressed = set(keys)
+
+    def clear(self):
+        """松开所有按键"""
+        self.pressed.clear()
+
+
+class SimulationClock:
+    """
+    固定步长模拟时钟
+    游戏逻辑时间只随模拟帧推进，与真实时间和渲染帧率无关
+    """
+    __slots__ = ('tick_rate', 'ticks')
+
+    def __init__(self, tick_rate=SIM_TICK_RATE):
+        """
+        初始化模拟时钟
+        参数:
+            tick_rate: 每秒逻辑帧数
+        """
+        self.tick_rate = tick_rate  # 每秒逻辑帧数
+        self.ticks = 0              # 已推进的逻辑帧数
+
+    @property
+    def tick_ms(self):
+        """每个逻辑帧的时长（毫秒）"""
+        return 1000 / self.tick_rate
+
+    def now(self):
+        """
+        获取当前模拟时间
+        返回: 整数毫秒，替代pygame.time.get_ticks()
+        """
+        return self.ticks * 1000 // self.tick_rate
+
+    def advance(self, ticks=1):
+        """
+        推进模拟时间
+        参数:
+            ticks: 推进的逻辑帧数
+        """
+        self.ticks += ticks
+
+    def reset(self):
+        """将模拟时间归零"""
+        self.ticks = 0
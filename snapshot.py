@@ -0,0 +1,309 @@
+"""
+游戏快照模块
+把单人模式Game的完整模拟状态（分数与升级状态、计时器、模拟时钟、玩家与僚机、
+外星人/子弹/粒子存储、各随机数流的内部状态、当前按键）保存为紧凑的二进制快照，
+并可在毫秒级时间内恢复，用于快速续玩，以及从同一局面分叉大量假设推演
+
+快照格式: 魔数 + 格式版本 + zlib压缩的(头部JSON长度 + 头部JSON + Python随机数流状态字 + 各实体存储的原始列数据)
+背景效果、性能分析器、录制器等不影响游戏逻辑的状态不保存
+
+用法:
+    python snapshot.py save late.snap --seed 1 --ticks 18000    # 机器人玩到第18000帧后保存
+    python snapshot.py branch late.snap --runs 1000 --ticks 3600  # 从快照分叉1000局假设推演
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import struct
+import sys
+import time
+import zlib
+import numpy as np
+from config import *
+from entities import Wingman
+from game import Game
+from rng import RandomStreams
+
+SNAPSHOT_MAGIC = b'ASNP'
+SNAPSHOT_FORMAT_VERSION = 2
+_PREFIX = struct.Struct('<4sH')     # 魔数、格式版本
+_HEADER_LENGTH = struct.Struct('<I')
+
+# 保存的Game属性（均为可JSON序列化的简单值）
+GAME_FIELDS = (
+    'game_mode', 'score', 'game_over', 'game_won',
+    'show_upgrade_menu', 'available_upgrades', 'last_upgrade_score',
+    'bullet_speed_multiplier', 'max_aliens_multiplier', 'milestone_aliens_multiplier',
+    'alien_health_multiplier', 'last_milestone_score', 'last_health_boost_score',
+    'last_clear_screen_time', 'last_bullet_time', 'last_alien_spawn_time',
+    'last_wingman_bullet_time', 'bullet_color_index',
+)
+# 保存的僚机属性（随机数流另行保存）
+WINGMAN_FIELDS = tuple(name for name in Wingman.__slots__ if name != 'rng')
+# 按顺序保存的实体存储
+STORES = ('aliens', 'bullets', 'particles')
+
+SNAPSHOT_BRANCH_RUNS = 200      # 默认分叉推演局数
+SNAPSHOT_BRANCH_TICKS = FPS * 60  # 默认每局推演的逻辑帧数
+PERCENTILES = (10, 50, 90)
+
+
+class SnapshotError(ValueError):
+    """快照数据无效或格式版本不受支持"""
+
+
+def _random_states(rng):
+    """
+    读取各随机数流的内部状态
+    参数:
+        rng: RandomStreams对象
+    返回: (可JSON序列化的字典, Python流梅森旋转状态字(uint32)的原始字节)
+    """
+    python = {}
+    words = []
+    for name in RandomStreams.PYTHON_STREAMS:
+        version, internal, gauss_next = getattr(rng, name).getstate()
+        python[name] = [version, gauss_next]
+        words.append(internal)
+    numpy = {name: getattr(rng, name).bit_generator.state for name in RandomStreams.NUMPY_STREAMS}
+    return {'python': python, 'numpy': numpy}, np.array(words, dtype=np.uint32).tobytes()
+
+
+def _set_random_states(rng, states, words):
+    """
+    就地恢复各随机数流的内部状态（各子系统持有的流对象引用保持不变）
+    参数:
+        rng: RandomStreams对象
+        states, words: _random_states返回的字典与状态字字节
+    """
+    internal = np.frombuffer(words, np.uint32).reshape(len(RandomStreams.PYTHON_STREAMS), -1)
+    for name, row in zip(RandomStreams.PYTHON_STREAMS, internal.tolist()):
+        version, gauss_next = states['python'][name]
+        getattr(rng, name).setstate((version, tuple(row), gauss_next))
+    for name, state in states['numpy'].items():
+        getattr(rng, name).bit_generator.state = state
+
+
+def capture(game):
+    """
+    保存游戏的完整模拟状态
+    参数:
+        game: 单人模式Game对象
+    返回: 快照字节串
+    """
+    player = game.player
+    random_states, random_words = _random_states(game.rng)
+    header = {
+        'seed': game.rng.seed,
+        'tick_rate': game.sim_clock.tick_rate,
+        'ticks': game.sim_clock.ticks,
+        'game': {name: getattr(game, name) for name in GAME_FIELDS},
+        'player': {name: getattr(player, name) for name in player.__slots__},
+        'wingmen': [[getattr(wingman, name) for name in WINGMAN_FIELDS] for wingman in game.wingmen],
+        'keys': sorted(game.input_keys.pressed) if game.input_keys is not None else [],
+        'rng': random_states,
+        'rng_words': len(random_words),
+        'stores': [getattr(game, name).count for name in STORES],
+    }
+    header_bytes = json.dumps(header, separators=(',', ':')).encode()
+    body = b''.join([_HEADER_LENGTH.pack(len(header_bytes)), header_bytes, random_words] +
+                    [getattr(game, name).tobytes() for name in STORES])
+    return _PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION) + zlib.compress(body, SNAPSHOT_COMPRESS_LEVEL)
+
+
+def restore(data, game=None, reseed=None):
+    """
+    从快照恢复游戏状态
+    参数:
+        data: capture返回的快照字节串
+        game: 恢复到的Game对象，默认新建无头模式Game
+        reseed: 新的随机数种子；给定时恢复局面后换用该种子派生的随机数流，
+                使同一快照分叉出不同的后续，None表示沿用快照中的随机数状态（后续与原局完全一致）
+    返回: Game对象
+    """
+    if len(data) < _PREFIX.size:
+        raise SnapshotError("Snapshot is truncated")
+    magic, version = _PREFIX.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a game snapshot")
+    if version != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version: {version}")
+    try:
+        body = zlib.decompress(memoryview(data)[_PREFIX.size:])
+    except zlib.error as e:
+        raise SnapshotError(f"Corrupt snapshot: {e}") from None
+    (header_length,) = _HEADER_LENGTH.unpack_from(body)
+    offset = _HEADER_LENGTH.size + header_length
+    header = json.loads(body[_HEADER_LENGTH.size:offset])
+    random_words = body[offset:offset + header['rng_words']]
+    offset += header['rng_words']
+
+    if game is None:
+        game = Game(headless=True, seed=header['seed'])
+    game.sim_clock.tick_rate = header['tick_rate']
+    game.sim_clock.ticks = header['ticks']
+    for name, value in header['game'].items():
+        setattr(game, name, value)
+    for name, value in header['player'].items():
+        setattr(game.player, name, value)
+    if game.input_keys is not None:
+        game.input_keys.set(header['keys'])
+
+    # 随机数流：先恢复快照中的状态，需要分叉时再整体换成新种子派生的状态
+    game.rng.seed = header['seed']
+    _set_random_states(game.rng, header['rng'], random_words)
+    if reseed is not None:
+        game.rng.seed = reseed
+        _set_random_states(game.rng, *_random_states(RandomStreams(reseed)))
+
+    game.wingmen = []
+    for values in header['wingmen']:
+        wingman = Wingman.__new__(Wingman)
+        for name, value in zip(WINGMAN_FIELDS, values):
+            setattr(wingman, name, value)
+        wingman.rng = game.rng.wingmen
+        game.wingmen.append(wingman)
+
+    for name, count in zip(STORES, header['stores']):
+        offset = getattr(game, name).frombytes(count, body, offset)
+    game.alien_grid.clear()  # 外星人整体替换，空间哈希在下一次碰撞检测时重建
+
+    if not game.headless:
+        game.renderer.invalidate()  # 画面内容整体改变，下一帧整屏重绘
+    return game
+
+
+def save(game, path):
+    """
+    把游戏快照保存到文件
+    参数:
+        game: 单人模式Game对象
+        path: 文件路径
+    返回: 快照字节数
+    """
+    data = capture(game)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def load(path, game=None, reseed=None):
+    """
+    从文件恢复游戏快照
+    参数:
+        path: 文件路径
+        game/reseed: 见restore
+    返回: Game对象
+    """
+    with open(path, 'rb') as f:
+        return restore(f.read(), game, reseed)
+
+
+# ==================== 分叉推演 ====================
+_branch_snapshot = None  # 工作进程中的快照数据（进程启动时传入一次）
+
+
+def _init_branch_worker(data):
+    """进程池初始化：保存快照数据"""
+    global _branch_snapshot
+    _branch_snapshot = data
+
+
+def _run_branch(task):
+    """
+    从快照恢复并由机器人继续推演一局（工作进程中执行）
+    参数:
+        task: (随机数种子, 帧数上限)
+    返回: (存活帧数, 分数, 是否被撞, 恢复耗时秒)
+    """
+    from bot import AutoPilot  # 延迟导入，只有分叉推演需要
+    seed, max_ticks = task
+    start = time.perf_counter()
+    game = restore(_branch_snapshot, reseed=seed)
+    restore_time = time.perf_counter() - start
+    ticks = AutoPilot(game).run(max_ticks)
+    return ticks, game.score, game.game_over, restore_time
+
+
+def branch(data, runs, ticks, seed=0, workers=None):
+    """
+    从同一快照分叉多局假设推演，每局换用不同的随机数种子，由bot.AutoPilot驾驶
+    参数:
+        data: 快照字节串
+        runs: 推演局数
+        ticks: 每局最多推演的逻辑帧数
+        seed: 根种子，各局种子由它派生
+        workers: 进程数，默认CPU核数
+    返回: 结果列表 [(存活帧数, 分数, 是否被撞, 恢复耗时秒), ...]
+    """
+    seeds = np.random.SeedSequence(seed).generate_state(runs, np.uint64).tolist()
+    workers = workers or os.cpu_count() or 1
+    with mp.Pool(workers, _init_branch_worker, (data,)) as pool:
+        chunksize = max(1, runs // (workers * 8))
+        return pool.map(_run_branch, [(run_seed, ticks) for run_seed in seeds], chunksize)
+
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="Save game snapshots and branch what-if runs from them")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    save_parser = commands.add_parser("save", help="let the autopilot play, then save a snapshot")
+    save_parser.add_argument("path")
+    save_parser.add_argument("--mode", choices=[CLASSIC_MODE, RANDOM_MODE], default=RANDOM_MODE)
+    save_parser.add_argument("--seed", type=int, default=None)
+    save_parser.add_argument("--ticks", type=int, default=FPS * 60 * 5, help="simulated frames before saving")
+
+    branch_parser = commands.add_parser("branch", help="branch autopilot runs from a snapshot with fresh seeds")
+    branch_parser.add_argument("path")
+    branch_parser.add_argument("--runs", type=int, default=SNAPSHOT_BRANCH_RUNS)
+    branch_parser.add_argument("--ticks", type=int, default=SNAPSHOT_BRANCH_TICKS,
+                               help="maximum simulated frames per branch")
+    branch_parser.add_argument("--seed", type=int, default=0, help="root seed for the branch seeds")
+    branch_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """保存快照或进行分叉推演"""
+    args = parse_args(argv)
+    if args.command == "save":
+        from bot import AutoPilot
+        game = Game(headless=True, seed=args.seed)
+        game.game_mode = args.mode
+        ticks = AutoPilot(game).run(args.ticks)
+        start = time.perf_counter()
+        size = save(game, args.path)
+        elapsed = time.perf_counter() - start
+        print(f"{args.mode} (seed {game.rng.seed}): saved tick {ticks} to {args.path} - {size} bytes "
+              f"in {elapsed * 1000:.2f} ms, {len(game.aliens)} aliens, {len(game.bullets)} bullets, "
+              f"{len(game.particles)} particles, score {game.score}, game over {game.game_over}")
+        return 0
+
+    try:
+        with open(args.path, 'rb') as f:
+            data = f.read()
+        base = restore(data)
+    except (OSError, SnapshotError) as e:
+        print(e)
+        return 2
+    start = time.perf_counter()
+    results = branch(data, args.runs, args.ticks, args.seed, args.workers)
+    elapsed = time.perf_counter() - start
+
+    seconds = np.array([result[0] for result in results]) / FPS
+    scores = np.array([result[1] for result in results])
+    deaths = np.array([result[2] for result in results])
+    restores = np.array([result[3] for result in results]) * 1000
+    print(f"{args.runs} branches from tick {base.sim_clock.ticks} (score {base.score}) in {elapsed:.1f}s, "
+          f"restore {restores.mean():.2f} ms mean")
+    print(f"survived {1 - deaths.mean():.0%} of {args.ticks / FPS:.0f}s, survival p10/p50/p90 "
+          + "/".join(f"{v:.0f}" for v in np.percentile(seconds, PERCENTILES)) + "s, score p10/p50/p90 "
+          + "/".join(f"{v:.0f}" for v in np.percentile(scores, PERCENTILES)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+空间哈希模块
+使用均匀网格加速碰撞检测的粗筛阶段
+"""
+
+import numpy as np
+from config import ALIEN_SIZE
+
+# 格子坐标编码：key = (格子y + 偏移) * 步长 + (格子x + 偏移)，允许负格子坐标
+_CELL_OFFSET = 1 << 20
+_CELL_STRIDE = 1 << 21
+
+# 3x3邻域的格子偏移
+_NEIGHBOUR_DX = np.array([-1, 0, 1, -1, 0, 1, -1, 0, 1], dtype=np.int64)
+_NEIGHBOUR_DY = np.array([-1, -1, -1, 0, 0, 0, 1, 1, 1], dtype=np.int64)
+
+
+def _cell_keys(cx, cy):
+    """把格子坐标编码为单个整数键"""
+    return (cy + _CELL_OFFSET) * _CELL_STRIDE + (cx + _CELL_OFFSET)
+
+
+class SpatialHash:
+    """
+    均匀网格空间哈希
+    每个对象按左上角所在格子登记一次，格子键排序后存放在数组中，
+    查询时只检查目标矩形所在格子及其相邻格子
+    要求登记对象和查询矩形的宽高都不超过格子边长（外星人与格子同为ALIEN_SIZE）
+    """
+
+    def __init__(self, cell_size=ALIEN_SIZE):
+        """
+        初始化空间哈希
+        参数:
+            cell_size: 格子边长（像素），不小于登记对象的尺寸
+        """
+        self.cell_size = cell_size
+        self.order = np.empty(0, dtype=np.int64)        # 按格子键排序后的对象索引
+        self.sorted_keys = np.empty(0, dtype=np.int64)  # 排序后的格子键
+
+    def __len__(self):
+        """返回登记的对象数量"""
+        return len(self.order)
+
+    def clear(self):
+        """移除所有对象"""
+        self.order = self.order[:0]
+        self.sorted_keys = self.sorted_keys[:0]
+
+    def rebuild(self, xs, ys):
+        """
+        根据对象左上角坐标重建网格
+        参数:
+            xs, ys: 整数坐标数组，下标即对象在原列表中的位置
+        """
+        keys = _cell_keys(xs // self.cell_size, ys // self.cell_size)
+        self.order = np.argsort(keys, kind='stable')
+        self.sorted_keys = keys[self.order]
+
+    def discard(self, keep):
+        """
+        按掩码移除对象，剩余对象的索引改为按原顺序压缩后的位置（与EntityStore.compact一致）
+        格子键的顺序不变，无需重新排序；结果与用压缩后的坐标重建相同
+        参数:
+            keep: 长度为登记对象数量的布尔数组，True表示保留
+        """
+        kept = keep[self.order]
+        new_index = np.cumsum(keep) - 1
+        self.order = new_index[self.order[kept]]
+        self.sorted_keys = self.sorted_keys[kept]
+
+    def query(self, x, y, width, height):
+        """
+        查询可能与矩形相交的对象
+        参数:
+            x, y: 查询矩形左上角整数坐标
+            width, height: 查询矩形宽高
+        返回: 候选对象索引列表（按原列表顺序升序排列）
+        """
+        cell_size = self.cell_size
+        # 对象不大于格子，与矩形相交的对象左上角只可能落在矩形覆盖范围及其左、上一格内
+        cxs = np.arange(x // cell_size - 1, (x + width - 1) // cell_size + 1)
+        cys = np.arange(y // cell_size - 1, (y + height - 1) // cell_size + 1)
+        keys = _cell_keys(cxs[None, :], cys[:, None]).ravel()
+        lo = np.searchsorted(self.sorted_keys, keys, 'left')
+        hi = np.searchsorted(self.sorted_keys, keys, 'right')
+        candidates = [self.order[start:end] for start, end in zip(lo.tolist(), hi.tolist()) if end > start]
+        if not candidates:
+            return []
+        return np.sort(np.concatenate(candidates)).tolist()
+
+    def bottom_row(self):
+        """
+        查询最下方一行格子中的对象
+        格子键按(格子y, 格子x)编码，排序后最下方一行位于数组末尾，只需一次二分查找
+        返回: 对象索引数组（未排序），网格为空时为空数组
+        """
+        if len(self.sorted_keys) == 0:
+            return self.order
+        row_start = self.sorted_keys[-1] // _CELL_STRIDE * _CELL_STRIDE
+        return self.order[np.searchsorted(self.sorted_keys, row_start, 'left'):]
+
+    def candidate_pairs(self, xs, ys):
+        """
+        批量查询候选对
+        对每个查询矩形（宽高不超过格子边长）检查其左上角所在格子的3x3邻域
+        参数:
+            xs, ys: 查询矩形左上角整数坐标数组
+        返回: (查询索引数组, 对象索引数组)，未排序
+        """
+        if len(xs) == 0 or len(self.sorted_keys) == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        # 每个查询的9个邻域格子键
+        cx = (xs // self.cell_size)[:, None] + _NEIGHBOUR_DX
+        cy = (ys // self.cell_size)[:, None] + _NEIGHBOUR_DY
+        keys = _cell_keys(cx, cy).ravel()
+        lo = np.searchsorted(self.sorted_keys, keys, 'left')
+        hi = np.searchsorted(self.sorted_keys, keys, 'right')
+        counts = hi - lo
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        # 把每个格子的[lo, hi)区间展开为扁平的候选列表
+        query_index = np.repeat(np.arange(len(xs)).repeat(len(_NEIGHBOUR_DX)), counts)
+        run_starts = np.cumsum(counts) - counts
+        positions = np.repeat(lo - run_starts, counts) + np.arange(total)
+        return query_index, self.order[positions]
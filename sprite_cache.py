@@ -0,0 +1,89 @@
+"""
+精灵缓存模块
+按(类型, 颜色, 尺寸)缓存预先绘制好的Surface，绘制实体时只需blit，
+同类实体用一次Surface.blits批量绘制
+"""
+
+import math
+import pygame
+from config import GREEN, WHITE
+
+# 精灵类型
+RECT = "rect"       # 实心矩形，尺寸为(宽, 高)
+CIRCLE = "circle"   # 实心圆，尺寸为半径
+STAR = "star"       # 带白色边框的五角星，尺寸为外接正方形边长
+
+HEALTH_BAR_HEIGHT = 3   # 外星人血量条高度
+HEALTH_BAR_OFFSET = 5   # 血量条位于外星人上方的距离
+
+_cache = {}  # (类型, 颜色, 尺寸) -> Surface
+
+
+def _render_rect(color, size):
+    """绘制实心矩形精灵"""
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+def _render_circle(color, radius):
+    """绘制实心圆精灵（透明背景）"""
+    surface = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    return surface
+
+
+def _render_star(color, size):
+    """绘制五角星精灵（透明背景，白色边框）"""
+    surface = pygame.Surface((size + 1, size + 1), pygame.SRCALPHA)
+    center = size // 2
+    radius = size // 2
+    points = []
+    for i in range(10):  # 10个点（5个外点 + 5个内点）
+        angle = (i * math.pi) / 5 - math.pi / 2
+        r = radius if i % 2 == 0 else radius * 0.5
+        points.append((int(center + r * math.cos(angle)), int(center + r * math.sin(angle))))
+    pygame.draw.polygon(surface, color, points)
+    pygame.draw.polygon(surface, WHITE, points, 1)  # 白色边框
+    return surface
+
+
+_RENDERERS = {
+    RECT: _render_rect,
+    CIRCLE: _render_circle,
+    STAR: _render_star,
+}
+
+
+def get_sprite(kind, color, size):
+    """
+    获取精灵Surface（首次请求时绘制并缓存）
+    参数:
+        kind: 精灵类型（RECT、CIRCLE或STAR）
+        color: RGB颜色元组
+        size: 尺寸（RECT为(宽, 高)，CIRCLE为半径，STAR为边长）
+    返回: pygame.Surface
+    """
+    key = (kind, color, size)
+    sprite = _cache.get(key)
+    if sprite is None:
+        sprite = _RENDERERS[kind](color, size)
+        _cache[key] = sprite
+    return sprite
+
+
+def health_bar_sprite(width):
+    """
+    获取外星人血量条精灵
+    参数:
+        width: 血量条长度（整数像素，调用方按血量比例量化）
+    返回: pygame.Surface，长度<=0时返回None
+    """
+    if width <= 0:
+        return None
+    return get_sprite(RECT, GREEN, (width, HEALTH_BAR_HEIGHT))
+
+
+def clear_cache():
+    """清空精灵缓存（如显示模式改变后）"""
+    _cache.clear()
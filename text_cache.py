@@ -0,0 +1,50 @@
+"""
+文字缓存模块
+缓存font.render生成的文字Surface，文字内容不变时直接复用，按最近最少使用（LRU）淘汰
+"""
+
+from collections import OrderedDict
+from config import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """
+    文字渲染缓存
+    以(字体, 文字, 颜色, 抗锯齿)为键缓存渲染结果，
+    分数等频繁变化的文字会产生很多旧条目，超出容量时淘汰最久未使用的条目
+    """
+
+    def __init__(self, max_size=TEXT_CACHE_SIZE):
+        """
+        初始化文字缓存
+        参数:
+            max_size: 最多缓存的文字Surface数量
+        """
+        self.max_size = max_size
+        self.entries = OrderedDict()  # 键 -> Surface，按使用时间排序（最近使用的在末尾）
+
+    def render(self, font, text, color, antialias=True):
+        """
+        渲染文字（命中缓存时直接返回已渲染的Surface）
+        参数:
+            font: pygame字体对象
+            text: 文字内容
+            color: 文字颜色
+            antialias: 是否抗锯齿
+        返回: pygame.Surface
+        """
+        key = (font, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            return surface
+
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)  # 淘汰最久未使用的条目
+        return surface
+
+    def clear(self):
+        """清空缓存"""
+        self.entries.clear()
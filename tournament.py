@@ -0,0 +1,450 @@
+"""
+多人锦标赛模块
+4-8名玩家在同一台机器上同时游戏：屏幕按网格划分为各玩家的区域（每行最多TOURNAMENT_MAX_COLUMNS个），
+每个区域有自己的外星人生成计时、分数和淘汰状态；所有区域由一个ArenaEngine批量更新、批量绘制
+
+外星人越过某个区域底部或碰到该区域的玩家时该玩家被淘汰；
+先达到TOURNAMENT_WIN_SCORE分或最后一个未被淘汰的玩家获胜
+
+控制: 前四名玩家使用键盘（WASD、方向键、IJKL、小键盘8456），连接的手柄按顺序控制各区域的玩家
+
+用法:
+    python main.py --players 8                              # 8人锦标赛
+    python main.py --players 6 --headless --ticks 36000     # 无头模式运行
+"""
+
+import pygame
+import sys
+from config import *
+from arena import ArenaEngine, key_direction
+from background import BackgroundManager
+from text_cache import TextCache
+from dirty_rect import DirtyRectRenderer
+from simulation import KeyState, SimulationClock
+from rng import RandomStreams
+from profiler import FrameProfiler
+
+# 键盘玩家的方向键（左、右、上、下），顺序与区域编号一致
+TOURNAMENT_CONTROLS = (
+    (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s),               # 玩家1: WASD
+    (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN),    # 玩家2: 方向键
+    (pygame.K_j, pygame.K_l, pygame.K_i, pygame.K_k),               # 玩家3: IJKL
+    (pygame.K_KP4, pygame.K_KP6, pygame.K_KP8, pygame.K_KP5),       # 玩家4: 小键盘8456
+)
+
+
+def grid_layout(players, width=TOURNAMENT_SCREEN_WIDTH, height=TOURNAMENT_SCREEN_HEIGHT):
+    """
+    把屏幕按网格均分为各玩家的区域
+    参数:
+        players: 玩家数量
+        width/height: 屏幕尺寸
+    返回: 各区域矩形 [(左, 上, 右, 下), ...]，按行优先排列
+    """
+    rows = -(-players // TOURNAMENT_MAX_COLUMNS)
+    columns = -(-players // rows)
+    arena_width = width // columns
+    arena_height = height // rows
+    bounds = []
+    for index in range(players):
+        row, column = divmod(index, columns)
+        left, top = column * arena_width, row * arena_height
+        bounds.append((left, top, left + arena_width, top + arena_height))
+    return bounds
+
+
+def joystick_direction(joystick):
+    """
+    读取手柄的移动方向（优先使用方向键帽，其次左摇杆）
+    参数:
+        joystick: pygame.joystick.Joystick对象
+    返回: (dx, dy)
+    """
+    if joystick.get_numhats():
+        hat_x, hat_y = joystick.get_hat(0)
+        if hat_x or hat_y:
+            return hat_x, -hat_y  # 方向键帽向上为正
+    if joystick.get_numaxes() < 2:
+        return 0, 0
+    direction = []
+    for axis in (0, 1):
+        value = joystick.get_axis(axis)
+        direction.append(0 if abs(value) < TOURNAMENT_JOYSTICK_DEADZONE else (1 if value > 0 else -1))
+    return tuple(direction)
+
+
+class TournamentGame:
+    """
+    多人锦标赛游戏类
+    管理锦标赛模式的游戏逻辑、状态和渲染；各玩家的区域是ArenaEngine的区域
+    """
+
+    def __init__(self, players=TOURNAMENT_MAX_PLAYERS, headless=False, sim_clock=None, seed=None):
+        """
+        初始化锦标赛
+        参数:
+            players: 玩家数量（TOURNAMENT_MIN_PLAYERS到TOURNAMENT_MAX_PLAYERS）
+            headless: 是否以无头模式运行（不创建窗口、不绘制、不限帧率）
+            sim_clock: 注入的模拟时钟，默认新建SimulationClock
+            seed: 随机数种子，默认随机生成；相同种子和输入下游戏过程完全一致
+        """
+        if not TOURNAMENT_MIN_PLAYERS <= players <= TOURNAMENT_MAX_PLAYERS:
+            raise ValueError(f"A tournament needs {TOURNAMENT_MIN_PLAYERS}-{TOURNAMENT_MAX_PLAYERS} players, "
+                             f"got {players}")
+        self.players = players
+        self.bounds = grid_layout(players)  # 各玩家的区域
+        self.headless = headless
+        self.sim_clock = sim_clock if sim_clock is not None else SimulationClock()  # 逻辑时间
+        self.rng = RandomStreams(seed)  # 各子系统的随机数流
+        self.time_scale = SIM_TIME_SCALE  # 窗口模式下的模拟速度倍数
+
+        if headless:
+            # 无头模式：不初始化显示，输入由外部注入
+            self.screen = None
+            self.clock = None
+            self.input_keys = KeyState()
+            self.profiler = None
+            self.joysticks = []
+        else:
+            # 初始化pygame
+            pygame.init()
+
+            # 创建锦标赛屏幕
+            self.screen = pygame.display.set_mode((TOURNAMENT_SCREEN_WIDTH, TOURNAMENT_SCREEN_HEIGHT))
+            pygame.display.set_caption(f"{GAME_TITLE} - Tournament ({players} players)")
+
+            # 初始化字体
+            self.font = pygame.font.Font(None, FONT_SIZE)
+            self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
+            self.text_cache = TextCache()  # HUD文字缓存
+            self.renderer = DirtyRectRenderer(self.screen)  # 脏矩形渲染器
+
+            # 初始化渲染时钟
+            self.clock = pygame.time.Clock()
+            self.input_keys = None  # 注入的按键状态，None表示读取键盘
+            self.profiler = FrameProfiler()  # 帧性能分析（F3显示叠加图），None表示不统计
+
+            # 已连接的手柄，第i个手柄控制第i名玩家
+            pygame.joystick.init()
+            self.joysticks = [pygame.joystick.Joystick(i) for i in range(pygame.joystick.get_count())]
+
+        # 初始化游戏对象
+        self._init_game_objects()
+
+        # 初始化游戏状态
+        self._init_game_state()
+
+        # 初始化背景管理器（无头模式没有背景）
+        if headless:
+            self.background_manager = None
+        else:
+            self.background_manager = BackgroundManager(TOURNAMENT_SCREEN_WIDTH, TOURNAMENT_SCREEN_HEIGHT,
+                                                        self.rng.background)
+
+    def _init_game_objects(self):
+        """初始化游戏对象"""
+        # 区域上下相邻，绘制时裁剪，刚生成的外星人不会画到上方的区域中
+        self.engine = ArenaEngine(self.bounds, self.rng, clamp_aliens=True, clip=True)
+        self.aliens = self.engine.aliens        # 所有区域的外星人（arena列区分区域）
+        self.bullets = self.engine.bullets      # 所有玩家的子弹
+        self.particles = self.engine.particles  # 所有区域共用的爆炸粒子系统
+        self.alien_grid = self.engine.grid      # 外星人空间哈希（碰撞粗筛）
+
+        # 错开各区域的生成计时，避免所有区域在同一帧生成外星人
+        for arena in self.engine.arenas:
+            arena.last_alien_spawn_time = -(arena.index * ALIEN_SPAWN_INTERVAL // self.players)
+
+    def _init_game_state(self):
+        """初始化游戏状态"""
+        self.game_over = False  # 游戏结束标志
+        self.winner = None      # 获胜者（玩家编号，从1开始）
+        self.eliminated = []    # 按淘汰先后排列的区域编号
+
+    @property
+    def scores(self):
+        """各玩家的分数列表"""
+        return [arena.score for arena in self.engine.arenas]
+
+    def get_time(self):
+        """
+        获取当前游戏时间（毫秒）
+        由模拟时钟按已推进的逻辑帧换算，与真实时间无关
+        """
+        return self.sim_clock.now()
+
+    def get_pressed_keys(self):
+        """
+        获取当前按键状态
+        有注入的KeyState时（无头模式或基准测试）返回它，否则读取键盘
+        """
+        if self.input_keys is not None:
+            return self.input_keys
+        return pygame.key.get_pressed()
+
+    def handle_input(self):
+        """
+        处理所有玩家的输入
+        键盘玩家按TOURNAMENT_CONTROLS，没有按键时读取对应的手柄；已淘汰的玩家不再移动
+        """
+        keys = self.get_pressed_keys()
+        for arena in self.engine.arenas:
+            index = arena.index
+            dx = dy = 0
+            if arena.active:
+                if index < len(TOURNAMENT_CONTROLS):
+                    dx, dy = key_direction(keys, *TOURNAMENT_CONTROLS[index])
+                if not (dx or dy) and index < len(self.joysticks):
+                    dx, dy = joystick_direction(self.joysticks[index])
+            self.engine.move_player(index, dx, dy)  # 限制在本区域内
+
+    def spawn_aliens(self):
+        """未淘汰的区域按各自的计时器生成外星人"""
+        self.engine.spawn_aliens(self.get_time())
+
+    def spawn_bullets(self):
+        """未淘汰的玩家各自按射击计时器发射子弹"""
+        self.engine.spawn_bullets(self.get_time())
+
+    def update_bullets(self):
+        """更新所有子弹的位置，移除飞出所在区域上方的子弹"""
+        self.engine.update_bullets()
+
+    def update_aliens(self):
+        """更新所有外星人的位置，外星人越过某个区域底部则该区域的玩家被淘汰"""
+        self.eliminate(self.engine.update_aliens())
+
+    def update_explosions(self):
+        """更新所有爆炸特效，已结束的爆炸粒子整体剔除"""
+        self.particles.update()
+
+    def eliminate(self, indices):
+        """
+        淘汰玩家：该区域停止生成外星人和射击，剩余的外星人继续下落直到离开区域
+        参数:
+            indices: 区域编号列表（已淘汰的区域忽略）
+        """
+        for index in indices:
+            arena = self.engine.arenas[index]
+            if arena.active:
+                arena.active = False
+                self.eliminated.append(index)
+
+    def placement(self, index):
+        """
+        已淘汰玩家的名次
+        参数:
+            index: 区域编号
+        返回: 名次（最先淘汰的为最后一名）
+        """
+        return self.players - self.eliminated.index(index)
+
+    def check_collisions(self):
+        """检查所有碰撞事件与胜负"""
+        # 子弹击中本区域的外星人，击杀分数计入该区域的玩家
+        self.engine.resolve_hits()
+
+        # 玩家与本区域的外星人碰撞
+        out_before = len(self.eliminated)
+        self.eliminate(self.engine.player_hits())
+
+        # 检查胜利条件：达到胜利分数，或只剩一名玩家
+        arenas = self.engine.arenas
+        alive = [arena for arena in arenas if arena.active]
+        leaders = [arena for arena in alive if arena.score >= TOURNAMENT_WIN_SCORE]
+        if leaders:
+            winner = max(leaders, key=lambda arena: arena.score)
+        elif len(alive) == 1:
+            winner = alive[0]
+        elif not alive:
+            # 最后几名玩家在同一帧被淘汰：分数最高者获胜
+            last = [arenas[index] for index in self.eliminated[out_before:]] or arenas
+            winner = max(last, key=lambda arena: arena.score)
+        else:
+            return
+        self.game_over = True
+        self.winner = winner.index + 1
+
+    def standings(self):
+        """
+        当前排名
+        返回: 区域编号列表（获胜者在前，其余未淘汰的按分数，已淘汰的按淘汰先后倒序）
+        """
+        arenas = self.engine.arenas
+        alive = sorted((arena.index for arena in arenas if arena.active),
+                       key=lambda index: -arenas[index].score)
+        order = alive + [index for index in reversed(self.eliminated) if index not in alive]
+        if self.winner is not None:
+            order.remove(self.winner - 1)
+            order.insert(0, self.winner - 1)
+        return order
+
+    def draw(self, alpha=1.0):
+        """
+        绘制游戏画面
+        参数:
+            alpha: 逻辑帧间插值系数（0为上一逻辑帧，1为当前逻辑帧）
+        """
+        # 擦除上一帧绘制的区域（脏矩形渲染）
+        renderer = self.renderer
+        renderer.begin_frame()
+
+        # 绘制区域分割线（静态内容不登记脏矩形）
+        for left, top, right, bottom in self.bounds:
+            if left:
+                pygame.draw.line(self.screen, BLACK, (left, top), (left, bottom), 3)
+            if top:
+                pygame.draw.line(self.screen, BLACK, (left, top), (right, top), 3)
+
+        # 绘制背景效果
+        renderer.add_all(self.background_manager.draw(self.screen))
+
+        # 绘制所有区域的玩家、外星人和子弹（每个区域裁剪在区域内）
+        renderer.add_all(self.engine.draw(self.screen, alpha))
+
+        # 绘制爆炸特效
+        renderer.add_all(self.particles.draw(self.screen, alpha))
+
+        # 绘制UI
+        self._draw_ui()
+
+        # 性能叠加图（右上角，第一行区域的分数下方）
+        profiler = self.profiler
+        if profiler is not None:
+            if profiler.show_overlay:
+                overlay = profiler.overlay()
+                renderer.blit(overlay, (TOURNAMENT_SCREEN_WIDTH - overlay.get_width() - 10, 40))
+            profiler.lap('draw')
+
+        # 只更新上一帧与本帧绘制过的区域
+        renderer.present()
+
+    def _draw_ui(self):
+        """绘制用户界面"""
+        for arena in self.engine.arenas:
+            left, top, right, bottom = arena.bounds
+
+            # 各区域左上角显示玩家编号和分数
+            color = BLUE if arena.active else LIGHT_GRAY
+            score_text = self.text_cache.render(self.small_font, f"P{arena.index + 1}: {arena.score}", color)
+            self.renderer.blit(score_text, (left + 8, top + 8))
+
+            # 已淘汰的区域中央显示名次
+            if not arena.active:
+                out_text = self.text_cache.render(self.font, TOURNAMENT_OUT_TEXT.format(self.placement(arena.index)), RED)
+                self.renderer.blit(out_text, out_text.get_rect(center=((left + right) // 2, (top + bottom) // 2)))
+
+        # 绘制游戏结束信息
+        if self.game_over:
+            center = (TOURNAMENT_SCREEN_WIDTH // 2, TOURNAMENT_SCREEN_HEIGHT // 2)
+            win_surface = self.text_cache.render(self.font, f"Player {self.winner} Wins!", GREEN)
+            self.renderer.blit(win_surface, win_surface.get_rect(center=center))
+
+            restart_text = self.text_cache.render(self.small_font, "Press R to restart", GREEN)
+            self.renderer.blit(restart_text, restart_text.get_rect(center=(center[0], center[1] + 40)))
+
+    def reset_game(self):
+        """重置游戏到初始状态"""
+        # 重新初始化游戏对象（分数、计时器和淘汰状态随区域一起重置）
+        self._init_game_objects()
+
+        # 重置游戏状态
+        self._init_game_state()
+
+        # 重置背景效果
+        if self.background_manager is not None:
+            self.background_manager.reset()
+
+    def step(self):
+        """
+        推进一帧游戏逻辑
+        不处理窗口事件、不绘制，供主循环和无头模式共用
+        """
+        profiler = self.profiler
+
+        if self.background_manager is not None:
+            self.background_manager.update()
+        self.update_explosions()
+        if profiler is not None:
+            profiler.lap('update')
+
+        if not self.game_over:
+            self.handle_input()
+            if profiler is not None:
+                profiler.lap('input')
+            self.spawn_aliens()
+            self.spawn_bullets()
+            if profiler is not None:
+                profiler.lap('spawn')
+            self.update_bullets()
+            self.update_aliens()
+            if profiler is not None:
+                profiler.lap('update')
+            self.check_collisions()
+            if profiler is not None:
+                profiler.lap('collisions')
+
+        # 推进模拟时间
+        self.sim_clock.advance()
+
+    def run_headless(self, max_ticks):
+        """
+        无头模式主循环
+        不绘制、不限帧率，以CPU允许的最快速度推进游戏逻辑
+        参数:
+            max_ticks: 最多模拟的帧数
+        返回: 实际模拟的帧数（分出胜负时提前停止）
+        """
+        ticks = 0
+        while ticks < max_ticks and not self.game_over:
+            self.step()
+            ticks += 1
+        return ticks
+
+    def run(self):
+        """游戏主循环"""
+        running = True
+        tick_ms = self.sim_clock.tick_ms  # 每个逻辑帧的时长
+        accumulator = 0.0  # 尚未模拟的真实时间（毫秒）
+        profiler = self.profiler  # 帧性能分析（None表示不统计）
+        if profiler is not None:
+            profiler.start_frame()
+
+        while running:
+            # 帧率控制：按流逝的真实时间推进固定步长逻辑帧
+            frame_ms = self.clock.tick(RENDER_FPS)
+            accumulator += min(frame_ms, MAX_FRAME_TIME) * self.time_scale
+            if profiler is not None:
+                profiler.lap('tick')
+
+            # 事件处理
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_r and self.game_over:
+                        self.reset_game()
+                    elif event.key == pygame.K_ESCAPE:
+                        running = False
+                    elif event.key == pygame.K_F3 and profiler is not None:
+                        # F3切换性能叠加图
+                        profiler.show_overlay = not profiler.show_overlay
+            if profiler is not None:
+                profiler.lap('input')
+
+            # 游戏逻辑更新
+            while accumulator >= tick_ms:
+                self.step()
+                accumulator -= tick_ms
+
+            # 绘制画面（游戏结束后画面静止）
+            alpha = 1.0 if self.game_over else accumulator / tick_ms
+            self.draw(alpha)
+            if profiler is not None:
+                profiler.lap('flip')
+                profiler.end_frame(self)
+
+        # 游戏退出
+        if profiler is not None:
+            profiler.close()
+        pygame.quit()
+        sys.exit()
@@ -11,6 +11,8 @@ class UpgradeWindow:
     """
     升级选择窗口
     在主游戏窗口中显示覆盖层，避免多线程问题
+    覆盖层和窗口中的静态内容只绘制一次；每次升级时把游戏画面、覆盖层和升级面板合成为一张图，
+    等待选择期间不再重绘
     """
 
     def __init__(self, screen, font):
@@ -25,6 +27,17 @@ class UpgradeWindow:
         self.large_font = pygame.font.Font(None, UPGRADE_WINDOW_FONT_SIZE + 8)
         self.small_font = pygame.font.Font(None, UPGRADE_WINDOW_FONT_SIZE - 4)
 
+        # 升级窗口位置（屏幕中央）
+        self.window_rect = pygame.Rect((SCREEN_WIDTH - UPGRADE_WINDOW_WIDTH) // 2,
+                                       (SCREEN_HEIGHT - UPGRADE_WINDOW_HEIGHT) // 2,
+                                       UPGRADE_WINDOW_WIDTH, UPGRADE_WINDOW_HEIGHT)
+
+        # 半透明覆盖层与窗口静态内容（只创建一次）
+        self.overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.overlay.set_alpha(220)
+        self.overlay.fill(BLACK)
+        self.panel = self._create_panel()
+
     def show_upgrade_selection(self, current_score, available_upgrades):
         """
         显示升级选择界面
@@ -33,60 +46,78 @@ class UpgradeWindow:
             available_upgrades: 可用的升级选项列表
         返回: 选择的升级选项 (1, 2, 或 3)
         """
-        clock = pygame.time.Clock()
+        # 合成一次升级画面并显示，等待期间只在窗口需要重绘时重新提交
+        frame = self._compose_frame(current_score, available_upgrades)
+        self.screen.blit(frame, (0, 0))
+        pygame.display.flip()
 
         while True:
-            # 处理事件
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    return 1  # 默认选择第一个选项
-                elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_1:
-                        return 1
-                    elif event.key == pygame.K_2:
-                        return 2
-                    elif event.key == pygame.K_3:
-                        return 3
-                    elif event.key == pygame.K_ESCAPE:
-                        return 1
-
-            # 绘制升级界面（覆盖在游戏画面上）
-            self._draw_upgrade_overlay(current_score, available_upgrades)
-            pygame.display.flip()
-            clock.tick(60)
-    
-    def _draw_upgrade_overlay(self, current_score, available_upgrades):
+            # 阻塞等待事件，不占用CPU
+            event = pygame.event.wait(MENU_IDLE_TIMEOUT)
+            if event.type == pygame.QUIT:
+                return 1  # 默认选择第一个选项
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_1:
+                    return 1
+                elif event.key == pygame.K_2:
+                    return 2
+                elif event.key == pygame.K_3:
+                    return 3
+                elif event.key == pygame.K_ESCAPE:
+                    return 1
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                # 窗口被遮挡后恢复，重新提交合成好的画面
+                self.screen.blit(frame, (0, 0))
+                pygame.display.flip()
+
+    def _create_panel(self):
         """
-        绘制升级选择覆盖层
+        绘制升级窗口中不随升级选项变化的内容（背景、边框、标题和操作说明）
+        返回: 窗口大小的Surface
         """
-        # 创建半透明覆盖层
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-        overlay.set_alpha(220)
-        overlay.fill(BLACK)
-        self.screen.blit(overlay, (0, 0))
+        panel = pygame.Surface(self.window_rect.size)
+        panel.fill(BLACK)
+        pygame.draw.rect(panel, WHITE, panel.get_rect(), 3)
 
-        # 计算升级窗口位置（屏幕中央）
-        window_x = (SCREEN_WIDTH - UPGRADE_WINDOW_WIDTH) // 2
-        window_y = (SCREEN_HEIGHT - UPGRADE_WINDOW_HEIGHT) // 2
+        # 文本位置（相对于窗口左上角）
+        center_x = UPGRADE_WINDOW_WIDTH // 2
+        start_y = 30
 
-        # 绘制升级窗口背景
-        window_rect = pygame.Rect(window_x, window_y, UPGRADE_WINDOW_WIDTH, UPGRADE_WINDOW_HEIGHT)
-        pygame.draw.rect(self.screen, BLACK, window_rect)
-        pygame.draw.rect(self.screen, WHITE, window_rect, 3)
+        # 绘制升级标题
+        title_text = self.large_font.render("Choose Upgrade", True, YELLOW)
+        title_rect = title_text.get_rect(center=(center_x, start_y + 40))
+        panel.blit(title_text, title_rect)
+
+        # 绘制操作说明
+        instruction_text = self.small_font.render("Press 1, 2, or 3 to choose", True, GREEN)
+        instruction_rect = instruction_text.get_rect(center=(center_x, UPGRADE_WINDOW_HEIGHT - 50))
+        panel.blit(instruction_text, instruction_rect)
+
+        # 绘制ESC提示
+        esc_text = self.small_font.render("ESC: Default choice", True, LIGHT_GRAY)
+        esc_rect = esc_text.get_rect(center=(center_x, UPGRADE_WINDOW_HEIGHT - 25))
+        panel.blit(esc_text, esc_rect)
+        return panel
+
+    def _compose_frame(self, current_score, available_upgrades):
+        """
+        合成升级选择画面：当前游戏画面 + 半透明覆盖层 + 升级窗口
+        参数:
+            current_score: 当前分数
+            available_upgrades: 可用的升级选项列表
+        返回: 屏幕大小的Surface
+        """
+        frame = self.screen.copy()
+        frame.blit(self.overlay, (0, 0))
 
-        # 计算文本位置
-        center_x = window_x + UPGRADE_WINDOW_WIDTH // 2
-        start_y = window_y + 30
+        panel = self.panel.copy()
+        center_x = UPGRADE_WINDOW_WIDTH // 2
+        start_y = 30
 
         # 绘制分数信息
         score_text = self.font.render(f"Score: {current_score}", True, WHITE)
         score_rect = score_text.get_rect(center=(center_x, start_y))
-        self.screen.blit(score_text, score_rect)
-
-        # 绘制升级标题
-        title_text = self.large_font.render("Choose Upgrade", True, YELLOW)
-        title_rect = title_text.get_rect(center=(center_x, start_y + 40))
-        self.screen.blit(title_text, title_rect)
+        panel.blit(score_text, score_rect)
 
         # 绘制升级选项
         if len(available_upgrades) >= 3:
@@ -101,15 +132,8 @@ class UpgradeWindow:
 
                 option_surface = self.small_font.render(option_text, True, WHITE)
                 option_rect = option_surface.get_rect(center=(center_x, y_pos))
-                self.screen.blit(option_surface, option_rect)
+                panel.blit(option_surface, option_rect)
                 y_pos += 35
 
-        # 绘制操作说明
-        instruction_text = self.small_font.render("Press 1, 2, or 3 to choose", True, GREEN)
-        instruction_rect = instruction_text.get_rect(center=(center_x, window_y + UPGRADE_WINDOW_HEIGHT - 50))
-        self.screen.blit(instruction_text, instruction_rect)
-
-        # 绘制ESC提示
-        esc_text = self.small_font.render("ESC: Default choice", True, LIGHT_GRAY)
-        esc_rect = esc_text.get_rect(center=(center_x, window_y + UPGRADE_WINDOW_HEIGHT - 25))
-        self.screen.blit(esc_text, esc_rect)
+        frame.blit(panel, self.window_rect)
+        return frame
@@ -0,0 +1,216 @@
+"""
+多进程向量化环境模块
+在多个工作进程中并行推进N个相互独立的无头环境，绕开GIL的单核限制；
+观测、动作、奖励和结束标志通过共享内存中的NumPy数组交换，管道中只传递很短的命令，不序列化观测
+"""
+
+import multiprocessing as mp
+import os
+from multiprocessing import shared_memory
+import numpy as np
+from env import AlienShooterEnv
+
+# 工作进程命令
+CMD_RESET = 'reset'
+CMD_STEP = 'step'
+CMD_CLOSE = 'close'
+
+
+class SharedArrays:
+    """
+    一组位于共享内存中的NumPy数组
+    主进程创建（create=True），工作进程按名称打开同一组内存块
+    """
+
+    def __init__(self, specs, names=None):
+        """
+        创建或打开共享数组
+        参数:
+            specs: {数组名: (形状, dtype)}
+            names: {数组名: 共享内存块名称}，None表示新建
+        """
+        self.specs = specs
+        self.blocks = {}
+        self.owner = names is None  # 创建者负责释放共享内存
+        for key, (shape, dtype) in specs.items():
+            size = max(1, int(np.prod(shape)) * np.dtype(dtype).itemsize)
+            if self.owner:
+                block = shared_memory.SharedMemory(create=True, size=size)
+            else:
+                block = shared_memory.SharedMemory(name=names[key])
+            self.blocks[key] = block
+            setattr(self, key, np.ndarray(shape, dtype=dtype, buffer=block.buf))
+
+    def names(self):
+        """返回: {数组名: 共享内存块名称}，传给工作进程"""
+        return {key: block.name for key, block in self.blocks.items()}
+
+    def close(self):
+        """解除映射；创建者同时释放共享内存"""
+        for key in self.specs:
+            setattr(self, key, None)  # 先释放数组对缓冲区的引用
+        for block in self.blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self.blocks = {}
+
+
+def _episode_seeds(seed_sequence):
+    """
+    为一个环境生成无穷的每局种子序列
+    参数:
+        seed_sequence: 该环境的numpy.random.SeedSequence
+    返回: 生成器，每次产生下一局的种子
+    """
+    rng = np.random.default_rng(seed_sequence)
+    while True:
+        yield int(rng.integers(1 << 63))
+
+
+def _worker(pipe, names, specs, indices, env_class, env_kwargs, seed_sequences):
+    """
+    工作进程主循环：推进分配到的环境，结果写入共享数组
+    参数:
+        pipe: 与主进程通信的管道
+        names/specs: 共享数组的名称与规格
+        indices: 本进程负责的环境编号
+        env_class/env_kwargs: 环境类及其构造参数
+        seed_sequences: 各环境的SeedSequence
+    """
+    arrays = SharedArrays(specs, names)
+    envs = [env_class(**env_kwargs) for _ in indices]
+    seeds = [_episode_seeds(sequence) for sequence in seed_sequences]
+    try:
+        while True:
+            command = pipe.recv()
+            if command == CMD_STEP:
+                actions = arrays.actions
+                for env, i, episode_seeds in zip(envs, indices, seeds):
+                    obs, reward, done, info = env.step(int(actions[i]))
+                    arrays.rewards[i] = reward
+                    arrays.dones[i] = done
+                    arrays.truncated[i] = info['truncated']
+                    arrays.scores[i] = info['score']  # 结束时为该局最终分数
+                    if done:
+                        # 自动开始新的一局，返回新一局的初始观测
+                        obs = env.reset(next(episode_seeds))
+                    arrays.obs[i] = obs
+                    arrays.upgrade_pending[i] = info['upgrade_pending'] and not done
+            elif command == CMD_RESET:
+                for env, i, episode_seeds in zip(envs, indices, seeds):
+                    arrays.obs[i] = env.reset(next(episode_seeds))
+                    arrays.rewards[i] = 0.0
+                    arrays.dones[i] = arrays.truncated[i] = arrays.upgrade_pending[i] = False
+                    arrays.scores[i] = 0
+            elif command == CMD_CLOSE:
+                break
+            pipe.send(True)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        arrays.close()
+        pipe.close()
+
+
+class VecEnv:
+    """
+    多进程向量化环境
+    num_envs个环境按顺序均分到num_workers个工作进程；step一次推进全部环境，
+    结束的环境在工作进程中自动重置，对应位置返回新一局的初始观测
+
+    返回的观测、奖励等数组是共享内存的视图，下一次step时会被覆盖，需要保留时请复制
+    """
+
+    def __init__(self, num_envs, num_workers=None, seed=None, env_class=AlienShooterEnv, **env_kwargs):
+        """
+        创建共享数组并启动工作进程
+        参数:
+            num_envs: 环境数量
+            num_workers: 工作进程数，默认为CPU核数（不超过环境数量）
+            seed: 根种子，每个环境每一局的种子都由它派生，默认随机
+            env_class: 环境类（需提供reset/step、action_count与observation_shape）
+            env_kwargs: 传给环境类的参数（如mode、observation、frame_skip）
+        """
+        self.num_envs = num_envs
+        self.num_workers = min(num_envs, num_workers or os.cpu_count() or 1)
+        probe = env_class(**env_kwargs)
+        self.action_count = probe.action_count
+        self.observation_shape = probe.observation_shape
+        obs_dtype = probe.reset(0).dtype
+
+        specs = {
+            'obs': ((num_envs,) + tuple(probe.observation_shape), obs_dtype),
+            'actions': ((num_envs,), np.int64),
+            'rewards': ((num_envs,), np.float64),
+            'dones': ((num_envs,), np.bool_),
+            'truncated': ((num_envs,), np.bool_),
+            'scores': ((num_envs,), np.int64),
+            'upgrade_pending': ((num_envs,), np.bool_),
+        }
+        self.arrays = SharedArrays(specs)
+
+        sequences = np.random.SeedSequence(seed).spawn(num_envs)
+        chunks = np.array_split(np.arange(num_envs), self.num_workers)
+        self.pipes = []
+        self.workers = []
+        for chunk in chunks:
+            parent, child = mp.Pipe()
+            indices = chunk.tolist()
+            worker = mp.Process(target=_worker, daemon=True,
+                                args=(child, self.arrays.names(), specs, indices, env_class, env_kwargs,
+                                      [sequences[i] for i in indices]))
+            worker.start()
+            child.close()
+            self.pipes.append(parent)
+            self.workers.append(worker)
+
+    def _broadcast(self, command):
+        """向所有工作进程发送命令并等待完成"""
+        for pipe in self.pipes:
+            pipe.send(command)
+        for pipe in self.pipes:
+            pipe.recv()
+
+    def reset(self):
+        """
+        重置全部环境
+        返回: 观测数组(num_envs, *observation_shape)
+        """
+        self._broadcast(CMD_RESET)
+        return self.arrays.obs
+
+    def step(self, actions):
+        """
+        推进全部环境一步
+        参数:
+            actions: 长度为num_envs的动作编号序列
+        返回: (观测, 奖励, 是否结束, 信息) —— 信息为数组字典：
+            'score'（结束的环境为该局最终分数）、'truncated'、'upgrade_pending'
+        """
+        self.arrays.actions[:] = actions
+        self._broadcast(CMD_STEP)
+        arrays = self.arrays
+        info = {'score': arrays.scores, 'truncated': arrays.truncated,
+                'upgrade_pending': arrays.upgrade_pending}
+        return arrays.obs, arrays.rewards, arrays.dones, info
+
+    def close(self):
+        """停止工作进程并释放共享内存"""
+        if not self.workers:
+            return
+        for pipe in self.pipes:
+            pipe.send(CMD_CLOSE)
+        for worker in self.workers:
+            worker.join()
+        for pipe in self.pipes:
+            pipe.close()
+        self.workers = []
+        self.pipes = []
+        self.arrays.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
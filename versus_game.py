@@ -4,36 +4,75 @@
 """
 
 import pygame
-import random
 import sys
 from config import *
-from entities import Player, Alien, Bullet, Explosion
+from arena import ArenaEngine, arena_field, key_direction
 from background import BackgroundManager
+from text_cache import TextCache
+from dirty_rect import DirtyRectRenderer
+from simulation import KeyState, SimulationClock
+from rng import RandomStreams
+from profiler import FrameProfiler
+
+# 各玩家的方向键（左、右、上、下），顺序与区域编号一致
+VERSUS_CONTROLS = (
+    (pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s),               # 玩家1: WASD
+    (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN),    # 玩家2: 方向键
+)
 
 
 class VersusGame:
     """
     双人对战游戏类
     管理双人对战模式的游戏逻辑、状态和渲染
+    左右半屏是ArenaEngine的两个区域（外星人不能越过分割线），两名玩家的分数与计时器即各区域的属性
     """
+
+    # 转发到各区域的属性
+    player1 = arena_field('player', 0)
+    player2 = arena_field('player', 1)
+    score1 = arena_field('score', 0)
+    score2 = arena_field('score', 1)
     
-    def __init__(self):
+    def __init__(self, headless=False, sim_clock=None, seed=None):
         """
         初始化双人对战游戏
+        参数:
+            headless: 是否以无头模式运行（不创建窗口、不绘制、不限帧率）
+            sim_clock: 注入的模拟时钟，默认新建SimulationClock
+            seed: 随机数种子，默认随机生成；相同种子和输入下游戏过程完全一致
         """
-        # 初始化pygame
-        pygame.init()
-        
-        # 创建双人对战屏幕
-        self.screen = pygame.display.set_mode((VERSUS_SCREEN_WIDTH, VERSUS_SCREEN_HEIGHT))
-        pygame.display.set_caption(f"{GAME_TITLE} - Versus Mode")
-        
-        # 初始化字体
-        self.font = pygame.font.Font(None, FONT_SIZE)
-        self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
-        
-        # 初始化时钟
-        self.clock = pygame.time.Clock()
+        self.headless = headless
+        self.sim_clock = sim_clock if sim_clock is not None else SimulationClock()  # 逻辑时间
+        self.rng = RandomStreams(seed)  # 各子系统的随机数流
+        self.recorder = None            # 输入录制器（replay.InputRecorder），None表示不录制
+        self.record_path = None         # 录制文件保存路径
+        self.time_scale = SIM_TIME_SCALE  # 窗口模式下的模拟速度倍数
+
+        if headless:
+            # 无头模式：不初始化显示，两名玩家的输入由外部注入
+            self.screen = None
+            self.clock = None
+            self.input_keys = KeyState()
+            self.profiler = None
+        else:
+            # 初始化pygame
+            pygame.init()
+
+            # 创建双人对战屏幕
+            self.screen = pygame.display.set_mode((VERSUS_SCREEN_WIDTH, VERSUS_SCREEN_HEIGHT))
+            pygame.display.set_caption(f"{GAME_TITLE} - Versus Mode")
+
+            # 初始化字体
+            self.font = pygame.font.Font(None, FONT_SIZE)
+            self.small_font = pygame.font.Font(None, SMALL_FONT_SIZE)
+            self.text_cache = TextCache()  # HUD文字缓存
+            self.renderer = DirtyRectRenderer(self.screen)  # 脏矩形渲染器
+
+            # 初始化渲染时钟
+            self.clock = pygame.time.Clock()
+            self.input_keys = None  # 注入的按键状态，None表示读取键盘
+            self.profiler = FrameProfiler()  # 帧性能分析（F3显示叠加图），None表示不统计
         
         # 初始化游戏对象
         self._init_game_objects()
@@ -41,27 +80,23 @@ class VersusGame:
         # 初始化游戏状态
         self._init_game_state()
         
-        # 初始化时间控制
-        self._init_timing()
-        
-        # 初始化背景管理器（为双人对战模式适配）
-        self.background_manager = BackgroundManager(VERSUS_SCREEN_WIDTH, VERSUS_SCREEN_HEIGHT)
+        # 初始化背景管理器（为双人对战模式适配，无头模式没有背景）
+        if headless:
+            self.background_manager = None
+        else:
+            self.background_manager = BackgroundManager(VERSUS_SCREEN_WIDTH, VERSUS_SCREEN_HEIGHT,
+                                                        self.rng.background)
     
     def _init_game_objects(self):
         """初始化游戏对象"""
-        # 创建两个玩家
-        # 玩家1在左半屏
-        self.player1 = Player(VERSUS_SPLIT_X // 2 - PLAYER_SIZE // 2, VERSUS_SCREEN_HEIGHT - 50)
-        # 玩家2在右半屏
-        self.player2 = Player(VERSUS_SPLIT_X + VERSUS_SPLIT_X // 2 - PLAYER_SIZE // 2, VERSUS_SCREEN_HEIGHT - 50)
-        
-        # 分别为两个玩家创建游戏对象列表
-        self.aliens1 = []       # 玩家1区域的外星人
-        self.aliens2 = []       # 玩家2区域的外星人
-        self.bullets1 = []      # 玩家1的子弹
-        self.bullets2 = []      # 玩家2的子弹
-        self.explosions1 = []   # 玩家1区域的爆炸特效
-        self.explosions2 = []   # 玩家2区域的爆炸特效
+        # 玩家1在左半屏区域，玩家2在右半屏区域，各自位于区域底部中央
+        self.engine = ArenaEngine([(0, 0, VERSUS_SPLIT_X, VERSUS_SCREEN_HEIGHT),
+                                   (VERSUS_SPLIT_X, 0, VERSUS_SCREEN_WIDTH, VERSUS_SCREEN_HEIGHT)],
+                                  self.rng, clamp_aliens=True)
+        self.aliens = self.engine.aliens        # 两个区域的外星人（arena列区分区域）
+        self.bullets = self.engine.bullets      # 两名玩家的子弹
+        self.particles = self.engine.particles  # 两个区域共用的爆炸粒子系统
+        self.alien_grid = self.engine.grid      # 外星人空间哈希（碰撞粗筛）
     
     def _init_game_state(self):
         """初始化游戏状态"""
@@ -70,14 +105,21 @@ class VersusGame:
         self.game_over = False  # 游戏结束标志
         self.winner = None      # 获胜者 (1 或 2)
     
-    def _init_timing(self):
-        """初始化时间控制"""
-        self.last_bullet_time1 = 0      # 玩家1上次发射子弹的时间
-        self.last_bullet_time2 = 0      # 玩家2上次发射子弹的时间
-        self.last_alien_spawn_time1 = 0 # 玩家1区域上次生成外星人的时间
-        self.last_alien_spawn_time2 = 0 # 玩家2区域上次生成外星人的时间
-        self.bullet_color_index1 = 0    # 玩家1子弹颜色循环索引
-        self.bullet_color_index2 = 0    # 玩家2子弹颜色循环索引
+    def get_time(self):
+        """
+        获取当前游戏时间（毫秒）
+        由模拟时钟按已推进的逻辑帧换算，与真实时间无关
+        """
+        return self.sim_clock.now()
+
+    def get_pressed_keys(self):
+        """
+        获取当前按键状态
+        有注入的KeyState时（无头模式或基准测试）返回它，否则读取键盘
+        """
+        if self.input_keys is not None:
+            return self.input_keys
+        return pygame.key.get_pressed()
     
     def handle_input(self):
         """
@@ -85,227 +127,44 @@ class VersusGame:
         玩家1: WASD控制
         玩家2: 方向键控制
         """
-        keys = pygame.key.get_pressed()
-
-        # 玩家1控制 (WASD)
-        dx1 = dy1 = 0
-        if keys[pygame.K_a]:    # A键：向左移动
-            dx1 = -1
-        if keys[pygame.K_d]:    # D键：向右移动
-            dx1 = 1
-        if keys[pygame.K_w]:    # W键：向上移动
-            dy1 = -1
-        if keys[pygame.K_s]:    # S键：向下移动
-            dy1 = 1
-
-        # 移动玩家1（直接修改坐标以避免边界检查冲突）
-        if dx1 != 0 or dy1 != 0:
-            # 计算新位置
-            effective_speed = self.player1.speed * self.player1.speed_multiplier
-            new_x1 = self.player1.x + dx1 * effective_speed
-            new_y1 = self.player1.y + dy1 * effective_speed
-
-            # 检查边界限制（左半屏）
-            if (0 <= new_x1 <= VERSUS_SPLIT_X - PLAYER_SIZE and
-                0 <= new_y1 <= VERSUS_SCREEN_HEIGHT - PLAYER_SIZE):
-                self.player1.x = new_x1
-                self.player1.y = new_y1
-
-        # 玩家2控制 (方向键)
-        dx2 = dy2 = 0
-        if keys[pygame.K_LEFT]:     # 左方向键：向左移动
-            dx2 = -1
-        if keys[pygame.K_RIGHT]:    # 右方向键：向右移动
-            dx2 = 1
-        if keys[pygame.K_UP]:       # 上方向键：向上移动
-            dy2 = -1
-        if keys[pygame.K_DOWN]:     # 下方向键：向下移动
-            dy2 = 1
-
-        # 移动玩家2（直接修改坐标以避免边界检查冲突）
-        if dx2 != 0 or dy2 != 0:
-            # 计算新位置
-            effective_speed = self.player2.speed * self.player2.speed_multiplier
-            new_x2 = self.player2.x + dx2 * effective_speed
-            new_y2 = self.player2.y + dy2 * effective_speed
-
-            # 检查边界限制（右半屏）
-            if (VERSUS_SPLIT_X <= new_x2 <= VERSUS_SCREEN_WIDTH - PLAYER_SIZE and
-                0 <= new_y2 <= VERSUS_SCREEN_HEIGHT - PLAYER_SIZE):
-                self.player2.x = new_x2
-                self.player2.y = new_y2
-    
+        keys = self.get_pressed_keys()
+        for index, controls in enumerate(VERSUS_CONTROLS):
+            dx, dy = key_direction(keys, *controls)
+            self.engine.move_player(index, dx, dy)  # 限制在本区域内
+
     def spawn_aliens(self):
-        """
-        为两个玩家区域生成外星人
-        """
-        current_time = pygame.time.get_ticks()
-        
-        # 为玩家1区域生成外星人
-        if current_time - self.last_alien_spawn_time1 >= ALIEN_SPAWN_INTERVAL:
-            num_aliens = random.randint(MIN_ALIENS_PER_SPAWN, MAX_ALIENS_PER_SPAWN)
-            for _ in range(num_aliens):
-                # 在左半屏生成外星人
-                x = random.randint(0, VERSUS_SPLIT_X - ALIEN_SIZE)
-                alien = Alien(x, -ALIEN_SIZE)
-                self.aliens1.append(alien)
-            self.last_alien_spawn_time1 = current_time
-        
-        # 为玩家2区域生成外星人
-        if current_time - self.last_alien_spawn_time2 >= ALIEN_SPAWN_INTERVAL:
-            num_aliens = random.randint(MIN_ALIENS_PER_SPAWN, MAX_ALIENS_PER_SPAWN)
-            for _ in range(num_aliens):
-                # 在右半屏生成外星人
-                x = random.randint(VERSUS_SPLIT_X, VERSUS_SCREEN_WIDTH - ALIEN_SIZE)
-                alien = Alien(x, -ALIEN_SIZE)
-                self.aliens2.append(alien)
-            self.last_alien_spawn_time2 = current_time
-    
+        """各区域按自己的计时器生成外星人"""
+        self.engine.spawn_aliens(self.get_time())
+
     def spawn_bullets(self):
-        """
-        为两个玩家生成子弹
-        """
-        current_time = pygame.time.get_ticks()
-        bullet_interval = 1000 // BULLETS_PER_SECOND
-        
-        # 玩家1发射子弹
-        if current_time - self.last_bullet_time1 >= bullet_interval:
-            center_x = self.player1.x + self.player1.width // 2 - BULLET_WIDTH // 2
-            bullet_y = self.player1.y
-            bullet = Bullet(center_x, bullet_y, self.bullet_color_index1)
-            self.bullets1.append(bullet)
-            self.bullet_color_index1 = (self.bullet_color_index1 + 1) % len(BULLET_COLORS)
-            self.last_bullet_time1 = current_time
-        
-        # 玩家2发射子弹
-        if current_time - self.last_bullet_time2 >= bullet_interval:
-            center_x = self.player2.x + self.player2.width // 2 - BULLET_WIDTH // 2
-            bullet_y = self.player2.y
-            bullet = Bullet(center_x, bullet_y, self.bullet_color_index2)
-            self.bullets2.append(bullet)
-            self.bullet_color_index2 = (self.bullet_color_index2 + 1) % len(BULLET_COLORS)
-            self.last_bullet_time2 = current_time
+        """两名玩家各自按射击计时器发射子弹"""
+        self.engine.spawn_bullets(self.get_time())
 
     def update_bullets(self):
-        """更新所有子弹的位置"""
-        # 更新玩家1的子弹
-        for bullet in self.bullets1[:]:
-            bullet.move()
-            if bullet.y < 0:
-                self.bullets1.remove(bullet)
-
-        # 更新玩家2的子弹
-        for bullet in self.bullets2[:]:
-            bullet.move()
-            if bullet.y < 0:
-                self.bullets2.remove(bullet)
+        """更新所有子弹的位置，移除飞出屏幕上方的子弹"""
+        self.engine.update_bullets()
 
     def update_aliens(self):
-        """更新所有外星人的位置"""
-        # 更新玩家1区域的外星人
-        for alien in self.aliens1[:]:
-            self._move_alien_with_boundary(alien, 0, VERSUS_SPLIT_X)
-
-            # 检查是否超出屏幕底部
-            if alien.y > VERSUS_SCREEN_HEIGHT:
-                self.aliens1.remove(alien)
-                # 玩家1失败
-                self.game_over = True
-                self.winner = 2
-
-        # 更新玩家2区域的外星人
-        for alien in self.aliens2[:]:
-            self._move_alien_with_boundary(alien, VERSUS_SPLIT_X, VERSUS_SCREEN_WIDTH)
-
-            # 检查是否超出屏幕底部
-            if alien.y > VERSUS_SCREEN_HEIGHT:
-                self.aliens2.remove(alien)
-                # 玩家2失败
-                self.game_over = True
-                self.winner = 1
-
-    def _move_alien_with_boundary(self, alien, left_bound, right_bound):
-        """
-        移动外星人并限制在指定边界内
-        参数:
-            alien: 外星人对象
-            left_bound: 左边界
-            right_bound: 右边界
-        """
-        # 向下移动
-        alien.y += alien.speed
-
-        # 左右随机移动
-        alien.x += alien.horizontal_direction * alien.horizontal_speed
-
-        # 边界检查：如果碰到区域边缘，反向移动
-        if alien.x <= left_bound or alien.x >= right_bound - alien.width:
-            alien.horizontal_direction *= -1
-            # 确保外星人在边界内
-            alien.x = max(left_bound, min(right_bound - alien.width, alien.x))
-
-        # 随机改变移动方向
-        alien.direction_change_timer += 1
-        if alien.direction_change_timer >= alien.direction_change_interval:
-            alien.horizontal_direction = random.choice([-1, 1])
-            alien.direction_change_timer = 0
-            alien.direction_change_interval = random.randint(
-                ALIEN_DIRECTION_CHANGE_MIN, ALIEN_DIRECTION_CHANGE_MAX
-            )
+        """更新所有外星人的位置，外星人超出某个区域底部则该区域的玩家失败"""
+        for index in self.engine.update_aliens():
+            self.game_over = True
+            self.winner = 2 - index  # 另一名玩家获胜
 
     def update_explosions(self):
-        """更新所有爆炸特效"""
-        # 更新玩家1区域的爆炸特效
-        for explosion in self.explosions1[:]:
-            if explosion.update():
-                self.explosions1.remove(explosion)
-
-        # 更新玩家2区域的爆炸特效
-        for explosion in self.explosions2[:]:
-            if explosion.update():
-                self.explosions2.remove(explosion)
+        """更新所有爆炸特效，已结束的爆炸粒子整体剔除"""
+        self.particles.update()
 
     def check_collisions(self):
         """检查所有碰撞事件"""
-        # 检查玩家1的子弹击中外星人
-        for bullet in self.bullets1[:]:
-            for alien in self.aliens1[:]:
-                if bullet.get_rect().colliderect(alien.get_rect()):
-                    self.bullets1.remove(bullet)
-                    if alien.take_damage(bullet.damage):
-                        explosion = Explosion(alien.x, alien.y)
-                        self.explosions1.append(explosion)
-                        self.aliens1.remove(alien)
-                        self.score1 += POINTS_PER_KILL
-                    break
-
-        # 检查玩家2的子弹击中外星人
-        for bullet in self.bullets2[:]:
-            for alien in self.aliens2[:]:
-                if bullet.get_rect().colliderect(alien.get_rect()):
-                    self.bullets2.remove(bullet)
-                    if alien.take_damage(bullet.damage):
-                        explosion = Explosion(alien.x, alien.y)
-                        self.explosions2.append(explosion)
-                        self.aliens2.remove(alien)
-                        self.score2 += POINTS_PER_KILL
-                    break
-
-        # 检查玩家1与外星人碰撞
-        player1_rect = self.player1.get_rect()
-        for alien in self.aliens1:
-            if player1_rect.colliderect(alien.get_rect()):
-                self.game_over = True
-                self.winner = 2
-                return
-
-        # 检查玩家2与外星人碰撞
-        player2_rect = self.player2.get_rect()
-        for alien in self.aliens2:
-            if player2_rect.colliderect(alien.get_rect()):
-                self.game_over = True
-                self.winner = 1
-                return
+        # 子弹击中本区域的外星人，击杀分数计入该区域的玩家
+        self.engine.resolve_hits()
+
+        # 玩家与本区域的外星人碰撞（同时被撞时按玩家1先判定）
+        hit = self.engine.player_hits()
+        if hit:
+            self.game_over = True
+            self.winner = 2 - hit[0]
+            return
 
         # 检查胜利条件
         if self.score1 >= VERSUS_WIN_SCORE:
@@ -315,12 +174,17 @@ class VersusGame:
             self.game_over = True
             self.winner = 2
 
-    def draw(self):
-        """绘制游戏画面"""
-        # 填充白色背景
-        self.screen.fill(WHITE)
+    def draw(self, alpha=1.0):
+        """
+        绘制游戏画面
+        参数:
+            alpha: 逻辑帧间插值系数（0为上一逻辑帧，1为当前逻辑帧）
+        """
+        # 擦除上一帧绘制的区域（脏矩形渲染）
+        renderer = self.renderer
+        renderer.begin_frame()
 
-        # 绘制分割线（更明显的墙效果）
+        # 绘制分割线（更明显的墙效果，静态内容不登记脏矩形）
         # 主分割线
         pygame.draw.line(self.screen, BLACK, (VERSUS_SPLIT_X, 0), (VERSUS_SPLIT_X, VERSUS_SCREEN_HEIGHT), 5)
         # 左侧阴影线
@@ -329,61 +193,53 @@ class VersusGame:
         pygame.draw.line(self.screen, LIGHT_GRAY, (VERSUS_SPLIT_X + 2, 0), (VERSUS_SPLIT_X + 2, VERSUS_SCREEN_HEIGHT), 2)
 
         # 绘制背景效果
-        self.background_manager.draw(self.screen)
+        renderer.add_all(self.background_manager.draw(self.screen))
 
-        # 绘制玩家
-        self.player1.draw(self.screen)
-        self.player2.draw(self.screen)
-
-        # 绘制外星人
-        for alien in self.aliens1:
-            alien.draw(self.screen)
-        for alien in self.aliens2:
-            alien.draw(self.screen)
-
-        # 绘制子弹
-        for bullet in self.bullets1:
-            bullet.draw(self.screen)
-        for bullet in self.bullets2:
-            bullet.draw(self.screen)
+        # 绘制玩家、外星人和子弹（两个区域一起批量绘制）
+        renderer.add_all(self.engine.draw(self.screen, alpha))
 
         # 绘制爆炸特效
-        for explosion in self.explosions1:
-            explosion.draw(self.screen)
-        for explosion in self.explosions2:
-            explosion.draw(self.screen)
+        renderer.add_all(self.particles.draw(self.screen, alpha))
 
         # 绘制UI
         self._draw_ui()
 
-        # 更新屏幕显示
-        pygame.display.flip()
+        # 性能叠加图（右上角，HUD文字下方）
+        profiler = self.profiler
+        if profiler is not None:
+            if profiler.show_overlay:
+                overlay = profiler.overlay()
+                renderer.blit(overlay, (VERSUS_SCREEN_WIDTH - overlay.get_width() - 10, 75))
+            profiler.lap('draw')
+
+        # 只更新上一帧与本帧绘制过的区域
+        renderer.present()
 
     def _draw_ui(self):
         """绘制用户界面"""
         # 绘制玩家1分数 (左上角)
-        score1_text = self.font.render(f"Player 1: {self.score1}", True, BLUE)
-        self.screen.blit(score1_text, (10, 10))
+        score1_text = self.text_cache.render(self.font, f"Player 1: {self.score1}", BLUE)
+        self.renderer.blit(score1_text, (10, 10))
 
         # 绘制玩家2分数 (右上角)
-        score2_text = self.font.render(f"Player 2: {self.score2}", True, RED)
+        score2_text = self.text_cache.render(self.font, f"Player 2: {self.score2}", RED)
         score2_rect = score2_text.get_rect()
         score2_rect.topright = (VERSUS_SCREEN_WIDTH - 10, 10)
-        self.screen.blit(score2_text, score2_rect)
+        self.renderer.blit(score2_text, score2_rect)
 
         # 绘制目标分数
-        target_text = self.small_font.render(f"Target: {VERSUS_WIN_SCORE} points", True, BLACK)
+        target_text = self.text_cache.render(self.small_font, f"Target: {VERSUS_WIN_SCORE} points", BLACK)
         target_rect = target_text.get_rect(center=(VERSUS_SPLIT_X, 30))
-        self.screen.blit(target_text, target_rect)
+        self.renderer.blit(target_text, target_rect)
 
         # 绘制控制说明
-        control1_text = self.small_font.render("Player 1: WASD", True, BLUE)
-        self.screen.blit(control1_text, (10, 50))
+        control1_text = self.text_cache.render(self.small_font, "Player 1: WASD", BLUE)
+        self.renderer.blit(control1_text, (10, 50))
 
-        control2_text = self.small_font.render("Player 2: Arrow Keys", True, RED)
+        control2_text = self.text_cache.render(self.small_font, "Player 2: Arrow Keys", RED)
         control2_rect = control2_text.get_rect()
         control2_rect.topright = (VERSUS_SCREEN_WIDTH - 10, 50)
-        self.screen.blit(control2_text, control2_rect)
+        self.renderer.blit(control2_text, control2_rect)
 
         # 绘制游戏结束信息
         if self.game_over:
@@ -394,61 +250,135 @@ class VersusGame:
                 win_text = "Draw!"
                 color = BLACK
 
-            win_surface = self.font.render(win_text, True, color)
+            win_surface = self.text_cache.render(self.font, win_text, color)
             win_rect = win_surface.get_rect(center=(VERSUS_SPLIT_X, VERSUS_SCREEN_HEIGHT // 2))
-            self.screen.blit(win_surface, win_rect)
+            self.renderer.blit(win_surface, win_rect)
 
-            restart_text = self.small_font.render("Press R to restart", True, GREEN)
+            restart_text = self.text_cache.render(self.small_font, "Press R to restart", GREEN)
             restart_rect = restart_text.get_rect(center=(VERSUS_SPLIT_X, VERSUS_SCREEN_HEIGHT // 2 + 40))
-            self.screen.blit(restart_text, restart_rect)
+            self.renderer.blit(restart_text, restart_rect)
 
     def reset_game(self):
         """重置游戏到初始状态"""
-        # 重新初始化游戏对象
+        # 重新初始化游戏对象（分数与计时器随区域一起重置）
         self._init_game_objects()
 
         # 重置游戏状态
         self._init_game_state()
 
-        # 重置时间控制
-        self._init_timing()
-
         # 重置背景效果
-        self.background_manager.reset()
+        if self.background_manager is not None:
+            self.background_manager.reset()
+
+    def step(self):
+        """
+        推进一帧游戏逻辑
+        不处理窗口事件、不绘制，供主循环和无头模式共用
+        """
+        # 录制本帧的按键状态（每个逻辑帧一次）
+        if self.recorder is not None:
+            self.recorder.record_tick(self.get_pressed_keys())
+
+        profiler = self.profiler
+
+        if self.background_manager is not None:
+            self.background_manager.update()
+        self.update_explosions()
+        if profiler is not None:
+            profiler.lap('update')
+
+        if not self.game_over:
+            self.handle_input()
+            if profiler is not None:
+                profiler.lap('input')
+            self.spawn_aliens()
+            self.spawn_bullets()
+            if profiler is not None:
+                profiler.lap('spawn')
+            self.update_bullets()
+            self.update_aliens()
+            if profiler is not None:
+                profiler.lap('update')
+            self.check_collisions()
+            if profiler is not None:
+                profiler.lap('collisions')
+
+        # 推进模拟时间
+        self.sim_clock.advance()
+
+    def run_headless(self, max_ticks):
+        """
+        无头模式主循环
+        不绘制、不限帧率，以CPU允许的最快速度推进游戏逻辑
+        参数:
+            max_ticks: 最多模拟的帧数
+        返回: 实际模拟的帧数（分出胜负时提前停止）
+        """
+        ticks = 0
+        while ticks < max_ticks and not self.game_over:
+            self.step()
+            ticks += 1
+        return ticks
+
+    def start_recording(self, path):
+        """
+        开始录制本局输入，游戏退出时保存到指定路径
+        参数:
+            path: 录制文件路径
+        """
+        from replay import InputRecorder  # 延迟导入，避免循环引用
+        self.recorder = InputRecorder(self.rng.seed, VERSUS_MODE)
+        self.record_path = path
 
     def run(self):
         """游戏主循环"""
         running = True
+        tick_ms = self.sim_clock.tick_ms  # 每个逻辑帧的时长
+        accumulator = 0.0  # 尚未模拟的真实时间（毫秒）
+        profiler = self.profiler  # 帧性能分析（None表示不统计）
+        if profiler is not None:
+            profiler.start_frame()
 
         while running:
+            # 帧率控制：按流逝的真实时间推进固定步长逻辑帧
+            frame_ms = self.clock.tick(RENDER_FPS)
+            accumulator += min(frame_ms, MAX_FRAME_TIME) * self.time_scale
+            if profiler is not None:
+                profiler.lap('tick')
+
             # 事件处理
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_r and self.game_over:
+                        if self.recorder is not None:
+                            self.recorder.record_reset()
                         self.reset_game()
                     elif event.key == pygame.K_ESCAPE:
                         running = False
+                    elif event.key == pygame.K_F3 and profiler is not None:
+                        # F3切换性能叠加图
+                        profiler.show_overlay = not profiler.show_overlay
+            if profiler is not None:
+                profiler.lap('input')
 
             # 游戏逻辑更新
-            self.background_manager.update()
-            self.update_explosions()
-
-            if not self.game_over:
-                self.handle_input()
-                self.spawn_aliens()
-                self.spawn_bullets()
-                self.update_bullets()
-                self.update_aliens()
-                self.check_collisions()
-
-            # 绘制画面
-            self.draw()
+            while accumulator >= tick_ms:
+                self.step()
+                accumulator -= tick_ms
 
-            # 帧率控制
-            self.clock.tick(FPS)
+            # 绘制画面（游戏结束后画面静止）
+            alpha = 1.0 if self.game_over else accumulator / tick_ms
+            self.draw(alpha)
+            if profiler is not None:
+                profiler.lap('flip')
+                profiler.end_frame(self)
 
         # 游戏退出
+        if self.recorder is not None:
+            self.recorder.save(self, self.record_path)
+        if profiler is not None:
+            profiler.close()
         pygame.quit()
         sys.exit()